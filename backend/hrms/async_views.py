@@ -0,0 +1,192 @@
+"""
+Async variants of the dashboard and analytics endpoints.
+
+Served from /api/async/... next to the regular views. The responses are the
+same as the sync endpoints'. The difference is that the independent aggregate
+queries run at the same time, each in a worker thread with its own database
+connection, and the event loop is free while they run. Under ASGI that lets
+one process serve many concurrent dashboard users.
+
+DRF 3.14 has no async views, so these are plain Django views. They render
+with FastJSONRenderer and return the same error bodies as @api_view.
+
+The notification long-poll lives here too: a waiting poll holds no thread
+or connection, which only an async view under ASGI can offer.
+"""
+import asyncio
+import functools
+from contextlib import ExitStack
+
+from asgiref.sync import sync_to_async
+from django.conf import settings
+from django.core.cache import cache
+from django.db import close_old_connections, connection
+from django.http import HttpResponse
+from django.utils.cache import get_conditional_response
+from django.utils.http import quote_etag
+
+from .conditional import make_etag
+from .middleware import active_query_timers
+from .models import Notification
+from .notifications import POLL_BATCH_SIZE, POLL_INTERVAL, counter_state, waiters
+from .renderers import FastJSONRenderer
+from .serializers import (
+    AttendanceStatsQuerySerializer, AttendanceStatsSerializer, DashboardStatsSerializer,
+    DepartmentStatsSerializer, NotificationPollQuerySerializer, NotificationSerializer,
+)
+from .stats import (
+    build_dashboard_stats, build_department_stats, compute_attendance_stats, dashboard_cache_key,
+    dashboard_queries, department_queries,
+)
+
+# Employees per query when a batch attendance_stats request is split up
+ATTENDANCE_STATS_CHUNK = 50
+
+
+def _in_worker(query):
+    timers = active_query_timers.get()
+
+    def run():
+        try:
+            with ExitStack() as stack:
+                for timer in timers:
+                    stack.enter_context(connection.execute_wrapper(timer))
+                return query()
+        finally:
+            # Worker threads outlive the request; apply CONN_MAX_AGE here as
+            # request_finished does for the request thread
+            close_old_connections()
+    return sync_to_async(run, thread_sensitive=False)
+
+
+async def gather_queries(queries):
+    """Run a dict of zero-argument query callables concurrently; returns their results by name."""
+    names = list(queries)
+    results = await asyncio.gather(*(_in_worker(queries[name])() for name in names))
+    return dict(zip(names, results))
+
+
+def _json(data, status=200):
+    return HttpResponse(FastJSONRenderer().render(data), content_type='application/json', status=status)
+
+
+def get_only(view):
+    @functools.wraps(view)
+    async def wrapper(request, *args, **kwargs):
+        if request.method not in ('GET', 'HEAD'):
+            response = _json({'detail': f'Method "{request.method}" not allowed.'}, status=405)
+            response['Allow'] = 'GET, HEAD'
+            return response
+        return await view(request, *args, **kwargs)
+    return wrapper
+
+
+@get_only
+async def dashboard_stats(request):
+    key = dashboard_cache_key()
+    stats = await cache.aget(key)
+    if stats is None:
+        stats = build_dashboard_stats(await gather_queries(dashboard_queries()))
+        await cache.aset(key, stats, getattr(settings, 'HRMS_DASHBOARD_CACHE_TTL', 60))
+
+    etag = quote_etag(make_etag(request, stats))
+    response = get_conditional_response(request, etag=etag)
+    if response is None:
+        response = _json(DashboardStatsSerializer(stats).data)
+    response['ETag'] = etag
+    return response
+
+
+@get_only
+async def department_stats(request):
+    include_unlisted = request.GET.get('include_unlisted', '').lower() in ('1', 'true', 'yes')
+    stats = build_department_stats(await gather_queries(department_queries()), include_unlisted=include_unlisted)
+    return _json(DepartmentStatsSerializer(stats, many=True).data)
+
+
+@get_only
+async def attendance_stats(request, employee_id=None):
+    """Batch requests are split into chunks of employees queried side by side."""
+    params = request.GET.copy()
+    if employee_id is not None:
+        params['employee_id'] = employee_id
+    query = AttendanceStatsQuerySerializer(data=params)
+    if not query.is_valid():
+        return _json(query.errors, status=400)
+    employee_ids = query.validated_data['employee_id']
+    window = {
+        'start_date': query.validated_data.get('start_date'),
+        'end_date': query.validated_data.get('end_date'),
+    }
+
+    chunks = {
+        start: functools.partial(
+            compute_attendance_stats, employee_ids[start:start + ATTENDANCE_STATS_CHUNK], **window
+        )
+        for start in range(0, len(employee_ids), ATTENDANCE_STATS_CHUNK)
+    }
+    stats = {}
+    for chunk in (await gather_queries(chunks)).values():
+        stats.update(chunk)
+
+    if employee_id is not None:
+        if employee_id not in stats:
+            return _json({'detail': 'Employee not found'}, status=404)
+        return _json(AttendanceStatsSerializer(stats[employee_id]).data)
+
+    return _json({
+        'results': AttendanceStatsSerializer([stats[key] for key in employee_ids if key in stats], many=True).data,
+        'not_found': [key for key in employee_ids if key not in stats]
+    })
+
+
+def _notifications_after(employee_id, after):
+    notifications = Notification.objects.filter(employee_id=employee_id, id__gt=after).select_related('employee')
+    return NotificationSerializer(notifications.order_by('id')[:POLL_BATCH_SIZE], many=True).data
+
+
+@get_only
+async def poll_notifications(request):
+    """
+    Long-poll for ?employee_id='s notifications with ids above ?after=.
+    Answers as soon as there are any, or with an empty list after ?timeout=
+    seconds. The client passes the returned last_id as the next ?after=.
+    """
+    query = NotificationPollQuerySerializer(data=request.GET)
+    if not query.is_valid():
+        return _json(query.errors, status=400)
+    employee_id = query.validated_data['employee_id']
+    after = query.validated_data['after']
+
+    loop = asyncio.get_running_loop()
+    deadline = loop.time() + query.validated_data['timeout']
+    # Registered before the first check, so a notification committed in
+    # between still wakes this poll
+    waiter = waiters.add(employee_id)
+    event = waiter[1]
+    try:
+        while True:
+            event.clear()
+            state = await _in_worker(functools.partial(counter_state, employee_id))()
+            if state is None:
+                return _json({'detail': 'Employee not found'}, status=404)
+            unread, last_id = state
+            remaining = deadline - loop.time()
+            if last_id > after or remaining <= 0:
+                break
+            try:
+                await asyncio.wait_for(event.wait(), min(remaining, POLL_INTERVAL))
+            except asyncio.TimeoutError:
+                pass
+    finally:
+        waiters.discard(employee_id, waiter)
+
+    notifications = []
+    if last_id > after:
+        notifications = await _in_worker(functools.partial(_notifications_after, employee_id, after))()
+    return _json({
+        'notifications': notifications,
+        # Past a full batch, the client picks up from the last one returned
+        'last_id': notifications[-1]['id'] if notifications else last_id,
+        'unread': unread,
+    })
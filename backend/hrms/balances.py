@@ -0,0 +1,147 @@
+"""
+Leave balance ledger.
+
+LeaveBalance holds, per (employee, leave_type, year), the days of Approved
+and of Pending leave. Single-request changes are applied incrementally from
+the LeaveRequest signals in hrms/signals.py; writes that skip signals call
+rebuild_balances(). Remaining days is days_allowed - days_used.
+"""
+from collections import defaultdict
+
+from django.db import IntegrityError, transaction
+from django.db.models import F, FilteredRelation, Q, Sum
+from django.db.models.functions import ExtractYear
+
+from .models import Employee, LeaveBalance, LeaveRequest, LeaveType
+
+# Which ledger column each status counts towards
+LEDGER_COLUMNS = {'Approved': 'days_used', 'Pending': 'days_pending'}
+
+REBUILD_BATCH_SIZE = 1000
+
+
+def ledger_entry(employee_id, leave_type_id, start_date, status, days_requested):
+    """The (employee, leave_type, year, status, days) a request contributes to the ledger."""
+    return (employee_id, leave_type_id, start_date.year, status, days_requested or 0)
+
+
+def bump(employee_id, leave_type_id, year, days_used=0, days_pending=0):
+    """Add to one ledger row, creating it if there is something to add."""
+    row = LeaveBalance.objects.filter(employee_id=employee_id, leave_type_id=leave_type_id, year=year)
+    changes = {'days_used': F('days_used') + days_used, 'days_pending': F('days_pending') + days_pending}
+    if row.update(**changes):
+        return
+    if days_used <= 0 and days_pending <= 0:
+        # Nothing was recorded, so there is nothing to take away; this is also
+        # the case while an employee or leave type is being deleted
+        return
+    try:
+        with transaction.atomic():
+            LeaveBalance.objects.create(
+                employee_id=employee_id, leave_type_id=leave_type_id, year=year,
+                days_used=max(days_used, 0), days_pending=max(days_pending, 0),
+            )
+    except IntegrityError:
+        # Created concurrently since the update above
+        row.update(**changes)
+
+
+def apply_change(old, new):
+    """
+    Move one leave request's days in the ledger. `old` and `new` are
+    ledger_entry() tuples, or None for a create or delete.
+    """
+    if old == new:
+        return
+    deltas = defaultdict(lambda: {'days_used': 0, 'days_pending': 0})
+    for entry, sign in ((old, -1), (new, 1)):
+        if entry is None:
+            continue
+        employee_id, leave_type_id, year, status, days = entry
+        column = LEDGER_COLUMNS.get(status)
+        if column:
+            deltas[(employee_id, leave_type_id, year)][column] += sign * days
+    with transaction.atomic():
+        for key, change in deltas.items():
+            if change['days_used'] or change['days_pending']:
+                bump(*key, **change)
+
+
+def rebuild_balances(year=None, employee_ids=None):
+    """
+    Recompute the ledger from LeaveRequest with one grouped query, for every
+    year or one year, and every employee or the given ones. Returns the
+    number of ledger rows written.
+    """
+    requests = LeaveRequest.objects.filter(status__in=list(LEDGER_COLUMNS))
+    ledger = LeaveBalance.objects.all()
+    if year is not None:
+        requests = requests.filter(start_date__year=year)
+        ledger = ledger.filter(year=year)
+    if employee_ids is not None:
+        requests = requests.filter(employee_id__in=employee_ids)
+        ledger = ledger.filter(employee_id__in=employee_ids)
+
+    grouped = requests.values('employee_id', 'leave_type_id', year=ExtractYear('start_date')).annotate(
+        used=Sum('days_requested', filter=Q(status='Approved')),
+        pending=Sum('days_requested', filter=Q(status='Pending')),
+    ).order_by()
+    with transaction.atomic():
+        rows = [
+            LeaveBalance(
+                employee_id=row['employee_id'],
+                leave_type_id=row['leave_type_id'],
+                year=row['year'],
+                days_used=row['used'] or 0,
+                days_pending=row['pending'] or 0,
+            )
+            for row in grouped
+        ]
+        ledger.delete()
+        LeaveBalance.objects.bulk_create(rows, batch_size=REBUILD_BATCH_SIZE)
+    return len(rows)
+
+
+def employee_balances(year, department=None, employee_id=None):
+    """
+    Balances for every leave type for the employees of a department (or one
+    employee), in employee_id order. The employees and their ledger rows are
+    one query; the leave types another.
+    """
+    leave_types = list(LeaveType.objects.order_by('name').values_list('id', 'name', 'days_allowed'))
+
+    employees = Employee.objects.all()
+    if department:
+        employees = employees.filter(department=department)
+    if employee_id:
+        employees = employees.filter(employee_id=employee_id)
+    rows = employees.annotate(
+        ledger=FilteredRelation('leavebalance', condition=Q(leavebalance__year=year)),
+    ).values_list(
+        'employee_id', 'full_name', 'ledger__leave_type_id', 'ledger__days_used', 'ledger__days_pending',
+    ).order_by('employee_id')
+
+    results = []
+    current = None
+    for row_employee_id, full_name, leave_type_id, days_used, days_pending in rows:
+        if current is None or current['employee_id'] != row_employee_id:
+            current = {'employee_id': row_employee_id, 'employee_name': full_name, 'ledger': {}}
+            results.append(current)
+        if leave_type_id is not None:
+            current['ledger'][leave_type_id] = (days_used, days_pending)
+
+    for employee in results:
+        ledger = employee.pop('ledger')
+        balances = []
+        for leave_type_id, name, days_allowed in leave_types:
+            days_used, days_pending = ledger.get(leave_type_id, (0, 0))
+            balances.append({
+                'leave_type': leave_type_id,
+                'leave_type_name': name,
+                'days_allowed': days_allowed,
+                'days_used': days_used,
+                'days_pending': days_pending,
+                'days_remaining': days_allowed - days_used,
+            })
+        employee['balances'] = balances
+    return results
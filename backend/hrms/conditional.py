@@ -0,0 +1,109 @@
+"""
+Conditional GET support.
+
+Validators are built from cheap signals rather than from the response body:
+max(updated_at) and a row count for each table a representation reads from,
+or the cached snapshot for the dashboard. A matching If-None-Match (or
+If-Modified-Since, where Last-Modified is offered) gets a 304 from Django's
+condition() decorator before the view queries or serializes anything.
+
+Lists only offer an ETag: deleting a row that is not the newest does not move
+max(updated_at), so a Last-Modified date alone could hide it. The count in
+the ETag covers that case.
+"""
+import hashlib
+import json
+
+from django.core.serializers.json import DjangoJSONEncoder
+from django.db.models import Count, Max
+from django.views.decorators.http import condition
+
+from .models import Employee, Department, LeaveType, LeaveRequest
+from .stats import get_dashboard_stats
+
+
+def table_state(queryset):
+    """(max updated_at, row count) in one query."""
+    state = queryset.order_by().aggregate(last=Max('updated_at'), count=Count('pk'))
+    return state['last'], state['count']
+
+
+def make_etag(request, *parts):
+    # The same data renders differently per query string and Accept header
+    payload = json.dumps(
+        [request.get_full_path(), request.META.get('HTTP_ACCEPT', '')] + list(parts),
+        cls=DjangoJSONEncoder,
+    )
+    return hashlib.sha1(payload.encode()).hexdigest()
+
+
+def _employee_list_etag(request, *args, **kwargs):
+    return make_etag(request, table_state(Employee.objects.all()))
+
+
+def _department_list_etag(request, *args, **kwargs):
+    # employee_count is derived from Employee, so its state is part of the tag
+    return make_etag(request, table_state(Department.objects.all()), table_state(Employee.objects.all()))
+
+
+def _leave_type_list_etag(request, *args, **kwargs):
+    return make_etag(request, table_state(LeaveType.objects.all()))
+
+
+def _dashboard_etag(request, *args, **kwargs):
+    # Hashing the cached snapshot costs no queries on a cache hit
+    return make_etag(request, get_dashboard_stats())
+
+
+def _per_request(func):
+    # condition() asks for the ETag and Last-Modified separately; look the
+    # timestamp up once per request
+    def wrapper(request, *args, **kwargs):
+        cache = request.META.setdefault('hrms.conditional', {})
+        if func.__name__ not in cache:
+            cache[func.__name__] = func(request, *args, **kwargs)
+        return cache[func.__name__]
+    return wrapper
+
+
+@_per_request
+def _employee_updated_at(request, employee_id, *args, **kwargs):
+    return Employee.objects.filter(employee_id=employee_id).values_list('updated_at', flat=True).first()
+
+
+def _employee_etag(request, employee_id, *args, **kwargs):
+    updated_at = _employee_updated_at(request, employee_id)
+    return make_etag(request, updated_at) if updated_at else None
+
+
+def _department_etag(request, pk, *args, **kwargs):
+    department = Department.objects.filter(pk=pk).values_list('name', 'updated_at').first()
+    if department is None:
+        return None
+    name, updated_at = department
+    return make_etag(request, updated_at, table_state(Employee.objects.filter(department=name)))
+
+
+@_per_request
+def _leave_request_updated_at(request, pk, *args, **kwargs):
+    # employee_name and leave_type_name come from the related rows
+    row = LeaveRequest.objects.filter(pk=pk).values_list(
+        'updated_at', 'employee__updated_at', 'leave_type__updated_at'
+    ).first()
+    return max(row) if row else None
+
+
+def _leave_request_etag(request, pk, *args, **kwargs):
+    updated_at = _leave_request_updated_at(request, pk)
+    return make_etag(request, updated_at) if updated_at else None
+
+
+employee_list_condition = condition(etag_func=_employee_list_etag)
+department_list_condition = condition(etag_func=_department_list_etag)
+leave_type_list_condition = condition(etag_func=_leave_type_list_etag)
+dashboard_condition = condition(etag_func=_dashboard_etag)
+employee_detail_condition = condition(etag_func=_employee_etag, last_modified_func=_employee_updated_at)
+department_detail_condition = condition(etag_func=_department_etag)
+leave_request_detail_condition = condition(
+    etag_func=_leave_request_etag, last_modified_func=_leave_request_updated_at
+)
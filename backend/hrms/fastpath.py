@@ -0,0 +1,174 @@
+"""
+Fast read path for the list endpoints.
+
+A page is fetched with .values() and each row is turned into the response
+dict by a per-field converter chosen once per serializer, instead of building
+model instances and running the serializer over them. The converters mirror
+what each DRF field's to_representation() does, so the rendered JSON is byte
+for byte the same; serializers with fields that can't be expressed this way
+(method fields, nested serializers, source='*') fall back to the normal path.
+"""
+import decimal
+
+from django.conf import settings
+from django.db.models.constants import LOOKUP_SEP
+from rest_framework import ISO_8601, serializers
+from rest_framework.relations import PrimaryKeyRelatedField, RelatedField, ManyRelatedField
+from rest_framework.settings import api_settings
+
+# Fields whose to_representation() returns the database value unchanged
+PASSTHROUGH_FIELDS = (
+    serializers.CharField, serializers.ChoiceField, serializers.IntegerField,
+    serializers.BooleanField,
+)
+
+_plans = {}
+
+
+class ListPlan:
+    """Output keys, the .values() paths they read and their converter binders."""
+
+    def __init__(self, columns):
+        self.columns = columns
+        self.paths = list(dict.fromkeys(path for _, path, _ in columns))
+
+    def render(self, rows):
+        # Converters that depend on request state (the active time zone) are
+        # resolved once per page rather than once per value
+        columns = [(key, path, bind() if bind else None) for key, path, bind in self.columns]
+        data = []
+        for row in rows:
+            item = {}
+            for key, path, convert in columns:
+                value = row[path]
+                item[key] = value if value is None or convert is None else convert(value)
+            data.append(item)
+        return data
+
+
+def _static(convert):
+    return lambda: convert
+
+
+def _datetime_binder(field):
+    def bind():
+        field_timezone = field.timezone if hasattr(field, 'timezone') else field.default_timezone()
+        if field_timezone is None:
+            return field.to_representation
+
+        def convert(value):
+            if value.utcoffset() is None:
+                return field.to_representation(value)
+            # DateTimeField.enforce_timezone() and its ISO 8601 output
+            text = value.astimezone(field_timezone).isoformat()
+            return text[:-6] + 'Z' if text.endswith('+00:00') else text
+        return convert
+    return bind
+
+
+def _decimal_binder(field):
+    coerce_to_string = getattr(field, 'coerce_to_string', api_settings.COERCE_DECIMAL_TO_STRING)
+    if field.decimal_places is None or not coerce_to_string or field.localize:
+        return _static(field.to_representation)
+    exponent = decimal.Decimal('.1') ** field.decimal_places
+
+    def bind():
+        # DecimalField.quantize() builds this context on every call
+        context = decimal.getcontext().copy()
+        if field.max_digits is not None:
+            context.prec = field.max_digits
+
+        def convert(value):
+            if not isinstance(value, decimal.Decimal):
+                return field.to_representation(value)
+            return '{:f}'.format(value.quantize(exponent, rounding=field.rounding, context=context))
+        return convert
+    return bind
+
+
+def _converter(field):
+    """
+    Return (ok, binder) for one serializer field. A binder is called once per
+    page and returns the converter; None means the value is used as is.
+    """
+    if isinstance(field, (serializers.BaseSerializer, ManyRelatedField, serializers.SerializerMethodField)):
+        return False, None
+    if isinstance(field, PrimaryKeyRelatedField):
+        # .values('fk') yields the related primary key, which is what it renders
+        return field.pk_field is None, None
+    if isinstance(field, RelatedField):
+        return False, None
+    if isinstance(field, PASSTHROUGH_FIELDS) and not isinstance(field, serializers.MultipleChoiceField):
+        return True, None
+    if isinstance(field, serializers.DateTimeField):
+        output_format = getattr(field, 'format', api_settings.DATETIME_FORMAT)
+        if isinstance(output_format, str) and output_format.lower() == ISO_8601:
+            return True, _datetime_binder(field)
+    elif isinstance(field, serializers.DateField):
+        output_format = getattr(field, 'format', api_settings.DATE_FORMAT)
+        if isinstance(output_format, str) and output_format.lower() == ISO_8601:
+            return True, _static(lambda value: value.isoformat())
+    elif isinstance(field, serializers.TimeField):
+        output_format = getattr(field, 'format', api_settings.TIME_FORMAT)
+        if isinstance(output_format, str) and output_format.lower() == ISO_8601:
+            return True, _static(lambda value: value.isoformat())
+    elif isinstance(field, serializers.DecimalField):
+        return True, _decimal_binder(field)
+    # Anything else keeps the field's own conversion
+    return True, _static(field.to_representation)
+
+
+def get_list_plan(serializer_class, fields=None):
+    """
+    Build (and cache) the plan for `serializer_class` limited to `fields`, or
+    return None when the serializer needs the regular path.
+    """
+    key = (serializer_class, tuple(fields) if fields is not None else None)
+    if key in _plans:
+        return _plans[key]
+
+    serializer = serializer_class()
+    columns = []
+    plan = None
+    for name, field in serializer.fields.items():
+        if fields is not None and name not in fields:
+            continue
+        if field.write_only:
+            continue
+        if field.source == '*':
+            break
+        ok, convert = _converter(field)
+        if not ok:
+            break
+        columns.append((name, field.source.replace('.', LOOKUP_SEP), convert))
+    else:
+        # Values appended by to_representation() straight from a column
+        for name in getattr(serializer_class, 'representation_extra_fields', ()):
+            if fields is None or name in fields:
+                columns.append((name, name, None))
+        plan = ListPlan(columns)
+
+    _plans[key] = plan
+    return plan
+
+
+class FastListMixin:
+    """
+    List views whose page is served from .values() through a ListPlan when
+    settings.HRMS_FAST_LIST is on and the serializer allows it.
+    """
+
+    def list(self, request, *args, **kwargs):
+        plan = None
+        if getattr(settings, 'HRMS_FAST_LIST', False) and self.paginator is not None:
+            fields = self.get_sparse_fields() if hasattr(self, 'get_sparse_fields') else None
+            plan = get_list_plan(self.get_serializer_class(), fields)
+        if plan is None:
+            return super().list(request, *args, **kwargs)
+
+        queryset = self.filter_queryset(self.get_queryset())
+        # The paginator reads the ordering columns off each row for cursors
+        ordering = [name for name, _ in self.paginator.get_ordering(request, queryset, self)]
+        rows = queryset.values(*dict.fromkeys(plan.paths + ordering))
+        page = self.paginate_queryset(rows)
+        return self.get_paginated_response(plan.render(page))
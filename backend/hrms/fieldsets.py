@@ -0,0 +1,81 @@
+"""
+Sparse fieldsets for the list endpoints.
+
+?fields=id,full_name limits each item to the named serializer fields, and
+?compact=true selects the serializer's Meta.list_fields. The view narrows the
+SQL to the columns those fields read, so a compact page of a wide table loads
+a fraction of the data it otherwise would.
+"""
+from django.db.models.constants import LOOKUP_SEP
+from rest_framework import serializers
+
+TRUE_VALUES = ('1', 'true', 'yes')
+
+
+class SparseFieldsMixin:
+    """Serializer side: keep only context['fields'] when the view sets it."""
+
+    def get_fields(self):
+        fields = super().get_fields()
+        wanted = self.context.get('fields')
+        if wanted is None:
+            return fields
+        return {name: field for name, field in fields.items() if name in wanted}
+
+
+class SparseFieldsetViewMixin:
+    """
+    View side: parse ?fields= / ?compact=, hand the result to the serializer
+    and restrict the queryset with only().
+    """
+
+    def get_sparse_fields(self):
+        if not hasattr(self, '_sparse_fields'):
+            self._sparse_fields = self._parse_sparse_fields()
+        return self._sparse_fields
+
+    def _parse_sparse_fields(self):
+        if self.request.method not in ('GET', 'HEAD'):
+            return None
+        params = self.request.query_params
+        serializer_class = self.get_serializer_class()
+        if params.get('fields'):
+            wanted = [name.strip() for name in params['fields'].split(',') if name.strip()]
+            available = serializer_class().fields
+            unknown = [name for name in wanted if name not in available]
+            if unknown:
+                raise serializers.ValidationError({'fields': [f'Unknown field(s): {", ".join(unknown)}']})
+            return wanted
+        if params.get('compact', '').lower() in TRUE_VALUES:
+            return list(serializer_class.Meta.list_fields)
+        return None
+
+    def get_serializer_context(self):
+        context = super().get_serializer_context()
+        fields = self.get_sparse_fields()
+        if fields is not None:
+            context['fields'] = fields
+        return context
+
+    def narrow_queryset(self, queryset):
+        fields = self.get_sparse_fields()
+        if fields is None:
+            return queryset
+        available = self.get_serializer_class()().fields
+
+        paths = set()
+        for name in fields:
+            field = available[name]
+            if field.source == '*':
+                # Method fields may read anything on the instance
+                return queryset
+            paths.add(field.source.replace('.', LOOKUP_SEP))
+        # Keyset pagination reads the ordering columns off each row
+        for name in list(getattr(self, 'ordering', None) or []) + list(getattr(self, 'ordering_fields', None) or []):
+            paths.add(name.lstrip('-'))
+
+        relations = {path.split(LOOKUP_SEP)[0] for path in paths if LOOKUP_SEP in path}
+        queryset = queryset.select_related(None)
+        if relations:
+            queryset = queryset.select_related(*relations)
+        return queryset.only(*paths, *relations)
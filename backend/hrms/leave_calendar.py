@@ -0,0 +1,107 @@
+"""
+Leave intervals: overlap checks and the team calendar.
+
+A request occupies [start_date, end_date], both inclusive. Pending and
+Approved requests hold their dates; Rejected and Cancelled ones free them.
+
+The calendar reads every request that touches the window in one query,
+ordered by start date, and assembles the response in time linear in the
+number of requests plus the number of days.
+"""
+from datetime import timedelta
+
+from .models import LeaveRequest
+
+ACTIVE_STATUSES = ['Pending', 'Approved']
+
+# Longest window the calendar endpoint serves
+MAX_CALENDAR_DAYS = 366
+
+
+def overlapping_leave(employee_id, start_date, end_date, exclude_pk=None):
+    """The employee's first active request sharing a day with the range, or None."""
+    queryset = LeaveRequest.objects.filter(
+        employee_id=employee_id,
+        status__in=ACTIVE_STATUSES,
+        start_date__lte=end_date,
+        end_date__gte=start_date,
+    )
+    if exclude_pk is not None:
+        queryset = queryset.exclude(pk=exclude_pk)
+    return queryset.order_by('start_date').values('id', 'start_date', 'end_date', 'status').first()
+
+
+class LeaveCalendar:
+    """
+    Leave intervals clipped to [start, end], sorted by start date. Built
+    from rows already in that order, so nothing is sorted here.
+    """
+
+    FIELDS = [
+        'id', 'employee_id', 'employee__full_name', 'employee__department',
+        'leave_type__name', 'start_date', 'end_date', 'status',
+    ]
+
+    def __init__(self, start, end, rows):
+        self.start = start
+        self.end = end
+        self.rows = rows
+
+    @classmethod
+    def load(cls, start, end, department=None, statuses=None):
+        queryset = LeaveRequest.objects.filter(
+            status__in=statuses or ACTIVE_STATUSES,
+            start_date__lte=end,
+            end_date__gte=start,
+        )
+        if department:
+            queryset = queryset.filter(employee__department=department)
+        rows = list(queryset.order_by('start_date', 'id').values_list(*cls.FIELDS))
+        return cls(start, end, rows)
+
+    def daily_counts(self):
+        """
+        Employees on leave each day, by status: a sweep over start/end
+        events in a per-day difference array.
+        """
+        length = (self.end - self.start).days + 1
+        changes = {status: [0] * (length + 1) for status in ACTIVE_STATUSES}
+        for _, _, _, _, _, start_date, end_date, status in self.rows:
+            delta = changes.get(status)
+            if delta is None:
+                continue
+            delta[max((start_date - self.start).days, 0)] += 1
+            delta[min((end_date - self.start).days, length - 1) + 1] -= 1
+
+        days = []
+        running = dict.fromkeys(ACTIVE_STATUSES, 0)
+        for offset in range(length):
+            for status in ACTIVE_STATUSES:
+                running[status] += changes[status][offset]
+            days.append({
+                'date': (self.start + timedelta(days=offset)).isoformat(),
+                'out': running['Approved'],
+                'pending': running['Pending'],
+            })
+        return days
+
+    def by_employee(self):
+        """Each employee with leave in the window and their intervals, in order of first leave."""
+        employees = {}
+        for leave_id, employee_id, full_name, department, leave_type, start_date, end_date, status in self.rows:
+            employee = employees.get(employee_id)
+            if employee is None:
+                employee = employees[employee_id] = {
+                    'employee_id': employee_id,
+                    'employee_name': full_name,
+                    'department': department,
+                    'leave': [],
+                }
+            employee['leave'].append({
+                'id': leave_id,
+                'leave_type_name': leave_type,
+                'start_date': start_date.isoformat(),
+                'end_date': end_date.isoformat(),
+                'status': status,
+            })
+        return list(employees.values())
@@ -0,0 +1,79 @@
+import statistics
+import time
+
+from django.core.management.base import BaseCommand
+from django.db import connection
+from rest_framework.renderers import JSONRenderer
+
+from hrms.fastpath import get_list_plan
+from hrms.models import Employee, Attendance, LeaveRequest, Payroll
+from hrms.serializers import EmployeeSerializer, AttendanceSerializer, LeaveRequestSerializer, PayrollSerializer
+from hrms.synthetic import clear_dataset, generate_dataset
+
+
+def list_specs():
+    # Same querysets and orderings as the list views
+    return [
+        ('employees', EmployeeSerializer, Employee.objects.order_by('employee_id')),
+        ('attendance', AttendanceSerializer,
+         Attendance.objects.select_related('employee').order_by('-date', 'employee__employee_id')),
+        ('leave-requests', LeaveRequestSerializer,
+         LeaveRequest.objects.select_related('employee', 'leave_type').order_by('-created_at')),
+        ('payroll', PayrollSerializer, Payroll.objects.select_related('employee').order_by('-created_at')),
+    ]
+
+
+class Command(BaseCommand):
+    help = (
+        'Compare serializer and .values() fast-path rendering of large list pages, '
+        'checking the JSON is identical. Runs in a throwaway test database.'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--rows', type=int, default=10000, help='Rows per page')
+        parser.add_argument('--iterations', type=int, default=5)
+        parser.add_argument('--compact', action='store_true', help='Render Meta.list_fields only')
+
+    def handle(self, *args, **options):
+        rows = options['rows']
+        old_name = connection.settings_dict['NAME']
+        connection.creation.create_test_db(verbosity=0, autoclobber=True)
+        try:
+            clear_dataset()
+            # One row per employee in every benchmarked table
+            generate_dataset(
+                employees=rows, days=1, leave_per_employee=1, payroll_months=1,
+                reviews_per_employee=0, notifications_per_employee=0,
+            )
+            for name, serializer_class, queryset in list_specs():
+                self.compare(name, serializer_class, queryset[:rows], options)
+        finally:
+            connection.creation.destroy_test_db(old_name, verbosity=0)
+
+    def compare(self, name, serializer_class, queryset, options):
+        renderer = JSONRenderer()
+        fields = list(serializer_class.Meta.list_fields) if options['compact'] else None
+        context = {'fields': fields} if fields else {}
+        plan = get_list_plan(serializer_class, fields)
+
+        def serializer_path():
+            return renderer.render(serializer_class(list(queryset), many=True, context=context).data)
+
+        def fast_path():
+            return renderer.render(plan.render(queryset.values(*plan.paths)))
+
+        identical = serializer_path() == fast_path()
+        timings = {}
+        for label, render in (('serializer', serializer_path), ('fast', fast_path)):
+            samples = []
+            for _ in range(options['iterations']):
+                started = time.perf_counter()
+                render()
+                samples.append((time.perf_counter() - started) * 1000)
+            timings[label] = statistics.median(samples)
+
+        self.stdout.write(
+            f'{name:16} serializer {timings["serializer"]:8.1f} ms  fast {timings["fast"]:8.1f} ms  '
+            f'{timings["serializer"] / timings["fast"]:5.1f}x  '
+            + (self.style.SUCCESS('identical') if identical else self.style.ERROR('DIFFERENT'))
+        )
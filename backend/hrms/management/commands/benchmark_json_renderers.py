@@ -0,0 +1,67 @@
+import statistics
+import time
+
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection
+from rest_framework.renderers import JSONRenderer
+
+from hrms.fastpath import get_list_plan
+from hrms.management.commands.benchmark_fast_lists import list_specs
+from hrms.renderers import FastJSONRenderer, orjson
+from hrms.synthetic import clear_dataset, generate_dataset
+
+LISTS = ('employees', 'attendance', 'payroll')
+
+
+class Command(BaseCommand):
+    help = (
+        'Compare the stdlib JSONRenderer with FastJSONRenderer on list pages and '
+        'check the bytes are identical. Runs in a throwaway test database.'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--rows', type=int, default=1000, help='Rows per page')
+        parser.add_argument('--iterations', type=int, default=20)
+
+    def handle(self, *args, **options):
+        if orjson is None:
+            raise CommandError('orjson is not installed; FastJSONRenderer would use the stdlib')
+
+        rows = options['rows']
+        old_name = connection.settings_dict['NAME']
+        connection.creation.create_test_db(verbosity=0, autoclobber=True)
+        try:
+            clear_dataset()
+            generate_dataset(
+                employees=rows, days=1, leave_per_employee=0, payroll_months=1,
+                reviews_per_employee=0, notifications_per_employee=0,
+            )
+            for name, serializer_class, queryset in list_specs():
+                if name not in LISTS:
+                    continue
+                plan = get_list_plan(serializer_class)
+                # Same shape as a paginated response body
+                data = {'next': None, 'previous': None, 'results': plan.render(queryset[:rows].values(*plan.paths))}
+                self.compare(name, data, options['iterations'])
+        finally:
+            connection.creation.destroy_test_db(old_name, verbosity=0)
+
+    def compare(self, name, data, iterations):
+        renderers = (('stdlib', JSONRenderer()), ('orjson', FastJSONRenderer()))
+        outputs = {label: renderer.render(data) for label, renderer in renderers}
+
+        timings = {}
+        for label, renderer in renderers:
+            samples = []
+            for _ in range(iterations):
+                started = time.perf_counter()
+                renderer.render(data)
+                samples.append((time.perf_counter() - started) * 1000)
+            timings[label] = statistics.median(samples)
+
+        identical = outputs['stdlib'] == outputs['orjson']
+        self.stdout.write(
+            f'{name:12} {len(outputs["stdlib"]) / 1024:8.1f} KiB  stdlib {timings["stdlib"]:7.2f} ms  '
+            f'orjson {timings["orjson"]:7.2f} ms  {timings["stdlib"] / timings["orjson"]:5.1f}x  '
+            + (self.style.SUCCESS('identical') if identical else self.style.ERROR('DIFFERENT'))
+        )
@@ -0,0 +1,103 @@
+from datetime import date, timedelta
+
+from django.core.management.base import BaseCommand
+from django.db import connection
+from django.test import Client
+from django.urls import reverse
+
+from hrms.models import Employee
+from hrms.stats import invalidate_dashboard_stats
+
+
+class Command(BaseCommand):
+    help = (
+        'Call each read endpoint in hrms/urls.py and print the EXPLAIN plan of '
+        'every SELECT it runs, to check which indexes the database picks.'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--endpoint', action='append', default=[],
+            help='Only explain this URL name (repeatable), e.g. attendance-list-create',
+        )
+        parser.add_argument(
+            '--analyze', action='store_true',
+            help='Run EXPLAIN ANALYZE (PostgreSQL only)',
+        )
+
+    def get_endpoints(self):
+        employee = Employee.objects.order_by('employee_id').first()
+        employee_id = employee.employee_id if employee else 'EMP001'
+        department = employee.department if employee else 'Engineering'
+        today = date.today()
+        month_ago = (today - timedelta(days=30)).isoformat()
+
+        return [
+            ('employee-list-create', reverse('employee-list-create'), {}),
+            ('employee-list-create', reverse('employee-list-create'), {'department': department, 'status': 'Active'}),
+            ('employee-list-create', reverse('employee-list-create'), {'search': department}),
+            ('employee-detail', reverse('employee-detail', args=[employee_id]), {}),
+            ('department-list-create', reverse('department-list-create'), {}),
+            ('attendance-list-create', reverse('attendance-list-create'), {}),
+            ('attendance-list-create', reverse('attendance-list-create'), {'start_date': month_ago, 'status': 'Present'}),
+            ('attendance-list-create', reverse('attendance-list-create'), {'employee_id': employee_id}),
+            ('attendance-stats', reverse('attendance-stats', args=[employee_id]), {}),
+            ('attendance-stats-batch', reverse('attendance-stats-batch'), {'employee_id': employee_id, 'start_date': month_ago}),
+            ('leave-type-list-create', reverse('leave-type-list-create'), {}),
+            ('leave-request-list-create', reverse('leave-request-list-create'), {}),
+            ('leave-request-list-create', reverse('leave-request-list-create'), {'status': 'Pending'}),
+            ('leave-balances', reverse('leave-balances'), {'department': department}),
+            ('leave-calendar', reverse('leave-calendar'), {'start': month_ago, 'end': today.isoformat(), 'department': department}),
+            ('performance-list-create', reverse('performance-list-create'), {}),
+            ('payroll-list-create', reverse('payroll-list-create'), {'status': 'Processed'}),
+            ('notification-list', reverse('notification-list'), {'employee_id': employee_id}),
+            ('notification-list', reverse('notification-list'), {'employee_id': employee_id, 'unread': 'true'}),
+            ('notification-unread-count', reverse('notification-unread-count'), {'employee_id': employee_id}),
+            ('dashboard-stats', reverse('dashboard-stats'), {}),
+            ('department-stats', reverse('department-stats'), {}),
+            ('export-employees', reverse('export-employees'), {'department': department}),
+            ('export-attendance', reverse('export-attendance'), {'start_date': month_ago}),
+        ]
+
+    def handle(self, *args, **options):
+        if options['analyze'] and connection.vendor != 'postgresql':
+            self.stderr.write('--analyze is only supported on PostgreSQL')
+            return
+
+        explain_options = {'analyze': True} if options['analyze'] else {}
+        prefix = connection.ops.explain_query_prefix(**explain_options)
+        client = Client(HTTP_HOST='localhost')
+
+        for name, path, params in self.get_endpoints():
+            if options['endpoint'] and name not in options['endpoint']:
+                continue
+            if name == 'dashboard-stats':
+                # Otherwise a cached snapshot would hide the queries
+                invalidate_dashboard_stats()
+
+            captured = []
+
+            def capture(execute, sql, sql_params, many, context):
+                captured.append((sql, sql_params))
+                return execute(sql, sql_params, many, context)
+
+            with connection.execute_wrapper(capture):
+                response = client.get(path, params)
+                if response.streaming:
+                    for _ in response.streaming_content:
+                        pass
+
+            query_string = '&'.join(f'{key}={value}' for key, value in params.items())
+            self.stdout.write(self.style.MIGRATE_HEADING(
+                f'{name}: GET {path}{"?" + query_string if query_string else ""} '
+                f'-> {response.status_code}, {len(captured)} queries'
+            ))
+            for sql, sql_params in captured:
+                if not sql.lstrip().upper().startswith('SELECT'):
+                    continue
+                self.stdout.write(f'  {sql} {list(sql_params or [])}')
+                with connection.cursor() as cursor:
+                    cursor.execute(f'{prefix} {sql}', sql_params)
+                    for row in cursor.fetchall():
+                        self.stdout.write('    ' + ' | '.join(str(column) for column in row))
+            self.stdout.write('')
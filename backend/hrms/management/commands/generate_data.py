@@ -0,0 +1,46 @@
+import time
+
+from django.core.management.base import BaseCommand
+
+from hrms.synthetic import clear_dataset, generate_dataset
+
+
+class Command(BaseCommand):
+    help = 'Generate a synthetic HRMS dataset of configurable size with bulk inserts.'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--employees', type=int, default=1000)
+        parser.add_argument('--departments', type=int, default=8)
+        parser.add_argument('--days', type=int, default=30, help='Days of attendance ending today')
+        parser.add_argument('--leave-per-employee', type=int, default=2)
+        parser.add_argument('--payroll-months', type=int, default=3)
+        parser.add_argument('--reviews-per-employee', type=int, default=1)
+        parser.add_argument('--notifications-per-employee', type=int, default=3)
+        parser.add_argument('--seed', type=int, default=42)
+        parser.add_argument('--prefix', default='EMP', help='Employee ID prefix')
+        parser.add_argument(
+            '--clear', action='store_true',
+            help='Delete all HRMS rows before generating',
+        )
+
+    def handle(self, *args, **options):
+        if options['clear']:
+            clear_dataset()
+
+        started = time.perf_counter()
+        counts = generate_dataset(
+            employees=options['employees'],
+            departments=options['departments'],
+            days=options['days'],
+            leave_per_employee=options['leave_per_employee'],
+            payroll_months=options['payroll_months'],
+            reviews_per_employee=options['reviews_per_employee'],
+            notifications_per_employee=options['notifications_per_employee'],
+            seed=options['seed'],
+            prefix=options['prefix'],
+        )
+        elapsed = time.perf_counter() - started
+
+        for name, count in counts.items():
+            self.stdout.write(f'{name}: {count}')
+        self.stdout.write(self.style.SUCCESS(f'Generated {sum(counts.values())} rows in {elapsed:.1f}s'))
@@ -0,0 +1,153 @@
+import asyncio
+import json
+import time
+from urllib.parse import urlsplit
+
+from django.core.management.base import BaseCommand, CommandError
+from django.utils import timezone
+
+# What one dashboard user loads, on each deployment
+PATHS = {
+    'wsgi': ['/api/dashboard/stats/', '/api/analytics/department-stats/'],
+    'asgi': ['/api/async/dashboard/stats/', '/api/async/analytics/department-stats/'],
+}
+
+
+def _percentile(timings, fraction):
+    if not timings:
+        return 0.0
+    return timings[min(len(timings) - 1, int(len(timings) * fraction))]
+
+
+async def _request(reader, writer, host, path):
+    writer.write(
+        f'GET {path} HTTP/1.1\r\nHost: {host}\r\nAccept: application/json\r\n'
+        f'Connection: keep-alive\r\n\r\n'.encode()
+    )
+    await writer.drain()
+    head = await reader.readuntil(b'\r\n\r\n')
+    lines = head.decode('latin-1').split('\r\n')
+    status = int(lines[0].split()[1])
+    headers = {}
+    for line in lines[1:]:
+        if ':' in line:
+            name, value = line.split(':', 1)
+            headers[name.strip().lower()] = value.strip()
+    if 'content-length' in headers:
+        await reader.readexactly(int(headers['content-length']))
+    elif headers.get('transfer-encoding') == 'chunked':
+        while True:
+            size = int((await reader.readline()).split(b';')[0], 16)
+            await reader.readexactly(size + 2)
+            if not size:
+                break
+    return status, headers.get('connection', '').lower() != 'close'
+
+
+async def _user(base_url, paths, deadline, timings, errors):
+    parts = urlsplit(base_url)
+    port = parts.port or 80
+    connection = None
+    while time.perf_counter() < deadline:
+        for path in paths:
+            started = time.perf_counter()
+            try:
+                if connection is None:
+                    connection = await asyncio.open_connection(parts.hostname, port)
+                reader, writer = connection
+                status, keep_alive = await _request(reader, writer, parts.netloc, parts.path.rstrip('/') + path)
+            except (OSError, asyncio.IncompleteReadError, ValueError):
+                errors.append('connection')
+                if connection is not None:
+                    connection[1].close()
+                    connection = None
+                # Don't spin against a server that is down
+                await asyncio.sleep(0.05)
+                continue
+            timings.append((time.perf_counter() - started) * 1000)
+            if status != 200:
+                errors.append(status)
+            if not keep_alive:
+                writer.close()
+                connection = None
+    if connection is not None:
+        connection[1].close()
+
+
+async def _run(base_url, paths, users, duration):
+    timings, errors = [], []
+    started = time.perf_counter()
+    deadline = started + duration
+    await asyncio.gather(*(_user(base_url, paths, deadline, timings, errors) for _ in range(users)))
+    elapsed = time.perf_counter() - started
+    timings.sort()
+    return {
+        'base_url': base_url,
+        'paths': paths,
+        'requests': len(timings),
+        'errors': len(errors),
+        'throughput_rps': round(len(timings) / elapsed, 1),
+        'p50_ms': round(_percentile(timings, 0.50), 2),
+        'p95_ms': round(_percentile(timings, 0.95), 2),
+        'p99_ms': round(_percentile(timings, 0.99), 2),
+        'max_ms': round(timings[-1], 2) if timings else 0.0,
+    }
+
+
+class Command(BaseCommand):
+    help = (
+        'Load-test the dashboard endpoints with many concurrent users against a '
+        'running WSGI server, a running ASGI server, or both, and compare '
+        'throughput and tail latency. Start the servers yourself, for example: '
+        'gunicorn hrms_project.wsgi -w 4 -b 127.0.0.1:8000 and '
+        'uvicorn hrms_project.asgi:application --workers 4 --port 8001.'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--wsgi', help='Base URL of the WSGI deployment, e.g. http://127.0.0.1:8000')
+        parser.add_argument('--asgi', help='Base URL of the ASGI deployment, e.g. http://127.0.0.1:8001')
+        parser.add_argument('--users', type=int, default=100, help='Concurrent users (default: 100)')
+        parser.add_argument('--duration', type=float, default=20, help='Seconds per run (default: 20)')
+        parser.add_argument('--warmup', type=float, default=2, help='Unmeasured seconds before each run')
+        parser.add_argument('--sync-paths', action='store_true',
+                            help='Send the sync endpoints to the ASGI server as well')
+        parser.add_argument('--output', default='load-test-results.json')
+
+    def handle(self, *args, **options):
+        targets = [(kind, options[kind]) for kind in ('wsgi', 'asgi') if options[kind]]
+        if not targets:
+            raise CommandError('Give --wsgi and/or --asgi')
+        if options['users'] < 1:
+            raise CommandError('--users must be at least 1')
+
+        results = {
+            'meta': {
+                'started_at': timezone.now().isoformat(),
+                'users': options['users'],
+                'duration': options['duration'],
+            },
+            'targets': {},
+        }
+        for kind, base_url in targets:
+            paths = PATHS['wsgi' if options['sync_paths'] else kind]
+            self.stdout.write(self.style.MIGRATE_HEADING(f'{kind}: {base_url}'))
+            if options['warmup'] > 0:
+                asyncio.run(_run(base_url, paths, options['users'], options['warmup']))
+            result = asyncio.run(_run(base_url, paths, options['users'], options['duration']))
+            results['targets'][kind] = result
+            self.stdout.write(
+                f'  {result["requests"]} requests, {result["errors"]} errors, '
+                f'{result["throughput_rps"]:.1f} req/s, p50 {result["p50_ms"]:.2f} ms, '
+                f'p95 {result["p95_ms"]:.2f} ms, p99 {result["p99_ms"]:.2f} ms, max {result["max_ms"]:.2f} ms'
+            )
+
+        if len(results['targets']) == 2:
+            wsgi, asgi = results['targets']['wsgi'], results['targets']['asgi']
+            self.stdout.write(self.style.MIGRATE_HEADING('asgi / wsgi'))
+            for key in ('throughput_rps', 'p50_ms', 'p95_ms', 'p99_ms'):
+                if wsgi[key]:
+                    self.stdout.write(f'  {key:16} {asgi[key] / wsgi[key]:6.2f}x')
+
+        with open(options['output'], 'w') as handle:
+            json.dump(results, handle, indent=2)
+        self.stdout.write(self.style.SUCCESS(f'Results written to {options["output"]}'))
@@ -0,0 +1,31 @@
+import time
+from datetime import date
+
+from django.core.management.base import BaseCommand, CommandError
+
+from hrms.rollup import rebuild_rollup
+from hrms.stats import invalidate_dashboard_stats
+
+
+class Command(BaseCommand):
+    help = 'Recompute the daily attendance rollup from the Attendance table.'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--start', help='First date to rebuild (YYYY-MM-DD); default all')
+        parser.add_argument('--end', help='Last date to rebuild (YYYY-MM-DD); default all')
+
+    def handle(self, *args, **options):
+        try:
+            start = date.fromisoformat(options['start']) if options['start'] else None
+            end = date.fromisoformat(options['end']) if options['end'] else None
+        except ValueError as e:
+            raise CommandError(str(e))
+        if start and end and start > end:
+            raise CommandError('--start must not be after --end')
+
+        started = time.perf_counter()
+        rows = rebuild_rollup(start=start, end=end)
+        invalidate_dashboard_stats()
+        self.stdout.write(self.style.SUCCESS(
+            f'Wrote {rows} rollup rows in {time.perf_counter() - started:.1f}s'
+        ))
@@ -0,0 +1,14 @@
+from django.core.management.base import BaseCommand
+
+from hrms.search import fts_available, install_search_index
+
+
+class Command(BaseCommand):
+    help = 'Recreate the employee full-text index and its triggers, then reindex every employee.'
+
+    def handle(self, *args, **options):
+        if not fts_available():
+            self.stdout.write('The full-text index is only used on SQLite; searches use icontains here')
+            return
+        install_search_index(rebuild=True)
+        self.stdout.write(self.style.SUCCESS('Employee search index rebuilt'))
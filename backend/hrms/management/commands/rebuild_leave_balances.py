@@ -0,0 +1,19 @@
+import time
+
+from django.core.management.base import BaseCommand
+
+from hrms.balances import rebuild_balances
+
+
+class Command(BaseCommand):
+    help = 'Recompute the leave balance ledger from the LeaveRequest table.'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--year', type=int, help='Only rebuild this year; default all')
+
+    def handle(self, *args, **options):
+        started = time.perf_counter()
+        rows = rebuild_balances(year=options['year'])
+        self.stdout.write(self.style.SUCCESS(
+            f'Wrote {rows} balance rows in {time.perf_counter() - started:.1f}s'
+        ))
@@ -0,0 +1,277 @@
+import json
+import platform
+import statistics
+import time
+import tracemalloc
+from datetime import date, timedelta
+from itertools import count
+
+import django
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection
+from django.test import Client
+from django.urls import reverse
+from django.utils import timezone
+
+from hrms import urls as hrms_urls
+from hrms.middleware import QueryTimer, active_query_timers, track_queries
+from hrms.models import Employee, LeaveRequest, LeaveType, Department
+from hrms.synthetic import clear_dataset, generate_dataset
+
+SKIPPED_ENDPOINTS = {'api-metrics'}
+
+
+def _import_rows(sequence):
+    batch = next(sequence)
+    return [
+        {
+            'employee_id': f'BENCH{batch:05d}{i:04d}',
+            'full_name': f'Bench Import {i}',
+            'email': f'bench{batch:05d}{i:04d}@example.com',
+            'department': 'Engineering',
+        }
+        for i in range(100)
+    ]
+
+
+def build_endpoints(ctx):
+    """
+    Request specs by URL name: a callable returning (method, path, data).
+    Write endpoints use payloads that can be repeated against the same data.
+    """
+    today = date.today().isoformat()
+    month_ago = (date.today() - timedelta(days=30)).isoformat()
+    employee_id = ctx['employee_id']
+    sequence = count()
+
+    endpoints = {
+        'employee-list-create': lambda: ('get', reverse('employee-list-create'), {}),
+        'bulk-import-employees': lambda: (
+            'post', reverse('bulk-import-employees'), {'employees': _import_rows(sequence)}
+        ),
+        'employee-search': lambda: ('get', reverse('employee-search'), {'q': ctx['search_query']}),
+        'employee-suggest': lambda: ('get', reverse('employee-suggest'), {'q': ctx['search_query'][:3]}),
+        'employee-detail': lambda: ('get', reverse('employee-detail', args=[employee_id]), {}),
+        'department-list-create': lambda: ('get', reverse('department-list-create'), {}),
+        'department-detail': lambda: ('get', reverse('department-detail', args=[ctx['department_pk']]), {}),
+        'attendance-list-create': lambda: ('get', reverse('attendance-list-create'), {'start_date': month_ago}),
+        'attendance-bulk': lambda: ('post', reverse('attendance-bulk'), {'records': [
+            {'employee_id': other, 'date': today, 'status': 'Present'} for other in ctx['employee_ids'][:500]
+        ]}),
+        'attendance-stats-batch': lambda: ('get', reverse('attendance-stats-batch'), {
+            'employee_id': ','.join(ctx['employee_ids'][:100]), 'start_date': month_ago,
+        }),
+        'attendance-stats': lambda: ('get', reverse('attendance-stats', args=[employee_id]), {}),
+        'leave-type-list-create': lambda: ('get', reverse('leave-type-list-create'), {}),
+        'leave-request-list-create': lambda: ('get', reverse('leave-request-list-create'), {'status': 'Pending'}),
+        'leave-calendar': lambda: ('get', reverse('leave-calendar'), {
+            'start': ctx['month_start'], 'end': (date.today() + timedelta(days=30)).isoformat(),
+        }),
+        'leave-balances': lambda: ('get', reverse('leave-balances'), {'department': ctx['department']}),
+        # Decides the pending requests on the first call; repeats find them already decided
+        'leave-request-bulk-decision': lambda: ('post', reverse('leave-request-bulk-decision'), {
+            'ids': ctx['pending_leave_ids'], 'status': 'Approved', 'approved_by': 'BENCH',
+        }),
+        'leave-request-detail': lambda: ('get', reverse('leave-request-detail', args=[ctx['leave_request_pk']]), {}),
+        'performance-list-create': lambda: ('get', reverse('performance-list-create'), {}),
+        'payroll-list-create': lambda: ('get', reverse('payroll-list-create'), {}),
+        'payroll-run': lambda: ('post', reverse('payroll-run'), {
+            'pay_period_start': ctx['month_start'], 'pay_period_end': today,
+        }),
+        'notification-list': lambda: ('get', reverse('notification-list'), {'employee_id': employee_id}),
+        'notification-unread-count': lambda: ('get', reverse('notification-unread-count'), {'employee_id': employee_id}),
+        # Marks everything read on the first call; repeats find nothing unread
+        'notification-mark-read': lambda: ('post', reverse('notification-mark-read'), {'employee_id': employee_id}),
+        # timeout=0 measures the check itself rather than the wait
+        'notification-poll-async': lambda: ('get', reverse('notification-poll-async'), {
+            'employee_id': employee_id, 'after': 0, 'timeout': 0,
+        }),
+        'dashboard-stats': lambda: ('get', reverse('dashboard-stats'), {}),
+        'department-stats': lambda: ('get', reverse('department-stats'), {}),
+        'dashboard-stats-async': lambda: ('get', reverse('dashboard-stats-async'), {}),
+        'department-stats-async': lambda: ('get', reverse('department-stats-async'), {}),
+        'attendance-stats-batch-async': lambda: ('get', reverse('attendance-stats-batch-async'), {
+            'employee_id': ','.join(ctx['employee_ids'][:100]), 'start_date': month_ago,
+        }),
+        'attendance-stats-async': lambda: ('get', reverse('attendance-stats-async', args=[employee_id]), {}),
+        'export-employees': lambda: ('get', reverse('export-employees'), {}),
+        'export-attendance': lambda: ('get', reverse('export-attendance'), {'start_date': month_ago}),
+    }
+    if ctx['department_pk'] is None:
+        del endpoints['department-detail']
+    if ctx['leave_request_pk'] is None:
+        del endpoints['leave-request-detail']
+    return endpoints
+
+
+class Command(BaseCommand):
+    help = (
+        'Benchmark every endpoint in hrms/urls.py against synthetic datasets of '
+        'increasing size and write latency, query counts and peak memory to JSON. '
+        'Runs in a throwaway test database.'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--scales', default='1000,10000,100000',
+            help='Comma-separated employee counts (default: 1000,10000,100000)',
+        )
+        parser.add_argument('--days', type=int, default=30, help='Days of attendance per dataset')
+        parser.add_argument('--departments', type=int, default=8)
+        parser.add_argument('--iterations', type=int, default=5, help='Timed requests per endpoint')
+        parser.add_argument('--endpoint', action='append', default=[], help='Only benchmark this URL name')
+        parser.add_argument('--output', default='benchmark-results.json')
+        parser.add_argument('--compare', help='Earlier results file to print p50 changes against')
+
+    def handle(self, *args, **options):
+        try:
+            scales = [int(scale) for scale in options['scales'].split(',') if scale]
+        except ValueError:
+            raise CommandError('--scales must be a comma-separated list of integers')
+
+        baseline = None
+        if options['compare']:
+            with open(options['compare']) as handle:
+                baseline = json.load(handle)
+
+        results = {
+            'meta': {
+                'started_at': timezone.now().isoformat(),
+                'python': platform.python_version(),
+                'django': django.get_version(),
+                'database': connection.vendor,
+                'days': options['days'],
+                'departments': options['departments'],
+                'iterations': options['iterations'],
+            },
+            'scales': {},
+        }
+
+        old_name = connection.settings_dict['NAME']
+        connection.creation.create_test_db(verbosity=0, autoclobber=True)
+        try:
+            for scale in scales:
+                results['scales'][str(scale)] = self.run_scale(scale, options)
+        finally:
+            connection.creation.destroy_test_db(old_name, verbosity=0)
+
+        with open(options['output'], 'w') as handle:
+            json.dump(results, handle, indent=2)
+        self.stdout.write(self.style.SUCCESS(f'Results written to {options["output"]}'))
+
+        if baseline:
+            self.print_comparison(baseline, results)
+
+    def run_scale(self, scale, options):
+        self.stdout.write(self.style.MIGRATE_HEADING(f'{scale} employees'))
+        clear_dataset()
+        started = time.perf_counter()
+        counts = generate_dataset(
+            employees=scale, departments=options['departments'], days=options['days']
+        )
+        generate_seconds = time.perf_counter() - started
+        self.stdout.write(f'  dataset: {sum(counts.values())} rows in {generate_seconds:.1f}s')
+
+        LeaveType.objects.get_or_create(name='Annual Leave', defaults={'days_allowed': 21})
+        employee_ids = list(Employee.objects.order_by('employee_id').values_list('employee_id', flat=True)[:500])
+        ctx = {
+            'employee_id': employee_ids[0],
+            'department': Employee.objects.values_list('department', flat=True).first(),
+            'employee_ids': employee_ids,
+            'month_start': date.today().replace(day=1).isoformat(),
+            'department_pk': Department.objects.values_list('pk', flat=True).first(),
+            'leave_request_pk': LeaveRequest.objects.values_list('pk', flat=True).first(),
+            'pending_leave_ids': list(LeaveRequest.objects.filter(status='Pending').values_list('pk', flat=True)[:500]),
+            # A name prefix with a dropped letter exercises the fuzzy path
+            'search_query': Employee.objects.values_list('full_name', flat=True).first()[:6].replace('a', '', 1),
+        }
+        endpoints = build_endpoints(ctx)
+        client = Client(HTTP_HOST='localhost')
+
+        measured = {}
+        for pattern in hrms_urls.urlpatterns:
+            name = pattern.name
+            if name in SKIPPED_ENDPOINTS or (options['endpoint'] and name not in options['endpoint']):
+                continue
+            if name not in endpoints:
+                measured[name] = {'skipped': 'no benchmark spec'}
+                continue
+            measured[name] = self.measure(client, endpoints[name], options['iterations'])
+            self.stdout.write(
+                f'  {name:28} p50 {measured[name]["p50_ms"]:9.2f} ms  '
+                f'{measured[name]["queries"]:4} queries  '
+                f'{measured[name]["peak_memory_kb"]:9.1f} KiB peak'
+            )
+
+        return {
+            'dataset': {'rows': counts, 'generate_seconds': round(generate_seconds, 2)},
+            'endpoints': measured,
+        }
+
+    def measure(self, client, spec, iterations):
+        def call():
+            method, path, data = spec()
+            if method == 'get':
+                response = client.get(path, data)
+            else:
+                response = getattr(client, method)(path, data, content_type='application/json')
+            size = 0
+            if response.streaming:
+                for chunk in response.streaming_content:
+                    size += len(chunk)
+            else:
+                size = len(response.content)
+            return response.status_code, size
+
+        # First call is reported separately: it pays for cold caches
+        started = time.perf_counter()
+        # connection.queries is reset by request_started, so count through a
+        # wrapper instead of CaptureQueriesContext
+        timer = QueryTimer()
+        token = track_queries(timer)
+        try:
+            with connection.execute_wrapper(timer):
+                status_code, size = call()
+        finally:
+            active_query_timers.reset(token)
+        first_ms = (time.perf_counter() - started) * 1000
+
+        timings = []
+        for _ in range(iterations):
+            started = time.perf_counter()
+            call()
+            timings.append((time.perf_counter() - started) * 1000)
+
+        tracemalloc.start()
+        try:
+            call()
+            _, peak = tracemalloc.get_traced_memory()
+        finally:
+            tracemalloc.stop()
+
+        timings.sort()
+        return {
+            'status': status_code,
+            'response_bytes': size,
+            'queries': timer.count,
+            'db_ms': round(timer.seconds * 1000, 2),
+            'first_ms': round(first_ms, 2),
+            'p50_ms': round(statistics.median(timings), 2),
+            'p95_ms': round(timings[min(len(timings) - 1, int(len(timings) * 0.95))], 2),
+            'max_ms': round(timings[-1], 2),
+            'peak_memory_kb': round(peak / 1024, 1),
+        }
+
+    def print_comparison(self, baseline, results):
+        self.stdout.write(self.style.MIGRATE_HEADING('p50 change against baseline'))
+        for scale, current in results['scales'].items():
+            previous = baseline.get('scales', {}).get(scale)
+            if not previous:
+                continue
+            for name, metrics in current['endpoints'].items():
+                before = previous['endpoints'].get(name, {}).get('p50_ms')
+                after = metrics.get('p50_ms')
+                if before and after:
+                    self.stdout.write(
+                        f'  {scale:>7} {name:28} {before:9.2f} -> {after:9.2f} ms ({after / before:5.2f}x)'
+                    )
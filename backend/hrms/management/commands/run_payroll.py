@@ -0,0 +1,46 @@
+from datetime import date
+from decimal import Decimal, InvalidOperation
+
+from django.core.management.base import BaseCommand, CommandError
+
+from hrms.payroll import MAX_OVERTIME_HOURS, OVERTIME_MULTIPLIER, run_payroll
+from hrms.stats import invalidate_dashboard_stats
+
+
+class Command(BaseCommand):
+    help = 'Generate Draft payroll for every Active employee in a pay period.'
+
+    def add_arguments(self, parser):
+        parser.add_argument('start', help='Pay period start (YYYY-MM-DD)')
+        parser.add_argument('end', help='Pay period end (YYYY-MM-DD)')
+        parser.add_argument('--department', help='Only run for this department')
+        parser.add_argument('--overtime-multiplier', default=str(OVERTIME_MULTIPLIER))
+        parser.add_argument('--tax-rate', default='0', help='Fraction of gross pay, e.g. 0.2')
+
+    def handle(self, *args, **options):
+        try:
+            start = date.fromisoformat(options['start'])
+            end = date.fromisoformat(options['end'])
+            overtime_multiplier = Decimal(options['overtime_multiplier'])
+            tax_rate = Decimal(options['tax_rate'])
+        except (ValueError, InvalidOperation) as e:
+            raise CommandError(str(e))
+        if start > end:
+            raise CommandError('start must not be after end')
+
+        summary = run_payroll(
+            start, end,
+            department=options['department'],
+            overtime_multiplier=overtime_multiplier,
+            tax_rate=tax_rate,
+        )
+        invalidate_dashboard_stats()
+
+        self.stdout.write(self.style.SUCCESS(
+            f'Payroll {start} to {end}: {summary["created"]} created, {summary["updated"]} updated, '
+            f'{summary["skipped"]} left as processed/paid; total net {summary["total_net_salary"]}'
+        ))
+        if summary['overtime_capped']:
+            self.stderr.write(self.style.WARNING(
+                f'Overtime capped at {MAX_OVERTIME_HOURS} hours for: {", ".join(summary["overtime_capped"])}'
+            ))
@@ -0,0 +1,109 @@
+import threading
+from bisect import bisect_left
+
+
+def _bucket_bounds(start, factor, count):
+    bounds = []
+    value = start
+    for _ in range(count):
+        bounds.append(round(value, 4))
+        value *= factor
+    return bounds
+
+
+# Log-spaced upper bounds, about 10% apart. Percentiles read from them are
+# within one bucket of the exact value, which is plenty for p50/p95/p99.
+MS_BUCKETS = _bucket_bounds(0.05, 1.1, 160)        # 0.05 ms .. ~200 s
+COUNT_BUCKETS = _bucket_bounds(1, 1.1, 160)        # 1 .. ~4M (queries, bytes)
+
+
+class Histogram:
+    """Fixed-bucket histogram; recording is a bisect and an increment."""
+
+    def __init__(self, bounds):
+        self.bounds = bounds
+        self.counts = [0] * (len(bounds) + 1)
+        self.total = 0
+        self.sum = 0.0
+        self.max = 0.0
+
+    def record(self, value):
+        self.counts[bisect_left(self.bounds, value)] += 1
+        self.total += 1
+        self.sum += value
+        if value > self.max:
+            self.max = value
+
+    def percentile(self, fraction):
+        if not self.total:
+            return 0
+        rank = fraction * self.total
+        seen = 0
+        for index, count in enumerate(self.counts):
+            seen += count
+            if seen >= rank:
+                bound = self.bounds[index] if index < len(self.bounds) else self.max
+                return round(min(bound, self.max), 3)
+        return round(self.max, 3)
+
+    def summary(self):
+        return {
+            'mean': round(self.sum / self.total, 3) if self.total else 0,
+            'p50': self.percentile(0.50),
+            'p95': self.percentile(0.95),
+            'p99': self.percentile(0.99),
+            'max': round(self.max, 3),
+        }
+
+
+class EndpointMetrics:
+    def __init__(self):
+        self.requests = 0
+        self.errors = 0
+        self.histograms = {
+            'total_ms': Histogram(MS_BUCKETS),
+            'db_ms': Histogram(MS_BUCKETS),
+            'render_ms': Histogram(MS_BUCKETS),
+            'queries': Histogram(COUNT_BUCKETS),
+            'response_bytes': Histogram(COUNT_BUCKETS),
+        }
+
+
+class MetricsRegistry:
+    """
+    Per-process request metrics keyed by URL name. Each worker keeps its own
+    registry, so /api/_metrics/ reports the worker that served it.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._endpoints = {}
+
+    def record(self, name, status_code, values):
+        with self._lock:
+            metrics = self._endpoints.get(name)
+            if metrics is None:
+                metrics = self._endpoints[name] = EndpointMetrics()
+            metrics.requests += 1
+            if status_code >= 500:
+                metrics.errors += 1
+            for key, value in values.items():
+                metrics.histograms[key].record(value)
+
+    def snapshot(self):
+        with self._lock:
+            return {
+                name: {
+                    'requests': metrics.requests,
+                    'errors': metrics.errors,
+                    **{key: histogram.summary() for key, histogram in metrics.histograms.items()},
+                }
+                for name, metrics in sorted(self._endpoints.items())
+            }
+
+    def reset(self):
+        with self._lock:
+            self._endpoints.clear()
+
+
+registry = MetricsRegistry()
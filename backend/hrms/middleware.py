@@ -0,0 +1,133 @@
+import threading
+import time
+from contextvars import ContextVar
+
+from asgiref.sync import iscoroutinefunction, markcoroutinefunction
+from django.conf import settings
+from django.db import connection
+
+from .metrics import registry
+
+
+class QueryTimer:
+    """
+    connection.execute_wrapper hook that counts queries and their time. One
+    timer may be attached to several threads' connections at once.
+    """
+
+    def __init__(self):
+        self.count = 0
+        self.seconds = 0.0
+        self._lock = threading.Lock()
+
+    def __call__(self, execute, sql, params, many, context):
+        start = time.perf_counter()
+        try:
+            return execute(sql, params, many, context)
+        finally:
+            elapsed = time.perf_counter() - start
+            with self._lock:
+                self.seconds += elapsed
+                self.count += 1
+
+
+# QueryTimers active in this context, for queries run on other threads' connections
+active_query_timers = ContextVar('hrms_query_timers', default=())
+
+
+def track_queries(timer):
+    """Make `timer` active for the current context; returns a token for reset()."""
+    return active_query_timers.set(active_query_timers.get() + (timer,))
+
+
+class ApiMetricsMiddleware:
+    """
+    Records query count, DB time, render time and response size for every
+    /api/ request, keyed by URL name, and reports them in a Server-Timing
+    header. Aggregates are served by the api-metrics endpoint.
+
+    Set HRMS_API_METRICS = False to turn it off.
+    """
+
+    sync_capable = True
+    async_capable = True
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+        self.enabled = getattr(settings, 'HRMS_API_METRICS', True)
+        self.async_mode = iscoroutinefunction(get_response)
+        if self.async_mode:
+            markcoroutinefunction(self)
+
+    def __call__(self, request):
+        if self.async_mode:
+            return self.__acall__(request)
+        if not self._measured(request):
+            return self.get_response(request)
+
+        timer, start = self._begin(request)
+        token = track_queries(timer)
+        try:
+            with connection.execute_wrapper(timer):
+                response = self.get_response(request)
+        finally:
+            active_query_timers.reset(token)
+        return self._finish(request, response, timer, start)
+
+    async def __acall__(self, request):
+        if not self._measured(request):
+            return await self.get_response(request)
+
+        # Queries run in worker threads; hrms.async_views attaches the active
+        # timers to each worker's connection
+        timer, start = self._begin(request)
+        token = track_queries(timer)
+        try:
+            response = await self.get_response(request)
+        finally:
+            active_query_timers.reset(token)
+        return self._finish(request, response, timer, start)
+
+    def _measured(self, request):
+        return self.enabled and request.path.startswith('/api/')
+
+    def _begin(self, request):
+        request._metrics_render = [0.0, 0.0]
+        return QueryTimer(), time.perf_counter()
+
+    def _finish(self, request, response, timer, start):
+        total = time.perf_counter() - start
+
+        render_start, render_end = request._metrics_render
+        render = render_end - render_start if render_end else 0.0
+        size = 0 if response.streaming else len(response.content)
+
+        response['Server-Timing'] = (
+            f'db;dur={timer.seconds * 1000:.2f};desc="{timer.count} queries", '
+            f'render;dur={render * 1000:.2f}, '
+            f'total;dur={total * 1000:.2f}'
+        )
+
+        match = request.resolver_match
+        if match and match.url_name and match.url_name != 'api-metrics':
+            registry.record(match.url_name, response.status_code, {
+                'total_ms': total * 1000,
+                'db_ms': timer.seconds * 1000,
+                'render_ms': render * 1000,
+                'queries': timer.count,
+                'response_bytes': size,
+            })
+        return response
+
+    def process_template_response(self, request, response):
+        # DRF responses are rendered right after this hook; the post-render
+        # callback closes the interval
+        marks = getattr(request, '_metrics_render', None)
+        if marks is not None:
+            marks[0] = time.perf_counter()
+
+            def rendered(response):
+                marks[1] = time.perf_counter()
+
+            response.add_post_render_callback(rendered)
+        return response
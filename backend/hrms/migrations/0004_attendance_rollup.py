@@ -0,0 +1,48 @@
+# Generated by Django 4.2.7 on 2026-10-17 23:34
+
+from django.db import migrations, models
+from django.db.models import Count, Sum
+
+
+def build_rollup(apps, schema_editor):
+    Attendance = apps.get_model('hrms', 'Attendance')
+    AttendanceRollup = apps.get_model('hrms', 'AttendanceRollup')
+    grouped = Attendance.objects.values('date', 'employee__department', 'status').annotate(
+        count=Count('id'), hours=Sum('hours_worked'),
+    ).order_by()
+    AttendanceRollup.objects.bulk_create([
+        AttendanceRollup(
+            date=row['date'],
+            department=row['employee__department'],
+            status=row['status'],
+            count=row['count'],
+            hours_worked=row['hours'] or 0,
+        )
+        for row in grouped
+    ], batch_size=1000)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('hrms', '0003_hot_filter_indexes'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='AttendanceRollup',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('date', models.DateField()),
+                ('department', models.CharField(max_length=50)),
+                ('status', models.CharField(choices=[('Present', 'Present'), ('Absent', 'Absent'), ('Late', 'Late'), ('Half Day', 'Half Day')], max_length=10)),
+                ('count', models.IntegerField(default=0)),
+                ('hours_worked', models.DecimalField(decimal_places=2, default=0, max_digits=12)),
+            ],
+            options={
+                'ordering': ['-date', 'department', 'status'],
+                'unique_together': {('date', 'department', 'status')},
+            },
+        ),
+        migrations.RunPython(build_rollup, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,54 @@
+# Generated by Django 4.2.7 on 2026-10-17 23:57
+
+from django.db import migrations, models
+from django.db.models import Q, Sum
+from django.db.models.functions import ExtractYear
+import django.db.models.deletion
+
+
+def build_balances(apps, schema_editor):
+    LeaveRequest = apps.get_model('hrms', 'LeaveRequest')
+    LeaveBalance = apps.get_model('hrms', 'LeaveBalance')
+    grouped = LeaveRequest.objects.filter(status__in=['Approved', 'Pending']).values(
+        'employee_id', 'leave_type_id', year=ExtractYear('start_date'),
+    ).annotate(
+        used=Sum('days_requested', filter=Q(status='Approved')),
+        pending=Sum('days_requested', filter=Q(status='Pending')),
+    ).order_by()
+    LeaveBalance.objects.bulk_create([
+        LeaveBalance(
+            employee_id=row['employee_id'],
+            leave_type_id=row['leave_type_id'],
+            year=row['year'],
+            days_used=row['used'] or 0,
+            days_pending=row['pending'] or 0,
+        )
+        for row in grouped
+    ], batch_size=1000)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('hrms', '0005_conditional_get_validators'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='LeaveBalance',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('year', models.IntegerField()),
+                ('days_used', models.IntegerField(default=0)),
+                ('days_pending', models.IntegerField(default=0)),
+                ('updated_at', models.DateTimeField(auto_now=True)),
+                ('employee', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, to='hrms.employee', to_field='employee_id')),
+                ('leave_type', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, to='hrms.leavetype')),
+            ],
+            options={
+                'ordering': ['employee', 'leave_type', 'year'],
+                'unique_together': {('employee', 'leave_type', 'year')},
+            },
+        ),
+        migrations.RunPython(build_balances, migrations.RunPython.noop),
+    ]
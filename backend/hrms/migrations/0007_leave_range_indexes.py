@@ -0,0 +1,21 @@
+# Generated by Django 4.2.7 on 2026-10-17 23:58
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('hrms', '0006_leave_balance'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='leaverequest',
+            index=models.Index(fields=['employee', 'start_date', 'end_date'], name='hrms_leave_emp_range_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='leaverequest',
+            index=models.Index(fields=['end_date', 'start_date'], name='hrms_leave_range_idx'),
+        ),
+    ]
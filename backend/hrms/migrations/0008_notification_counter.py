@@ -0,0 +1,36 @@
+# Generated by Django 4.2.7 on 2026-10-18 00:02
+
+from django.db import migrations, models
+from django.db.models import Count, Max, Q
+import django.db.models.deletion
+
+
+def build_counters(apps, schema_editor):
+    Notification = apps.get_model('hrms', 'Notification')
+    NotificationCounter = apps.get_model('hrms', 'NotificationCounter')
+    grouped = Notification.objects.values('employee_id').annotate(
+        unread=Count('id', filter=Q(is_read=False)), last_id=Max('id'),
+    ).order_by()
+    NotificationCounter.objects.bulk_create([
+        NotificationCounter(employee_id=row['employee_id'], unread=row['unread'], last_id=row['last_id'])
+        for row in grouped
+    ], batch_size=1000)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('hrms', '0007_leave_range_indexes'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='NotificationCounter',
+            fields=[
+                ('employee', models.OneToOneField(on_delete=django.db.models.deletion.CASCADE, primary_key=True, serialize=False, to='hrms.employee', to_field='employee_id')),
+                ('unread', models.IntegerField(default=0)),
+                ('last_id', models.BigIntegerField(default=0)),
+            ],
+        ),
+        migrations.RunPython(build_counters, migrations.RunPython.noop),
+    ]
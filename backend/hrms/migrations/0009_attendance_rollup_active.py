@@ -0,0 +1,55 @@
+# Generated by Django 4.2.7 on 2026-10-18 00:12
+
+from django.db import migrations, models
+from django.db.models import BooleanField, Count, ExpressionWrapper, Q, Sum
+
+
+def rebuild_rollup(apps, schema_editor):
+    # Existing rows all defaulted to active; split them by employee status
+    Attendance = apps.get_model('hrms', 'Attendance')
+    AttendanceRollup = apps.get_model('hrms', 'AttendanceRollup')
+    grouped = Attendance.objects.annotate(
+        active=ExpressionWrapper(Q(employee__status='Active'), output_field=BooleanField()),
+    ).values('date', 'employee__department', 'active', 'status').annotate(
+        count=Count('id'), hours=Sum('hours_worked'),
+    ).order_by()
+    AttendanceRollup.objects.all().delete()
+    AttendanceRollup.objects.bulk_create([
+        AttendanceRollup(
+            date=row['date'],
+            department=row['employee__department'],
+            active=row['active'],
+            status=row['status'],
+            count=row['count'],
+            hours_worked=row['hours'] or 0,
+        )
+        for row in grouped
+    ], batch_size=1000)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('hrms', '0008_notification_counter'),
+    ]
+
+    operations = [
+        migrations.AlterModelOptions(
+            name='attendancerollup',
+            options={'ordering': ['-date', 'department', '-active', 'status']},
+        ),
+        migrations.AlterUniqueTogether(
+            name='attendancerollup',
+            unique_together=set(),
+        ),
+        migrations.AddField(
+            model_name='attendancerollup',
+            name='active',
+            field=models.BooleanField(default=True),
+        ),
+        migrations.AlterUniqueTogether(
+            name='attendancerollup',
+            unique_together={('date', 'department', 'active', 'status')},
+        ),
+        migrations.RunPython(rebuild_rollup, migrations.RunPython.noop),
+    ]
@@ -56,6 +56,14 @@ class Employee(models.Model):
 
     class Meta:
         ordering = ['employee_id']
+        indexes = [
+            # List filters (?department=&status=) and the department head-counts
+            models.Index(fields=['department', 'status'], name='hrms_emp_dept_status_idx'),
+            # Active-employee counts grouped by department
+            models.Index(fields=['status', 'department'], name='hrms_emp_status_dept_idx'),
+            # max(updated_at) for conditional GET validators
+            models.Index(fields=['updated_at'], name='hrms_emp_updated_idx'),
+        ]
 
 class Department(models.Model):
     name = models.CharField(max_length=50, unique=True)
@@ -63,6 +71,7 @@ class Department(models.Model):
     manager_id = models.CharField(max_length=50, blank=True, null=True)
     budget = models.DecimalField(max_digits=12, decimal_places=2, blank=True, null=True)
     created_at = models.DateTimeField(auto_now_add=True)
+    updated_at = models.DateTimeField(auto_now=True)
 
     def __str__(self):
         return self.name
@@ -88,15 +97,43 @@ class Attendance(models.Model):
     class Meta:
         unique_together = ['employee', 'date']
         ordering = ['-date', 'employee__employee_id']
+        indexes = [
+            # Dashboard/department aggregates: date range or day, then status
+            models.Index(fields=['date', 'status'], name='hrms_att_date_status_idx'),
+            # List ordering and keyset pagination on (-date, employee)
+            models.Index(fields=['-date', 'employee'], name='hrms_att_date_emp_idx'),
+        ]
 
     def __str__(self):
         return f"{self.employee.employee_id} - {self.date} - {self.status}"
 
+class AttendanceRollup(models.Model):
+    """
+    Attendance counts and hours per (date, department, active, status), kept
+    in step with Attendance by hrms/rollup.py so the stats endpoints read a
+    few rows per day instead of scanning Attendance. `active` is whether the
+    employees are currently Active, for figures over active head-counts.
+    """
+    date = models.DateField()
+    department = models.CharField(max_length=50)
+    active = models.BooleanField(default=True)
+    status = models.CharField(max_length=10, choices=Attendance.STATUS_CHOICES)
+    count = models.IntegerField(default=0)
+    hours_worked = models.DecimalField(max_digits=12, decimal_places=2, default=0)
+
+    class Meta:
+        unique_together = ['date', 'department', 'active', 'status']
+        ordering = ['-date', 'department', '-active', 'status']
+
+    def __str__(self):
+        return f"{self.date} - {self.department} - {self.status}: {self.count}"
+
 class LeaveType(models.Model):
     name = models.CharField(max_length=50, unique=True)
     days_allowed = models.IntegerField()
     description = models.TextField(blank=True, null=True)
     is_paid = models.BooleanField(default=True)
+    updated_at = models.DateTimeField(auto_now=True)
 
     def __str__(self):
         return self.name
@@ -122,9 +159,46 @@ class LeaveRequest(models.Model):
     created_at = models.DateTimeField(auto_now_add=True)
     updated_at = models.DateTimeField(auto_now=True)
 
+    class Meta:
+        indexes = [
+            # List ordering and ?status= filter, newest first; the id column
+            # matches the keyset pagination tie-breaker
+            models.Index(fields=['-created_at', '-id'], name='hrms_leave_created_idx'),
+            models.Index(fields=['status', '-created_at', '-id'], name='hrms_leave_status_created_idx'),
+            # Pending requests are the small, hot subset the dashboard counts
+            models.Index(
+                fields=['created_at'], name='hrms_leave_pending_idx',
+                condition=models.Q(status='Pending'),
+            ),
+            # Overlap checks: one employee's requests starting before a date
+            models.Index(fields=['employee', 'start_date', 'end_date'], name='hrms_leave_emp_range_idx'),
+            # Calendar windows: requests still running on or after a date
+            models.Index(fields=['end_date', 'start_date'], name='hrms_leave_range_idx'),
+        ]
+
     def __str__(self):
         return f"{self.employee.employee_id} - {self.leave_type.name} - {self.start_date}"
 
+class LeaveBalance(models.Model):
+    """
+    Days of leave used (Approved) and pending per (employee, leave_type,
+    year), kept in step with LeaveRequest by hrms/balances.py so remaining
+    days is a single-row read. A request counts towards the year it starts in.
+    """
+    employee = models.ForeignKey(Employee, on_delete=models.CASCADE, to_field='employee_id')
+    leave_type = models.ForeignKey(LeaveType, on_delete=models.CASCADE)
+    year = models.IntegerField()
+    days_used = models.IntegerField(default=0)
+    days_pending = models.IntegerField(default=0)
+    updated_at = models.DateTimeField(auto_now=True)
+
+    class Meta:
+        unique_together = ['employee', 'leave_type', 'year']
+        ordering = ['employee', 'leave_type', 'year']
+
+    def __str__(self):
+        return f"{self.employee_id} - {self.leave_type_id} - {self.year}: {self.days_used} used"
+
 class Performance(models.Model):
     RATING_CHOICES = [
         (1, 'Poor'),
@@ -146,6 +220,11 @@ class Performance(models.Model):
     reviewer_id = models.CharField(max_length=50)
     created_at = models.DateTimeField(auto_now_add=True)
 
+    class Meta:
+        indexes = [
+            models.Index(fields=['-created_at', '-id'], name='hrms_perf_created_idx'),
+        ]
+
     def __str__(self):
         return f"{self.employee.employee_id} - {self.review_period_start} to {self.review_period_end}"
 
@@ -169,6 +248,13 @@ class Payroll(models.Model):
 
     class Meta:
         unique_together = ['employee', 'pay_period_start', 'pay_period_end']
+        indexes = [
+            # Month payroll total: status plus a pay period lower bound
+            models.Index(fields=['status', 'pay_period_start'], name='hrms_pay_status_period_idx'),
+            # List ordering, with and without ?status=
+            models.Index(fields=['-created_at', '-id'], name='hrms_pay_created_idx'),
+            models.Index(fields=['status', '-created_at', '-id'], name='hrms_pay_status_created_idx'),
+        ]
 
     def save(self, *args, **kwargs):
         # Calculate net salary
@@ -198,6 +284,27 @@ class Notification(models.Model):
 
     class Meta:
         ordering = ['-created_at']
+        indexes = [
+            # Per-employee feed, all or unread only, newest first
+            models.Index(fields=['employee', '-created_at', '-id'], name='hrms_notif_emp_created_idx'),
+            models.Index(fields=['employee', 'is_read', '-created_at', '-id'], name='hrms_notif_emp_read_idx'),
+            models.Index(fields=['-created_at', '-id'], name='hrms_notif_created_idx'),
+        ]
+
+    def __str__(self):
+        return f"{self.employee.employee_id} - {self.title}"
+
+
+class NotificationCounter(models.Model):
+    """
+    Unread notification count and newest notification id per employee, kept
+    in step with Notification by hrms/notifications.py so badge counts and
+    long-poll checks are a primary-key read. last_id is a high-water mark:
+    deleting the newest notification doesn't lower it.
+    """
+    employee = models.OneToOneField(Employee, on_delete=models.CASCADE, to_field='employee_id', primary_key=True)
+    unread = models.IntegerField(default=0)
+    last_id = models.BigIntegerField(default=0)
 
     def __str__(self):
-        return f"{self.employee.employee_id} - {self.title}"
\ No newline at end of file
+        return f"{self.employee_id}: {self.unread} unread"
@@ -0,0 +1,163 @@
+"""
+Unread notification counters and long-poll wakeups.
+
+NotificationCounter holds each employee's unread count and newest
+notification id. Single-row changes are applied from the Notification
+signals in hrms/signals.py; bulk inserts call notifications_bulk_created(),
+and marking read goes through mark_read(), which adjusts the count by the
+number of rows its UPDATE changed.
+
+Long-poll requests wait on an asyncio event that is set when a
+notification for their employee commits in this process. Notifications
+created by other processes are picked up by the poll's periodic re-check
+of the counter row.
+"""
+import asyncio
+import threading
+from collections import defaultdict
+
+from django.db import IntegrityError, transaction
+from django.db.models import Count, F, Max, Q
+from django.db.models.functions import Greatest
+
+from .models import Employee, Notification, NotificationCounter
+
+REBUILD_BATCH_SIZE = 1000
+
+# Ids per mark-read request. The IN list stays under 999 bound parameters,
+# the limit in SQLite builds before 3.32, with room for the other parameters
+MAX_MARK_READ_IDS = 500
+
+# Long-poll wait in seconds: the default, and the most a client may ask for
+# (kept under the usual 30-60s proxy idle timeouts)
+DEFAULT_POLL_TIMEOUT = 25
+MAX_POLL_TIMEOUT = 30
+
+# How often a waiting poll re-reads the counter, to see notifications
+# committed by other processes
+POLL_INTERVAL = 2
+
+# Most notifications returned by one poll
+POLL_BATCH_SIZE = 100
+
+
+def bump(employee_id, unread=0, last_id=None):
+    """Add `unread` to an employee's count and raise its last_id to `last_id`."""
+    counter = NotificationCounter.objects.filter(employee_id=employee_id)
+    changes = {'unread': F('unread') + unread}
+    if last_id is not None:
+        changes['last_id'] = Greatest(F('last_id'), last_id)
+    if counter.update(**changes):
+        return
+    if unread <= 0 and last_id is None:
+        # Nothing recorded and nothing to add; also the case while the
+        # employee is being deleted
+        return
+    try:
+        with transaction.atomic():
+            NotificationCounter.objects.create(employee_id=employee_id, unread=max(unread, 0), last_id=last_id or 0)
+    except IntegrityError:
+        # Created concurrently since the update above
+        counter.update(**changes)
+
+
+def rebuild_counters(employee_ids=None):
+    """
+    Recompute the counters from Notification with one grouped query, for
+    every employee or the given ones. Returns the number of rows written.
+    """
+    notifications = Notification.objects.all()
+    counters = NotificationCounter.objects.all()
+    if employee_ids is not None:
+        notifications = notifications.filter(employee_id__in=employee_ids)
+        counters = counters.filter(employee_id__in=employee_ids)
+
+    grouped = notifications.values('employee_id').annotate(
+        unread=Count('id', filter=Q(is_read=False)), last_id=Max('id'),
+    ).order_by()
+    with transaction.atomic():
+        rows = [
+            NotificationCounter(employee_id=row['employee_id'], unread=row['unread'], last_id=row['last_id'])
+            for row in grouped
+        ]
+        counters.delete()
+        NotificationCounter.objects.bulk_create(rows, batch_size=REBUILD_BATCH_SIZE)
+    return len(rows)
+
+
+def mark_read(employee_id, ids=None, up_to_id=None):
+    """
+    Mark an employee's unread notifications read: all of them, those in
+    `ids`, and/or those with id <= `up_to_id`. Returns how many changed.
+    """
+    notifications = Notification.objects.filter(employee_id=employee_id, is_read=False)
+    if ids is not None:
+        notifications = notifications.filter(id__in=ids)
+    if up_to_id is not None:
+        notifications = notifications.filter(id__lte=up_to_id)
+    with transaction.atomic():
+        # Only rows this UPDATE flips are subtracted, so concurrent calls
+        # can't take the same notification off the count twice
+        marked = notifications.update(is_read=True)
+        if marked:
+            bump(employee_id, unread=-marked)
+    return marked
+
+
+def counter_state(employee_id):
+    """(unread, last_id) for an employee, or None if there is no such employee."""
+    row = Employee.objects.filter(employee_id=employee_id).values_list(
+        'notificationcounter__unread', 'notificationcounter__last_id',
+    ).first()
+    if row is None:
+        return None
+    unread, last_id = row
+    return unread or 0, last_id or 0
+
+
+class NotificationWaiters:
+    """Long-poll waiters per employee; notify() may be called from any thread."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._waiters = defaultdict(set)
+
+    def add(self, employee_id):
+        waiter = (asyncio.get_running_loop(), asyncio.Event())
+        with self._lock:
+            self._waiters[employee_id].add(waiter)
+        return waiter
+
+    def discard(self, employee_id, waiter):
+        with self._lock:
+            waiters = self._waiters.get(employee_id)
+            if waiters is not None:
+                waiters.discard(waiter)
+                if not waiters:
+                    del self._waiters[employee_id]
+
+    def notify(self, employee_ids):
+        with self._lock:
+            waiters = [waiter for employee_id in employee_ids for waiter in self._waiters.get(employee_id, ())]
+        for loop, event in waiters:
+            try:
+                loop.call_soon_threadsafe(event.set)
+            except RuntimeError:
+                # The waiter's loop has already closed
+                pass
+
+
+waiters = NotificationWaiters()
+
+
+def notification_created(notification):
+    bump(notification.employee_id, unread=0 if notification.is_read else 1, last_id=notification.pk)
+    employee_id = notification.employee_id
+    transaction.on_commit(lambda: waiters.notify([employee_id]))
+
+
+def notifications_bulk_created(employee_ids):
+    """For callers that bulk_create notifications, which skips the signals."""
+    employee_ids = set(employee_ids)
+    rebuild_counters(employee_ids)
+    transaction.on_commit(lambda: waiters.notify(employee_ids))
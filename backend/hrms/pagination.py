@@ -0,0 +1,228 @@
+import base64
+import json
+from collections import OrderedDict
+from decimal import Decimal
+
+from django.db.models import F, Q
+from django.db.models.constants import LOOKUP_SEP
+from rest_framework.exceptions import NotFound
+from rest_framework.pagination import BasePagination
+from rest_framework.response import Response
+from rest_framework.utils.urls import replace_query_param
+
+
+class KeysetPagination(BasePagination):
+    """
+    Cursor pagination over the full ordering of a queryset.
+
+    Each cursor stores the ordering values of the row at the edge of the page,
+    so the next page is fetched with a WHERE clause on those values instead of
+    an OFFSET. A primary key tie-breaker is appended when the ordering is not
+    already unique.
+    """
+    cursor_query_param = 'cursor'
+    page_size = 100
+    page_size_query_param = 'page_size'
+    max_page_size = 1000
+    invalid_cursor_message = 'Invalid cursor'
+
+    def paginate_queryset(self, queryset, request, view=None):
+        self.request = request
+        self.page_size = self.get_page_size(request)
+        self.ordering = self.get_ordering(request, queryset, view)
+        self.fields = [self._resolve_field(queryset.model, name) for name, _ in self.ordering]
+
+        position, reverse = self.decode_cursor(request)
+
+        if position is not None:
+            queryset = queryset.filter(self._position_filter(position, reverse))
+        queryset = queryset.order_by(*self._order_by(reverse))
+
+        results = list(queryset[:self.page_size + 1])
+        has_more = len(results) > self.page_size
+        results = results[:self.page_size]
+        if reverse:
+            results.reverse()
+
+        # Moving backwards from a cursor always leaves a page after it, and
+        # moving forwards from a cursor always leaves a page before it.
+        self.has_next = has_more if not reverse else True
+        self.has_previous = position is not None if not reverse else has_more
+        self.page = results
+        return results
+
+    def get_paginated_response(self, data):
+        return Response(OrderedDict([
+            ('next', self.get_next_link()),
+            ('previous', self.get_previous_link()),
+            ('results', data),
+        ]))
+
+    def get_paginated_response_schema(self, schema):
+        return {
+            'type': 'object',
+            'properties': {
+                'next': {'type': 'string', 'nullable': True},
+                'previous': {'type': 'string', 'nullable': True},
+                'results': schema,
+            },
+        }
+
+    def get_page_size(self, request):
+        if self.page_size_query_param:
+            try:
+                size = int(request.query_params[self.page_size_query_param])
+                if size > 0:
+                    return min(size, self.max_page_size)
+            except (KeyError, ValueError):
+                pass
+        return self.page_size
+
+    def get_ordering(self, request, queryset, view):
+        """
+        Return the ordering as a list of (field name, descending) pairs.
+
+        Uses the view's OrderingFilter when it has one, then the view's
+        `ordering` attribute, then the ordering already on the queryset.
+        """
+        ordering = None
+        for backend in getattr(view, 'filter_backends', None) or []:
+            if hasattr(backend, 'get_ordering'):
+                ordering = backend().get_ordering(request, queryset, view)
+                break
+        if not ordering:
+            ordering = getattr(view, 'ordering', None)
+        if not ordering:
+            ordering = queryset.query.order_by or queryset.model._meta.ordering
+        if isinstance(ordering, str):
+            ordering = [ordering]
+
+        pairs = []
+        for name in ordering:
+            descending = name.startswith('-')
+            name = name.lstrip('-')
+            if name == 'pk':
+                name = queryset.model._meta.pk.name
+            pairs.append((name, descending))
+
+        if not self._is_unique(queryset.model, [name for name, _ in pairs]):
+            descending = pairs[-1][1] if pairs else False
+            pairs.append((queryset.model._meta.pk.name, descending))
+        return pairs
+
+    def get_next_link(self):
+        if not self.has_next or not self.page:
+            return None
+        return self.encode_cursor(self._position(self.page[-1]), reverse=False)
+
+    def get_previous_link(self):
+        if not self.has_previous or not self.page:
+            return None
+        return self.encode_cursor(self._position(self.page[0]), reverse=True)
+
+    def encode_cursor(self, position, reverse):
+        payload = {'p': [self._dump(value) for value in position]}
+        if reverse:
+            payload['r'] = 1
+        token = base64.urlsafe_b64encode(json.dumps(payload, separators=(',', ':')).encode('ascii'))
+        url = self.request.build_absolute_uri()
+        return replace_query_param(url, self.cursor_query_param, token.decode('ascii').rstrip('='))
+
+    def decode_cursor(self, request):
+        token = request.query_params.get(self.cursor_query_param)
+        if not token:
+            return None, False
+        try:
+            token += '=' * (-len(token) % 4)
+            payload = json.loads(base64.urlsafe_b64decode(token.encode('ascii')))
+            values = payload['p']
+            if len(values) != len(self.fields):
+                raise ValueError
+            position = [
+                None if value is None else field.to_python(value)
+                for field, value in zip(self.fields, values)
+            ]
+        except Exception:
+            raise NotFound(self.invalid_cursor_message)
+        return position, bool(payload.get('r'))
+
+    def _position(self, instance):
+        if isinstance(instance, dict):
+            # A row from .values(), keyed by lookup path
+            return [instance[name] for name, _ in self.ordering]
+        position = []
+        for name, _ in self.ordering:
+            value = instance
+            for part in name.split(LOOKUP_SEP):
+                value = getattr(value, part, None) if value is not None else None
+            position.append(value)
+        return position
+
+    def _order_by(self, reverse):
+        order_by = []
+        for (name, descending), field in zip(self.ordering, self.fields):
+            descending = descending != reverse
+            expression = F(name).desc if descending else F(name).asc
+            # NULLs sort after every value in the forward direction on all
+            # backends, so the cursor filter below can rely on it.
+            if field.null and reverse:
+                order_by.append(expression(nulls_first=True))
+            elif field.null:
+                order_by.append(expression(nulls_last=True))
+            else:
+                order_by.append(expression())
+        return order_by
+
+    def _position_filter(self, position, reverse):
+        """
+        Build the lexicographic `(a, b, c) > (x, y, z)` filter for a cursor,
+        or `<` when paging backwards.
+        """
+        condition = Q()
+        equal = Q()
+        for (name, descending), field, value in zip(self.ordering, self.fields, position):
+            if value is None:
+                # NULLs come last, so nothing follows them on this column and
+                # every non-NULL value precedes them.
+                if reverse:
+                    condition |= equal & Q(**{f'{name}__isnull': False})
+                equal &= Q(**{f'{name}__isnull': True})
+                continue
+
+            lookup = 'lt' if descending != reverse else 'gt'
+            step = Q(**{f'{name}__{lookup}': value})
+            if field.null and not reverse:
+                step |= Q(**{f'{name}__isnull': True})
+            condition |= equal & step
+            equal &= Q(**{name: value})
+        return condition
+
+    def _resolve_field(self, model, name):
+        parts = name.split(LOOKUP_SEP)
+        for part in parts[:-1]:
+            model = model._meta.get_field(part).related_model
+        return model._meta.get_field(parts[-1])
+
+    def _is_unique(self, model, names):
+        local = set()
+        for name in names:
+            parts = name.split(LOOKUP_SEP)
+            field = model._meta.get_field(parts[0])
+            # `employee__employee_id` is the same column as `employee` when
+            # the foreign key points at that field.
+            if len(parts) == 2 and field.is_relation and field.target_field.name == parts[1]:
+                local.add(field.name)
+            elif len(parts) == 1:
+                if field.primary_key or (field.unique and not field.null):
+                    return True
+                local.add(field.name)
+        return any(set(fields) <= local for fields in model._meta.unique_together)
+
+    def _dump(self, value):
+        if value is None:
+            return None
+        if isinstance(value, Decimal):
+            return str(value)
+        if hasattr(value, 'isoformat'):
+            return value.isoformat()
+        return value
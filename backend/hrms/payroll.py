@@ -0,0 +1,143 @@
+"""
+Batched payroll runs.
+
+A run builds Draft payroll for every Active employee in a pay period from a
+few aggregate queries (salaries, overtime from attendance, existing rows for
+the period) and writes it with one bulk upsert. Re-running a period refreshes
+its Draft rows and leaves Processed/Paid rows alone.
+
+Overtime is capped twice so bad hours_worked data cannot overflow
+Payroll.overtime_hours: each day counts at most the hours left in it after a
+standard day, and a period at most what the column holds. Employees whose
+period total was capped are listed in the run summary.
+"""
+from datetime import timedelta
+from decimal import Decimal, ROUND_HALF_UP
+
+from django.db import transaction
+from django.db.models import DecimalField, F, Sum, Value
+from django.db.models.functions import Greatest, Least
+
+from .models import Employee, Attendance, Payroll
+
+STANDARD_DAY_HOURS = Decimal('8.00')
+MAX_DAILY_OVERTIME = Decimal('24.00') - STANDARD_DAY_HOURS
+OVERTIME_MULTIPLIER = Decimal('1.5')
+# 52 weeks of 40 hours, used to turn an annual salary into an hourly rate
+WORKING_HOURS_PER_YEAR = Decimal('2080')
+
+CENT = Decimal('0.01')
+
+_overtime_hours = Payroll._meta.get_field('overtime_hours')
+# 999.99 for max_digits=5, decimal_places=2
+MAX_OVERTIME_HOURS = Decimal(10) ** (_overtime_hours.max_digits - _overtime_hours.decimal_places) - CENT
+
+
+def _cents(value):
+    return value.quantize(CENT, rounding=ROUND_HALF_UP)
+
+
+def period_fraction(period_start, period_end):
+    """
+    Share of an annual salary paid for the period: whole calendar months are
+    paid as twelfths, anything else pro rata by day.
+    """
+    month_start = period_start.day == 1
+    month_end = (period_end + timedelta(days=1)).day == 1
+    if month_start and month_end:
+        months = (period_end.year - period_start.year) * 12 + period_end.month - period_start.month + 1
+        return Decimal(months) / 12
+    return Decimal((period_end - period_start).days + 1) / 365
+
+
+def overtime_by_employee(period_start, period_end, department=None):
+    # Overtime is the part of each day's hours beyond a standard day, up to
+    # the rest of the day
+    output_field = DecimalField(max_digits=6, decimal_places=2)
+    daily_overtime = Least(
+        Greatest(F('hours_worked') - Value(STANDARD_DAY_HOURS), Value(Decimal('0')), output_field=output_field),
+        Value(MAX_DAILY_OVERTIME),
+        output_field=output_field,
+    )
+    queryset = Attendance.objects.filter(
+        date__gte=period_start, date__lte=period_end, hours_worked__isnull=False
+    )
+    if department:
+        queryset = queryset.filter(employee__department=department)
+    rows = queryset.values('employee_id').annotate(overtime=Sum(daily_overtime)).order_by()
+    return {row['employee_id']: Decimal(row['overtime'] or 0) for row in rows}
+
+
+def run_payroll(period_start, period_end, department=None,
+                overtime_multiplier=OVERTIME_MULTIPLIER, tax_rate=Decimal('0')):
+    fraction = period_fraction(period_start, period_end)
+
+    employees = Employee.objects.filter(status='Active', salary__isnull=False)
+    if department:
+        employees = employees.filter(department=department)
+    salaries = dict(employees.values_list('employee_id', 'salary'))
+    overtime = overtime_by_employee(period_start, period_end, department=department)
+
+    with transaction.atomic():
+        # Filtered on the period only; there is at most one row per employee
+        # and an IN list of every employee id would hit parameter limits
+        existing = {
+            employee_id: (status, bonuses, deductions)
+            for employee_id, status, bonuses, deductions in Payroll.objects.select_for_update().filter(
+                pay_period_start=period_start,
+                pay_period_end=period_end,
+            ).values_list('employee_id', 'status', 'bonuses', 'deductions')
+        }
+
+        rows = []
+        overtime_capped = []
+        total_net = Decimal('0.00')
+        for employee_id, salary in salaries.items():
+            # Bonuses and deductions entered on a Draft survive a re-run
+            status, bonuses, deductions = existing.get(employee_id, ('Draft', Decimal('0'), Decimal('0')))
+            if status != 'Draft':
+                continue
+            basic = _cents(salary * fraction)
+            overtime_hours = _cents(overtime.get(employee_id, Decimal('0')))
+            if overtime_hours > MAX_OVERTIME_HOURS:
+                overtime_capped.append(employee_id)
+                overtime_hours = MAX_OVERTIME_HOURS
+            overtime_rate = _cents(salary / WORKING_HOURS_PER_YEAR * overtime_multiplier)
+            gross = basic + overtime_hours * overtime_rate
+            tax = _cents(gross * tax_rate)
+            # Same formula as Payroll.save(), which bulk_create does not call
+            net = _cents(gross + bonuses - deductions - tax)
+            total_net += net
+            rows.append(Payroll(
+                employee_id=employee_id,
+                pay_period_start=period_start,
+                pay_period_end=period_end,
+                basic_salary=basic,
+                overtime_hours=overtime_hours,
+                overtime_rate=overtime_rate,
+                bonuses=bonuses,
+                deductions=deductions,
+                tax_deduction=tax,
+                net_salary=net,
+                status='Draft',
+            ))
+
+        Payroll.objects.bulk_create(
+            rows,
+            batch_size=1000,
+            update_conflicts=True,
+            unique_fields=['employee', 'pay_period_start', 'pay_period_end'],
+            update_fields=['basic_salary', 'overtime_hours', 'overtime_rate', 'tax_deduction', 'net_salary'],
+        )
+
+    updated = sum(1 for row in rows if row.employee_id in existing)
+    return {
+        'pay_period_start': period_start,
+        'pay_period_end': period_end,
+        'employees': len(salaries),
+        'created': len(rows) - updated,
+        'updated': updated,
+        'skipped': len(salaries) - len(rows),
+        'total_net_salary': total_net,
+        'overtime_capped': overtime_capped,
+    }
@@ -0,0 +1,51 @@
+"""
+JSON renderer that uses orjson when it is installed.
+
+The output matches rest_framework's JSONRenderer byte for byte for the
+compact, UTF-8 form the API serves: dates and times go through DRF's own
+encoder, and \\u2028/\\u2029 are escaped the same way. Anything orjson can't
+encode identically (indented output, ASCII-only output, integers over 64
+bits, non-string keys) is handed to the stdlib renderer.
+
+settings.HRMS_JSON_BACKEND picks the backend: 'auto' (orjson if importable),
+'orjson' or 'stdlib'.
+"""
+from django.conf import settings
+from django.core.exceptions import ImproperlyConfigured
+from rest_framework.renderers import JSONRenderer
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+LINE_SEPARATOR = '\u2028'.encode()
+PARAGRAPH_SEPARATOR = '\u2029'.encode()
+
+
+def use_orjson():
+    backend = getattr(settings, 'HRMS_JSON_BACKEND', 'auto')
+    if backend == 'stdlib':
+        return False
+    if backend == 'orjson' and orjson is None:
+        raise ImproperlyConfigured("HRMS_JSON_BACKEND is 'orjson' but orjson is not installed")
+    return orjson is not None
+
+
+class FastJSONRenderer(JSONRenderer):
+
+    def render(self, data, accepted_media_type=None, renderer_context=None):
+        if data is None or not use_orjson():
+            return super().render(data, accepted_media_type, renderer_context)
+        # orjson only writes the compact, non-ASCII-escaped form
+        if not self.compact or self.ensure_ascii or self.get_indent(accepted_media_type, renderer_context or {}):
+            return super().render(data, accepted_media_type, renderer_context)
+
+        encoder = self.encoder_class()
+        try:
+            # Dates and times are passed to DRF's encoder, which formats them
+            # differently from orjson (millisecond precision, 'Z' for UTC)
+            ret = orjson.dumps(data, default=encoder.default, option=orjson.OPT_PASSTHROUGH_DATETIME)
+        except (TypeError, orjson.JSONEncodeError):
+            return super().render(data, accepted_media_type, renderer_context)
+        return ret.replace(LINE_SEPARATOR, b'\\u2028').replace(PARAGRAPH_SEPARATOR, b'\\u2029')
@@ -0,0 +1,183 @@
+"""
+Materialized daily attendance rollup.
+
+AttendanceRollup holds one row per (date, department, active, status) with
+the number of attendance records and their summed hours. Single-row changes
+are applied incrementally from the Attendance/Employee signals in
+hrms/signals.py; bulk writes, which skip signals, call rebuild_rollup() for
+the dates they touched. The rollup always reflects each
+employee's current department and status.
+
+Incremental changes are upserts that add to the bucket's counters
+(INSERT ... ON CONFLICT DO UPDATE, SQLite 3.24+), so a record change is one
+statement and re-filing or removing an employee's whole history is one
+INSERT ... SELECT per direction, however many days it covers. Callers that
+also write Attendance or Employee rows should run both in one transaction.
+"""
+from decimal import Decimal
+
+from django.db import connection, transaction
+from django.db.models import BooleanField, Count, ExpressionWrapper, Q, Sum
+
+from .models import Attendance, AttendanceRollup
+
+# Dates per `date__in` list, kept under the 999 bound parameters older
+# SQLite builds allow per statement
+REBUILD_BATCH_SIZE = 900
+
+# Whether an attendance record's employee is Active, for grouped queries
+EMPLOYEE_ACTIVE = ExpressionWrapper(Q(employee__status='Active'), output_field=BooleanField())
+
+_ROLLUP_FIELDS = ['date', 'department', 'active', 'status', 'count', 'hours_worked']
+# Rows per upsert statement, six parameters each
+_UPSERT_BATCH_SIZE = 999 // len(_ROLLUP_FIELDS)
+
+
+def _upsert_sql(source):
+    qn = connection.ops.quote_name
+    table = qn(AttendanceRollup._meta.db_table)
+    keys = ', '.join(qn(name) for name in _ROLLUP_FIELDS[:4])
+    return (
+        f"INSERT INTO {table} ({', '.join(qn(name) for name in _ROLLUP_FIELDS)}) {source} "
+        f"ON CONFLICT ({keys}) DO UPDATE SET "
+        f"{qn('count')} = {table}.{qn('count')} + excluded.{qn('count')}, "
+        f"{qn('hours_worked')} = {table}.{qn('hours_worked')} + excluded.{qn('hours_worked')}"
+    )
+
+
+def _db_values(row):
+    return [
+        field.get_db_prep_value(value, connection)
+        for field, value in zip(map(AttendanceRollup._meta.get_field, _ROLLUP_FIELDS), row)
+    ]
+
+
+def bump_many(deltas):
+    """
+    Add counts and hours to rollup buckets. `deltas` maps (date, department,
+    active, status) to (count, hours); buckets that do not exist yet are
+    created.
+    """
+    rows = [(*key, count, hours) for key, (count, hours) in deltas.items() if count or hours]
+    with connection.cursor() as cursor:
+        for start in range(0, len(rows), _UPSERT_BATCH_SIZE):
+            batch = rows[start:start + _UPSERT_BATCH_SIZE]
+            placeholders = ', '.join(['(%s)' % ', '.join(['%s'] * len(_ROLLUP_FIELDS))] * len(batch))
+            cursor.execute(
+                _upsert_sql(f'VALUES {placeholders}'),
+                [value for row in batch for value in _db_values(row)],
+            )
+
+
+def bump(day, department, active, status, count, hours):
+    """Add `count` records and `hours` hours to one rollup bucket."""
+    bump_many({(day, department, active, status): (count, hours or Decimal('0'))})
+
+
+def attendance_key(attendance, employee=None):
+    """The (date, department, active, status, hours_worked) an attendance record counts towards."""
+    employee = employee or attendance.employee
+    return (
+        attendance.date, employee.department, employee.status == 'Active', attendance.status,
+        attendance.hours_worked,
+    )
+
+
+def apply_change(old, new):
+    """
+    Move one attendance record between buckets with one statement. `old` and
+    `new` are attendance_key() tuples, or None for a create or delete.
+    """
+    deltas = {}
+    for key, sign in ((old, -1), (new, 1)):
+        if key:
+            *bucket, hours = key
+            count, total = deltas.get(tuple(bucket), (0, Decimal('0')))
+            # hours_worked is whatever was assigned until the row is re-read,
+            # e.g. a string from Attendance.objects.create()
+            deltas[tuple(bucket)] = (count + sign, total + sign * Decimal(hours or 0))
+    bump_many(deltas)
+
+
+def _add_employee(employee_id, bucket, sign):
+    # Every (date, status) group of the employee's attendance, added to or
+    # taken from the buckets of `bucket`'s department and active flag
+    qn = connection.ops.quote_name
+    department, active = bucket
+    source = (
+        f"SELECT {qn('date')}, %s, %s, {qn('status')}, %s * COUNT(*), %s * COALESCE(SUM({qn('hours_worked')}), 0) "
+        f"FROM {qn(Attendance._meta.db_table)} WHERE {qn(Attendance._meta.get_field('employee').column)} = %s "
+        f"GROUP BY {qn('date')}, {qn('status')}"
+    )
+    with connection.cursor() as cursor:
+        cursor.execute(_upsert_sql(source), [
+            department, AttendanceRollup._meta.get_field('active').get_db_prep_value(active, connection),
+            sign, sign, employee_id,
+        ])
+
+
+def move_employee(employee_id, old, new):
+    """
+    Re-file an employee's attendance after their department or status
+    changed, with two statements. `old` and `new` are (department, active)
+    pairs.
+    """
+    with transaction.atomic(savepoint=False):
+        _add_employee(employee_id, old, -1)
+        _add_employee(employee_id, new, 1)
+
+
+def remove_employee(employee_id, bucket):
+    """
+    Take all of an employee's attendance out of the rollup with one
+    statement, before the employee and their attendance are deleted.
+    `bucket` is their (department, active) pair.
+    """
+    _add_employee(employee_id, bucket, -1)
+
+
+def rebuild_rollup(start=None, end=None, dates=None):
+    """
+    Recompute the rollup from Attendance with one grouped query, for every
+    date, a date range, or an explicit collection of dates. Returns the number
+    of rollup rows written.
+    """
+    attendance = Attendance.objects.all()
+    rollup = AttendanceRollup.objects.all()
+    if dates is not None:
+        dates = sorted(set(dates))
+        if not dates:
+            return 0
+        if len(dates) <= REBUILD_BATCH_SIZE:
+            attendance = attendance.filter(date__in=dates)
+            rollup = rollup.filter(date__in=dates)
+        else:
+            # Too many for an IN list; rebuild the whole span instead
+            start, end = dates[0], dates[-1]
+    if start:
+        attendance = attendance.filter(date__gte=start)
+        rollup = rollup.filter(date__gte=start)
+    if end:
+        attendance = attendance.filter(date__lte=end)
+        rollup = rollup.filter(date__lte=end)
+
+    grouped = attendance.annotate(active=EMPLOYEE_ACTIVE).values(
+        'date', 'employee__department', 'active', 'status',
+    ).annotate(
+        count=Count('id'), hours=Sum('hours_worked'),
+    ).order_by()
+    with transaction.atomic():
+        rows = [
+            AttendanceRollup(
+                date=row['date'],
+                department=row['employee__department'],
+                active=row['active'],
+                status=row['status'],
+                count=row['count'],
+                hours_worked=row['hours'] or Decimal('0'),
+            )
+            for row in grouped
+        ]
+        rollup.delete()
+        AttendanceRollup.objects.bulk_create(rows, batch_size=_UPSERT_BATCH_SIZE)
+    return len(rows)
@@ -0,0 +1,324 @@
+"""
+Full-text employee search.
+
+On SQLite, an FTS5 table with the trigram tokenizer indexes employee_id,
+full_name, email and department. It is an external-content table over
+hrms_employee, kept in sync by triggers, so bulk inserts and queryset
+updates are indexed too, not only save(). The table and triggers are
+(re)installed after every migrate, because SQLite rebuilds a table when a
+migration alters it and that drops its triggers.
+
+Trigram matching finds any substring of three or more characters, which
+covers prefixes. For typos, each query term is compared with the name and
+department words kept by the suggest index (hrms/suggest.py). Words within a
+small edit distance, where swapping two adjacent letters counts as one edit,
+are searched for as alternatives to the term, and the candidates are scored
+by that distance. Other database backends, and SQLite builds without FTS5
+or older than 3.34, fall back to icontains lookups with the same scoring.
+"""
+from collections import defaultdict
+
+from django.db import connections
+from django.db.models import Q
+from django.db.models.expressions import RawSQL
+
+from .models import Employee
+from .suggest import suggest_index
+
+FTS_TABLE = 'hrms_employee_fts'
+SEARCH_COLUMNS = ['employee_id', 'full_name', 'email', 'department']
+MIN_TRIGRAM_TERM = 3
+CANDIDATE_LIMIT = 200
+
+# Edits a term may be away from a word and still match it: terms of at least
+# this many characters, and the edits allowed. Shorter terms must match as is.
+FUZZY_DISTANCES = ((5, 2), (3, 1))
+
+# Alternatives searched per misspelt term, closest first
+MAX_CORRECTIONS = 20
+
+_COLUMNS = ', '.join(SEARCH_COLUMNS)
+_NEW = ', '.join(f'new.{column}' for column in SEARCH_COLUMNS)
+_OLD = ', '.join(f'old.{column}' for column in SEARCH_COLUMNS)
+
+INSTALL_SQL = [
+    f"CREATE VIRTUAL TABLE IF NOT EXISTS {FTS_TABLE} USING fts5("
+    f"{_COLUMNS}, content='hrms_employee', content_rowid='id', tokenize='trigram')",
+    f"CREATE TRIGGER IF NOT EXISTS {FTS_TABLE}_ai AFTER INSERT ON hrms_employee BEGIN "
+    f"INSERT INTO {FTS_TABLE}(rowid, {_COLUMNS}) VALUES (new.id, {_NEW}); END",
+    f"CREATE TRIGGER IF NOT EXISTS {FTS_TABLE}_ad AFTER DELETE ON hrms_employee BEGIN "
+    f"INSERT INTO {FTS_TABLE}({FTS_TABLE}, rowid, {_COLUMNS}) VALUES ('delete', old.id, {_OLD}); END",
+    f"CREATE TRIGGER IF NOT EXISTS {FTS_TABLE}_au AFTER UPDATE OF {_COLUMNS} ON hrms_employee BEGIN "
+    f"INSERT INTO {FTS_TABLE}({FTS_TABLE}, rowid, {_COLUMNS}) VALUES ('delete', old.id, {_OLD}); "
+    f"INSERT INTO {FTS_TABLE}(rowid, {_COLUMNS}) VALUES (new.id, {_NEW}); END",
+]
+TRIGGERS = [f'{FTS_TABLE}_ai', f'{FTS_TABLE}_ad', f'{FTS_TABLE}_au']
+
+
+# The trigram tokenizer arrived in SQLite 3.34
+TRIGRAM_MIN_SQLITE = (3, 34)
+
+_fts_support = {}
+
+
+def fts_available(using='default'):
+    """
+    Whether the database can hold the index: SQLite 3.34 or later, built
+    with FTS5. Checked once per connection alias. Without it the index is
+    not installed and search uses the icontains fallback.
+    """
+    if using not in _fts_support:
+        connection = connections[using]
+        supported = connection.vendor == 'sqlite' and connection.Database.sqlite_version_info >= TRIGRAM_MIN_SQLITE
+        if supported:
+            with connection.cursor() as cursor:
+                cursor.execute("SELECT sqlite_compileoption_used('ENABLE_FTS5')")
+                supported = bool(cursor.fetchone()[0])
+        _fts_support[using] = supported
+    return _fts_support[using]
+
+
+def install_search_index(using='default', rebuild=False):
+    """
+    Create the FTS table and triggers if missing. The index is rebuilt from
+    hrms_employee when anything had to be created, or when asked to.
+    Returns True if the index was rebuilt.
+    """
+    if not fts_available(using):
+        return False
+    with connections[using].cursor() as cursor:
+        cursor.execute(
+            "SELECT name FROM sqlite_master WHERE name IN (%s)" % ', '.join(['%s'] * (len(TRIGGERS) + 1)),
+            [FTS_TABLE] + TRIGGERS,
+        )
+        missing = len(TRIGGERS) + 1 - len(cursor.fetchall())
+        for statement in INSTALL_SQL:
+            cursor.execute(statement)
+        if missing or rebuild:
+            cursor.execute(f"INSERT INTO {FTS_TABLE}({FTS_TABLE}) VALUES ('rebuild')")
+            return True
+    return False
+
+
+def _phrase(text):
+    return '"' + text.replace('"', '""') + '"'
+
+
+def _fts_ids(match, limit=None):
+    if limit is None:
+        return RawSQL(f'SELECT rowid FROM {FTS_TABLE} WHERE {FTS_TABLE} MATCH %s', [match])
+    # Best bm25 matches first; for an OR of trigrams that favours rows
+    # sharing the most of them
+    return RawSQL(
+        f'SELECT rowid FROM {FTS_TABLE} WHERE {FTS_TABLE} MATCH %s ORDER BY rank LIMIT %s', [match, limit]
+    )
+
+
+def _icontains(term):
+    condition = Q()
+    for column in SEARCH_COLUMNS:
+        condition |= Q(**{f'{column}__icontains': term})
+    return condition
+
+
+def filter_employees_by_terms(queryset, terms):
+    """
+    The ?search= filter: every term must appear in one of the search columns.
+    Terms of three or more characters are looked up in the FTS index.
+    """
+    use_fts = fts_available(queryset.db)
+    long_terms = [term for term in terms if len(term) >= MIN_TRIGRAM_TERM]
+    if use_fts and long_terms:
+        queryset = queryset.filter(id__in=_fts_ids(' AND '.join(_phrase(term) for term in long_terms)))
+    for term in terms:
+        if not use_fts or len(term) < MIN_TRIGRAM_TERM:
+            queryset = queryset.filter(_icontains(term))
+    return queryset
+
+
+def _max_distance(term):
+    for length, distance in FUZZY_DISTANCES:
+        if len(term) >= length:
+            return distance
+    return 0
+
+
+def edit_distance(a, b, limit):
+    """
+    Optimal string alignment distance between `a` and `b`: insertions,
+    deletions, substitutions and adjacent transpositions each cost one.
+    Stops early and returns limit + 1 once the distance is past `limit`.
+    """
+    if abs(len(a) - len(b)) > limit:
+        return limit + 1
+    before = None
+    previous = list(range(len(b) + 1))
+    for i in range(1, len(a) + 1):
+        current = [i] + [0] * len(b)
+        for j in range(1, len(b) + 1):
+            value = min(previous[j] + 1, current[j - 1] + 1, previous[j - 1] + (a[i - 1] != b[j - 1]))
+            if i > 1 and j > 1 and a[i - 1] == b[j - 2] and a[i - 2] == b[j - 1]:
+                value = min(value, before[j - 2] + 1)
+            current[j] = value
+        if min(current) > limit:
+            return limit + 1
+        before, previous = previous, current
+    return min(previous[-1], limit + 1)
+
+
+def _word_distance(term, word, limit):
+    """
+    (edits, partial): the distance to the whole word, or to its start for a
+    partly typed word. A whole-word match wins a tie.
+    """
+    distance = edit_distance(term, word, limit)
+    if distance and len(word) > len(term):
+        prefix_distance = edit_distance(term, word[:len(term)], limit)
+        if prefix_distance < distance:
+            return prefix_distance, True
+    return distance, False
+
+
+class Vocabulary:
+    """
+    Words bucketed by their first and by their second letter. A typo seldom
+    changes both of a word's first two letters, so only words that have one
+    of the term's first two letters in one of those places are compared.
+    That covers a wrong, missing, extra or swapped first letter.
+    """
+
+    # Corrections remembered per vocabulary, by term
+    CACHE_SIZE = 1000
+
+    def __init__(self, words):
+        self.words = words
+        self.buckets = defaultdict(list)
+        for word in words:
+            for position, letter in enumerate(word[:2]):
+                self.buckets[position, letter].append(word)
+        self._cache = {}
+
+    def corrections(self, term):
+        """The words within the term's allowed edit distance, closest first."""
+        if term in self._cache:
+            return self._cache[term]
+        limit = _max_distance(term)
+        found = []
+        if limit:
+            nearby = set()
+            for position in (0, 1):
+                for letter in set(term[:2]):
+                    nearby.update(self.buckets.get((position, letter), ()))
+            for word in nearby:
+                if len(word) >= len(term) - limit:
+                    distance = _word_distance(term, word, limit)
+                    if distance[0] <= limit:
+                        found.append((distance, word))
+            found.sort()
+        if len(self._cache) >= self.CACHE_SIZE:
+            self._cache.clear()
+        self._cache[term] = [word for _, word in found[:MAX_CORRECTIONS]]
+        return self._cache[term]
+
+
+_vocabulary = None
+
+
+def vocabulary():
+    """The Vocabulary for the suggest index's current words, rebuilt when they change."""
+    global _vocabulary
+    words = suggest_index.words()
+    current = _vocabulary
+    if current is None or current.words is not words:
+        current = _vocabulary = Vocabulary(words)
+    return current
+
+
+def _fuzzy_candidates(queryset, terms):
+    """
+    Employees matching every term either as typed or as one of its
+    corrections, best FTS matches first.
+    """
+    words = vocabulary()
+    use_fts = fts_available(queryset.db)
+    groups = []
+    for term in terms:
+        alternatives = list(dict.fromkeys([term] + words.corrections(term)))
+        if use_fts and all(len(alternative) >= MIN_TRIGRAM_TERM for alternative in alternatives):
+            groups.append('(' + ' OR '.join(_phrase(alternative) for alternative in alternatives) + ')')
+            continue
+        condition = Q()
+        for alternative in alternatives:
+            condition |= _icontains(alternative)
+        queryset = queryset.filter(condition)
+    if groups:
+        # Only cap the FTS subquery when nothing else filters after it
+        limit = CANDIDATE_LIMIT if len(groups) == len(terms) else None
+        queryset = queryset.filter(id__in=_fts_ids(' AND '.join(groups), limit=limit))
+    return queryset
+
+
+def _score(terms, employee, distances):
+    """
+    (tier, similarity) for one candidate: 3 when every term starts a word,
+    2 when every term is a substring, 1 for a fuzzy match, 0 for no match.
+    `distances` memoizes term-to-word distances across candidates, which
+    share most of their words.
+    """
+    values = [str(getattr(employee, column) or '').lower() for column in SEARCH_COLUMNS]
+    words = [word for value in values for word in value.replace('@', ' ').replace('.', ' ').split()]
+
+    tier = 3
+    similarity = 0.0
+    for term in terms:
+        if any(word.startswith(term) for word in words):
+            term_tier, term_similarity = 3, 1.0
+        elif any(term in value for value in values):
+            term_tier, term_similarity = 2, 1.0
+        else:
+            limit = _max_distance(term)
+            best = (limit + 1, False)
+            for word in words:
+                key = (term, word)
+                if key not in distances:
+                    distances[key] = _word_distance(term, word, limit)
+                best = min(best, distances[key])
+            edits, partial = best
+            if edits <= limit:
+                term_tier, term_similarity = 1, 1 - (edits + 0.5 * partial) / len(term)
+            else:
+                term_tier, term_similarity = 0, 0.0
+        tier = min(tier, term_tier)
+        similarity += term_similarity
+    return tier, similarity / len(terms)
+
+
+def rank_employees(query, limit=20, queryset=None, fields=()):
+    """
+    Ranked, typo-tolerant search. Returns up to `limit` employees, best
+    match first, each with a `search_score` attribute. Only the search
+    columns and `fields` are loaded.
+    """
+    terms = [term.lower() for term in query.split()]
+    if not terms:
+        return []
+    queryset = queryset if queryset is not None else Employee.objects.all()
+    columns = list(dict.fromkeys(['id'] + SEARCH_COLUMNS + list(fields)))
+
+    candidates = {
+        employee.id: employee
+        for employee in filter_employees_by_terms(queryset, terms).only(*columns)[:CANDIDATE_LIMIT]
+    }
+    if len(candidates) < limit:
+        for employee in _fuzzy_candidates(queryset, terms).only(*columns)[:CANDIDATE_LIMIT]:
+            candidates.setdefault(employee.id, employee)
+
+    ranked = []
+    distances = {}
+    for employee in candidates.values():
+        tier, similarity = _score(terms, employee, distances)
+        if tier:
+            employee.search_score = round(tier + similarity / 2, 3)
+            ranked.append(employee)
+    ranked.sort(key=lambda employee: (-employee.search_score, employee.full_name, employee.employee_id))
+    return ranked[:limit]
@@ -1,5 +1,10 @@
 from rest_framework import serializers
+from rest_framework.validators import UniqueValidator
 from .models import Employee, Attendance, LeaveRequest, LeaveType, Performance, Payroll, Department, Notification
+from .fieldsets import SparseFieldsMixin
+from .leave_calendar import ACTIVE_STATUSES, MAX_CALENDAR_DAYS, overlapping_leave
+from .leave_decisions import DECISIONS, MAX_DECISION_IDS
+from .notifications import DEFAULT_POLL_TIMEOUT, MAX_MARK_READ_IDS, MAX_POLL_TIMEOUT
 import re
 from datetime import date, datetime
 
@@ -11,9 +16,19 @@ class DepartmentSerializer(serializers.ModelSerializer):
         fields = ['id', 'name', 'description', 'manager_id', 'budget', 'employee_count', 'created_at']
     
     def get_employee_count(self, obj):
+        # Views annotate the count; freshly created or updated instances don't carry it
+        if hasattr(obj, 'employee_count'):
+            return obj.employee_count
         return Employee.objects.filter(department=obj.name, status='Active').count()
 
-class EmployeeSerializer(serializers.ModelSerializer):
+    def update(self, instance, validated_data):
+        instance = super().update(instance, validated_data)
+        if 'name' in validated_data:
+            # A renamed department no longer matches the annotated count
+            instance.__dict__.pop('employee_count', None)
+        return instance
+
+class EmployeeSerializer(SparseFieldsMixin, serializers.ModelSerializer):
     class Meta:
         model = Employee
         fields = [
@@ -21,6 +36,7 @@ class EmployeeSerializer(serializers.ModelSerializer):
             'position', 'hire_date', 'salary', 'manager_id', 'status', 'address',
             'emergency_contact', 'emergency_phone', 'profile_picture', 'created_at', 'updated_at'
         ]
+        list_fields = ['id', 'employee_id', 'full_name', 'department', 'position', 'status']
 
     def validate_employee_id(self, value):
         if not value or len(value.strip()) == 0:
@@ -48,13 +64,29 @@ class EmployeeCreateSerializer(serializers.ModelSerializer):
         model = Employee
         fields = ['employee_id', 'full_name', 'email', 'phone', 'department', 'position', 'hire_date', 'salary', 'manager_id', 'address', 'emergency_contact', 'emergency_phone']
 
-class AttendanceSerializer(serializers.ModelSerializer):
+class EmployeeImportSerializer(EmployeeCreateSerializer):
+    """
+    Row validator for bulk imports. Uniqueness of employee_id and email is
+    checked once for the whole batch, so the per-row UniqueValidator queries
+    are dropped.
+    """
+    def get_fields(self):
+        fields = super().get_fields()
+        for field in fields.values():
+            field.validators = [v for v in field.validators if not isinstance(v, UniqueValidator)]
+        return fields
+
+class AttendanceSerializer(SparseFieldsMixin, serializers.ModelSerializer):
     employee_name = serializers.CharField(source='employee.full_name', read_only=True)
     employee_id = serializers.CharField(write_only=True)
 
+    # Added by to_representation(); read by the fast list path
+    representation_extra_fields = ['employee_id']
+
     class Meta:
         model = Attendance
         fields = ['id', 'employee_id', 'date', 'status', 'check_in_time', 'check_out_time', 'hours_worked', 'notes', 'employee_name']
+        list_fields = ['id', 'employee_id', 'employee_name', 'date', 'status', 'hours_worked']
 
     def validate_status(self, value):
         if value not in ['Present', 'Absent', 'Late', 'Half Day']:
@@ -73,7 +105,9 @@ class AttendanceSerializer(serializers.ModelSerializer):
 
     def to_representation(self, instance):
         representation = super().to_representation(instance)
-        representation['employee_id'] = instance.employee.employee_id
+        if 'employee_id' in self.fields:
+            # The foreign key targets employee_id, so no join is needed
+            representation['employee_id'] = instance.employee_id
         return representation
 
 class LeaveTypeSerializer(serializers.ModelSerializer):
@@ -81,11 +115,14 @@ class LeaveTypeSerializer(serializers.ModelSerializer):
         model = LeaveType
         fields = ['id', 'name', 'days_allowed', 'description', 'is_paid']
 
-class LeaveRequestSerializer(serializers.ModelSerializer):
+class LeaveRequestSerializer(SparseFieldsMixin, serializers.ModelSerializer):
     employee_name = serializers.CharField(source='employee.full_name', read_only=True)
     employee_id = serializers.CharField(write_only=True)
     leave_type_name = serializers.CharField(source='leave_type.name', read_only=True)
 
+    # Added by to_representation(); read by the fast list path
+    representation_extra_fields = ['employee_id']
+
     class Meta:
         model = LeaveRequest
         fields = [
@@ -93,6 +130,28 @@ class LeaveRequestSerializer(serializers.ModelSerializer):
             'start_date', 'end_date', 'days_requested', 'reason', 'status',
             'approved_by', 'approved_date', 'comments', 'created_at'
         ]
+        list_fields = [
+            'id', 'employee_id', 'employee_name', 'leave_type_name',
+            'start_date', 'end_date', 'days_requested', 'status'
+        ]
+
+    def validate(self, data):
+        instance = self.instance
+        start_date = data.get('start_date', instance.start_date if instance else None)
+        end_date = data.get('end_date', instance.end_date if instance else None)
+        if start_date and end_date and start_date > end_date:
+            raise serializers.ValidationError('start_date must not be after end_date')
+
+        status = data.get('status', instance.status if instance else 'Pending')
+        employee_id = data.get('employee_id', instance.employee_id if instance else None)
+        if status in ACTIVE_STATUSES and employee_id and start_date and end_date:
+            conflict = overlapping_leave(employee_id, start_date, end_date, exclude_pk=instance.pk if instance else None)
+            if conflict:
+                raise serializers.ValidationError(
+                    f'Overlaps leave request {conflict["id"]} '
+                    f'({conflict["start_date"]} to {conflict["end_date"]}, {conflict["status"]})'
+                )
+        return data
 
     def create(self, validated_data):
         employee_id = validated_data.pop('employee_id')
@@ -106,9 +165,53 @@ class LeaveRequestSerializer(serializers.ModelSerializer):
 
     def to_representation(self, instance):
         representation = super().to_representation(instance)
-        representation['employee_id'] = instance.employee.employee_id
+        if 'employee_id' in self.fields:
+            # The foreign key targets employee_id, so no join is needed
+            representation['employee_id'] = instance.employee_id
         return representation
 
+class LeaveBulkDecisionSerializer(serializers.Serializer):
+    ids = serializers.ListField(child=serializers.IntegerField(), allow_empty=False, max_length=MAX_DECISION_IDS)
+    status = serializers.ChoiceField(choices=DECISIONS)
+    approved_by = serializers.CharField(max_length=50)
+    comments = serializers.CharField(required=False, allow_blank=True)
+
+class LeaveCalendarQuerySerializer(serializers.Serializer):
+    start = serializers.DateField()
+    end = serializers.DateField()
+    department = serializers.CharField(required=False)
+    status = serializers.ChoiceField(choices=ACTIVE_STATUSES, required=False)
+
+    def validate(self, data):
+        if data['start'] > data['end']:
+            raise serializers.ValidationError('start must not be after end')
+        if (data['end'] - data['start']).days >= MAX_CALENDAR_DAYS:
+            raise serializers.ValidationError(f'The window is limited to {MAX_CALENDAR_DAYS} days')
+        return data
+
+class LeaveBalanceQuerySerializer(serializers.Serializer):
+    department = serializers.CharField(required=False)
+    employee_id = serializers.CharField(required=False)
+    year = serializers.IntegerField(required=False, min_value=1900, max_value=9999)
+
+    def validate(self, data):
+        if not data.get('department') and not data.get('employee_id'):
+            raise serializers.ValidationError('department or employee_id is required')
+        return data
+
+class LeaveBalanceEntrySerializer(serializers.Serializer):
+    leave_type = serializers.IntegerField()
+    leave_type_name = serializers.CharField()
+    days_allowed = serializers.IntegerField()
+    days_used = serializers.IntegerField()
+    days_pending = serializers.IntegerField()
+    days_remaining = serializers.IntegerField()
+
+class EmployeeLeaveBalanceSerializer(serializers.Serializer):
+    employee_id = serializers.CharField()
+    employee_name = serializers.CharField()
+    balances = LeaveBalanceEntrySerializer(many=True)
+
 class PerformanceSerializer(serializers.ModelSerializer):
     employee_name = serializers.CharField(source='employee.full_name', read_only=True)
     employee_id = serializers.CharField(write_only=True)
@@ -141,10 +244,13 @@ class PerformanceSerializer(serializers.ModelSerializer):
         representation['employee_id'] = instance.employee.employee_id
         return representation
 
-class PayrollSerializer(serializers.ModelSerializer):
+class PayrollSerializer(SparseFieldsMixin, serializers.ModelSerializer):
     employee_name = serializers.CharField(source='employee.full_name', read_only=True)
     employee_id = serializers.CharField(write_only=True)
 
+    # Added by to_representation(); read by the fast list path
+    representation_extra_fields = ['employee_id']
+
     class Meta:
         model = Payroll
         fields = [
@@ -152,6 +258,10 @@ class PayrollSerializer(serializers.ModelSerializer):
             'basic_salary', 'overtime_hours', 'overtime_rate', 'bonuses', 'deductions',
             'tax_deduction', 'net_salary', 'status', 'created_at'
         ]
+        list_fields = [
+            'id', 'employee_id', 'employee_name', 'pay_period_start', 'pay_period_end',
+            'net_salary', 'status'
+        ]
 
     def create(self, validated_data):
         employee_id = validated_data.pop('employee_id')
@@ -165,9 +275,23 @@ class PayrollSerializer(serializers.ModelSerializer):
 
     def to_representation(self, instance):
         representation = super().to_representation(instance)
-        representation['employee_id'] = instance.employee.employee_id
+        if 'employee_id' in self.fields:
+            # The foreign key targets employee_id, so no join is needed
+            representation['employee_id'] = instance.employee_id
         return representation
 
+class PayrollRunSerializer(serializers.Serializer):
+    pay_period_start = serializers.DateField()
+    pay_period_end = serializers.DateField()
+    department = serializers.CharField(required=False, allow_blank=True)
+    overtime_multiplier = serializers.DecimalField(max_digits=4, decimal_places=2, required=False, min_value=0)
+    tax_rate = serializers.DecimalField(max_digits=4, decimal_places=3, required=False, min_value=0, max_value=1)
+
+    def validate(self, data):
+        if data['pay_period_start'] > data['pay_period_end']:
+            raise serializers.ValidationError('pay_period_start must not be after pay_period_end')
+        return data
+
 class NotificationSerializer(serializers.ModelSerializer):
     employee_name = serializers.CharField(source='employee.full_name', read_only=True)
 
@@ -175,6 +299,17 @@ class NotificationSerializer(serializers.ModelSerializer):
         model = Notification
         fields = ['id', 'employee', 'employee_name', 'title', 'message', 'notification_type', 'is_read', 'created_at']
 
+class NotificationMarkReadSerializer(serializers.Serializer):
+    # With neither ids nor up_to_id, every unread notification is marked
+    employee_id = serializers.CharField()
+    ids = serializers.ListField(child=serializers.IntegerField(), required=False, max_length=MAX_MARK_READ_IDS)
+    up_to_id = serializers.IntegerField(required=False, min_value=0)
+
+class NotificationPollQuerySerializer(serializers.Serializer):
+    employee_id = serializers.CharField()
+    after = serializers.IntegerField(required=False, min_value=0, default=0)
+    timeout = serializers.FloatField(required=False, min_value=0, max_value=MAX_POLL_TIMEOUT, default=DEFAULT_POLL_TIMEOUT)
+
 class DashboardStatsSerializer(serializers.Serializer):
     total_employees = serializers.IntegerField()
     active_employees = serializers.IntegerField()
@@ -185,6 +320,29 @@ class DashboardStatsSerializer(serializers.Serializer):
     average_attendance_rate = serializers.FloatField()
     total_payroll_this_month = serializers.DecimalField(max_digits=12, decimal_places=2)
 
+ATTENDANCE_STATS_MAX_EMPLOYEES = 500
+
+class AttendanceStatsQuerySerializer(serializers.Serializer):
+    # A single id, or a comma-separated list on the batch route
+    employee_id = serializers.CharField()
+    start_date = serializers.DateField(required=False)
+    end_date = serializers.DateField(required=False)
+
+    def validate_employee_id(self, value):
+        employee_ids = list(dict.fromkeys(part.strip() for part in value.split(',') if part.strip()))
+        if not employee_ids:
+            raise serializers.ValidationError('At least one employee_id is required')
+        if len(employee_ids) > ATTENDANCE_STATS_MAX_EMPLOYEES:
+            raise serializers.ValidationError(
+                f'At most {ATTENDANCE_STATS_MAX_EMPLOYEES} employee ids per request'
+            )
+        return employee_ids
+
+    def validate(self, data):
+        if data.get('start_date') and data.get('end_date') and data['start_date'] > data['end_date']:
+            raise serializers.ValidationError('start_date must not be after end_date')
+        return data
+
 class AttendanceStatsSerializer(serializers.Serializer):
     employee_id = serializers.CharField()
     employee_name = serializers.CharField()
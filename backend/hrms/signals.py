@@ -0,0 +1,157 @@
+from django.db.models import QuerySet
+from django.db.models.signals import pre_save, post_save, pre_delete, post_delete
+from django.dispatch import receiver
+
+from .balances import apply_change as apply_balance_change, ledger_entry
+from .models import Employee, Attendance, LeaveRequest, Payroll, Department, Notification
+from .notifications import bump as bump_notification_counter, notification_created
+from .rollup import apply_change, attendance_key, move_employee, remove_employee
+from .search import install_search_index
+from .stats import invalidate_dashboard_stats
+from .suggest import employee_saved, employee_deleted
+
+
+@receiver([post_save, post_delete], sender=Employee)
+@receiver([post_save, post_delete], sender=Attendance)
+@receiver([post_save, post_delete], sender=LeaveRequest)
+@receiver([post_save, post_delete], sender=Payroll)
+@receiver([post_save, post_delete], sender=Department)
+def dashboard_stats_changed(sender, **kwargs):
+    invalidate_dashboard_stats()
+
+
+@receiver(pre_save, sender=Attendance)
+def remember_attendance(sender, instance, raw=False, **kwargs):
+    instance._rollup_previous = None
+    if raw or instance._state.adding:
+        return
+    previous = Attendance.objects.filter(pk=instance.pk).values_list(
+        'date', 'employee__department', 'employee__status', 'status', 'hours_worked'
+    ).first()
+    if previous:
+        day, department, employee_status, status, hours = previous
+        instance._rollup_previous = (day, department, employee_status == 'Active', status, hours)
+
+
+@receiver(post_save, sender=Attendance)
+def attendance_saved(sender, instance, raw=False, **kwargs):
+    previous = instance.__dict__.pop('_rollup_previous', None)
+    if raw:
+        return
+    apply_change(previous, attendance_key(instance))
+
+
+def _deleting_employees(origin):
+    if isinstance(origin, QuerySet):
+        return origin.model is Employee
+    return isinstance(origin, Employee)
+
+
+@receiver(post_delete, sender=Attendance)
+def attendance_deleted(sender, instance, origin=None, **kwargs):
+    if _deleting_employees(origin):
+        # Cascaded from an employee delete; employee_removed() already took
+        # the employee's whole history out of the rollup
+        return
+    apply_change(attendance_key(instance), None)
+
+
+def _rollup_bucket(department, status):
+    return (department, status == 'Active')
+
+
+@receiver(pre_save, sender=Employee)
+def remember_department(sender, instance, raw=False, **kwargs):
+    instance._previous_bucket = None
+    if raw or instance._state.adding:
+        return
+    previous = Employee.objects.filter(pk=instance.pk).values_list('department', 'status').first()
+    if previous:
+        instance._previous_bucket = _rollup_bucket(*previous)
+
+
+@receiver(post_save, sender=Employee)
+def employee_department_changed(sender, instance, raw=False, **kwargs):
+    previous = getattr(instance, '_previous_bucket', None)
+    current = _rollup_bucket(instance.department, instance.status)
+    if raw or previous is None or previous == current:
+        return
+    move_employee(instance.employee_id, previous, current)
+
+
+@receiver(pre_delete, sender=Employee)
+def employee_removed(sender, instance, **kwargs):
+    # Runs inside the delete's transaction, before the cascade removes the
+    # attendance rows
+    remove_employee(instance.employee_id, _rollup_bucket(instance.department, instance.status))
+
+
+def _ledger_entry(leave):
+    return ledger_entry(leave.employee_id, leave.leave_type_id, leave.start_date, leave.status, leave.days_requested)
+
+
+@receiver(pre_save, sender=LeaveRequest)
+def remember_leave_request(sender, instance, raw=False, **kwargs):
+    if hasattr(instance, '_balance_previous'):
+        # Set by a caller that already read (and locked) the row
+        return
+    instance._balance_previous = None
+    if raw or instance._state.adding:
+        return
+    previous = LeaveRequest.objects.filter(pk=instance.pk).values_list(
+        'employee_id', 'leave_type_id', 'start_date', 'status', 'days_requested'
+    ).first()
+    instance._balance_previous = ledger_entry(*previous) if previous else None
+
+
+@receiver(post_save, sender=LeaveRequest)
+def leave_request_saved(sender, instance, raw=False, **kwargs):
+    previous = instance.__dict__.pop('_balance_previous', None)
+    if raw:
+        return
+    apply_balance_change(previous, _ledger_entry(instance))
+
+
+@receiver(post_delete, sender=LeaveRequest)
+def leave_request_deleted(sender, instance, **kwargs):
+    apply_balance_change(_ledger_entry(instance), None)
+
+
+@receiver(post_save, sender=Employee)
+def employee_suggest_saved(sender, instance, **kwargs):
+    employee_saved(instance)
+
+
+@receiver(post_delete, sender=Employee)
+def employee_suggest_deleted(sender, instance, **kwargs):
+    employee_deleted(instance.pk)
+
+
+@receiver(pre_save, sender=Notification)
+def remember_notification(sender, instance, raw=False, **kwargs):
+    instance._was_read = None
+    if raw or instance._state.adding:
+        return
+    instance._was_read = Notification.objects.filter(pk=instance.pk).values_list('is_read', flat=True).first()
+
+
+@receiver(post_save, sender=Notification)
+def notification_saved(sender, instance, created, raw=False, **kwargs):
+    was_read = instance.__dict__.pop('_was_read', None)
+    if raw:
+        return
+    if created:
+        notification_created(instance)
+    elif was_read is not None and was_read != instance.is_read:
+        bump_notification_counter(instance.employee_id, unread=-1 if instance.is_read else 1)
+
+
+@receiver(post_delete, sender=Notification)
+def notification_deleted(sender, instance, **kwargs):
+    if not instance.is_read:
+        bump_notification_counter(instance.employee_id, unread=-1)
+
+
+def search_index_after_migrate(sender, using='default', **kwargs):
+    # Connected to post_migrate in HrmsConfig.ready()
+    install_search_index(using)
@@ -0,0 +1,228 @@
+from datetime import date, timedelta
+from decimal import Decimal
+
+from django.conf import settings
+from django.core.cache import cache
+from django.db.models import Avg, Count, FilteredRelation, Q, Sum
+
+from .models import Employee, AttendanceRollup, LeaveRequest, Payroll, Department
+
+PRESENT_STATUSES = ['Present', 'Late', 'Half Day']
+
+DASHBOARD_CACHE_KEY = 'hrms:dashboard_stats:{day}'
+
+
+def dashboard_queries(today=None):
+    """
+    The dashboard's independent queries as zero-argument callables, keyed by
+    name, so they can be run one after another or side by side.
+    """
+    today = today or date.today()
+    thirty_days_ago = today - timedelta(days=30)
+    current_month_start = today.replace(day=1)
+
+    def employees():
+        return Employee.objects.aggregate(
+            total=Count('id'),
+            active=Count('id', filter=Q(status='Active')),
+        )
+
+    def attendance():
+        # Read from the rollup: at most days x departments x statuses rows.
+        # Today is inside the 30 day window, so one scan covers both.
+        totals = AttendanceRollup.objects.filter(date__gte=thirty_days_ago).aggregate(
+            present_today=Sum('count', filter=Q(date=today, status__in=PRESENT_STATUSES)),
+            absent_today=Sum('count', filter=Q(date=today, status='Absent')),
+            total=Sum('count'),
+            present=Sum('count', filter=Q(status__in=PRESENT_STATUSES)),
+        )
+        return {key: value or 0 for key, value in totals.items()}
+
+    def pending_leave_requests():
+        return LeaveRequest.objects.filter(status='Pending').count()
+
+    def departments_count():
+        return Department.objects.count()
+
+    def total_payroll_this_month():
+        return Payroll.objects.filter(
+            pay_period_start__gte=current_month_start,
+            status='Processed'
+        ).aggregate(total=Sum('net_salary'))['total'] or Decimal('0.00')
+
+    return {
+        'employees': employees,
+        'attendance': attendance,
+        'pending_leave_requests': pending_leave_requests,
+        'departments_count': departments_count,
+        'total_payroll_this_month': total_payroll_this_month,
+    }
+
+
+def build_dashboard_stats(results):
+    """Assemble the dashboard figures from the results of dashboard_queries()."""
+    employees = results['employees']
+    attendance = results['attendance']
+    total_records = attendance['total']
+    average_attendance_rate = (attendance['present'] / total_records * 100) if total_records > 0 else 0
+
+    return {
+        'total_employees': employees['total'],
+        'active_employees': employees['active'],
+        'present_today': attendance['present_today'],
+        'absent_today': attendance['absent_today'],
+        'pending_leave_requests': results['pending_leave_requests'],
+        'departments_count': results['departments_count'],
+        'average_attendance_rate': round(average_attendance_rate, 2),
+        'total_payroll_this_month': results['total_payroll_this_month']
+    }
+
+
+def run_queries(queries):
+    return {name: query() for name, query in queries.items()}
+
+
+def compute_dashboard_stats(today=None):
+    return build_dashboard_stats(run_queries(dashboard_queries(today)))
+
+
+def dashboard_cache_key():
+    return DASHBOARD_CACHE_KEY.format(day=date.today().isoformat())
+
+
+def get_dashboard_stats():
+    """
+    Return the dashboard figures from the cached snapshot, computing and
+    storing them on a miss. The key includes the date so "today" figures
+    roll over at midnight.
+    """
+    key = dashboard_cache_key()
+    stats = cache.get(key)
+    if stats is None:
+        stats = compute_dashboard_stats()
+        cache.set(key, stats, getattr(settings, 'HRMS_DASHBOARD_CACHE_TTL', 60))
+    return stats
+
+
+def invalidate_dashboard_stats():
+    cache.delete(dashboard_cache_key())
+
+
+def department_queries(today=None):
+    """
+    The independent queries behind department stats: active head-count and
+    average salary per department, today's attendance from the rollup, and
+    the department list.
+    """
+    today = today or date.today()
+
+    def employees():
+        return {
+            row['department']: row
+            for row in Employee.objects.filter(status='Active').values('department').annotate(
+                total_employees=Count('id'),
+                average_salary=Avg('salary'),
+            ).order_by()
+        }
+
+    def attendance():
+        # Active employees only, like the head-count the rate divides by
+        return {
+            row['department']: row
+            for row in AttendanceRollup.objects.filter(date=today, active=True).values('department').annotate(
+                present_today=Sum('count', filter=Q(status__in=PRESENT_STATUSES)),
+                absent_today=Sum('count', filter=Q(status='Absent')),
+            ).order_by()
+        }
+
+    def names():
+        # Table order, as the per-department loop this replaced returned; an
+        # unordered query here is served from the name index instead
+        return list(Department.objects.order_by('id').values_list('name', flat=True))
+
+    return {'employees': employees, 'attendance': attendance, 'names': names}
+
+
+def build_department_stats(results, include_unlisted=False):
+    """
+    Assemble per-department stats from the results of department_queries().
+
+    Departments are returned in Department table order. With
+    `include_unlisted`, department names that only exist on Employee rows are
+    appended after them, alphabetically.
+    """
+    rows = results['employees']
+    attendance = results['attendance']
+    names = list(results['names'])
+    if include_unlisted:
+        listed = set(names)
+        names += sorted(name for name in rows if name not in listed)
+
+    stats = []
+    for name in names:
+        row = rows.get(name)
+        if not row:
+            continue
+        today_row = attendance.get(name, {})
+        present_today = today_row.get('present_today') or 0
+        total_employees = row['total_employees']
+        attendance_rate = (present_today / total_employees * 100) if total_employees > 0 else 0
+        stats.append({
+            'department': name,
+            'total_employees': total_employees,
+            'present_today': present_today,
+            'absent_today': today_row.get('absent_today') or 0,
+            'attendance_rate': round(attendance_rate, 2),
+            'average_salary': row['average_salary'] or Decimal('0.00')
+        })
+    return stats
+
+
+def compute_department_stats(today=None, include_unlisted=False):
+    """Per-department stats: two grouped queries plus one for the department list."""
+    return build_department_stats(run_queries(department_queries(today)), include_unlisted=include_unlisted)
+
+
+def compute_attendance_stats(employee_ids, start_date=None, end_date=None):
+    """
+    Attendance counts per employee, optionally limited to a date window, in
+    one grouped query that also fetches the employee names. Returns a dict
+    keyed by employee_id; unknown ids are absent.
+    """
+    window = Q()
+    if start_date:
+        window &= Q(attendance__date__gte=start_date)
+    if end_date:
+        window &= Q(attendance__date__lte=end_date)
+
+    queryset = Employee.objects.filter(employee_id__in=employee_ids)
+    relation = 'attendance'
+    if window:
+        queryset = queryset.annotate(window=FilteredRelation('attendance', condition=window))
+        relation = 'window'
+
+    def days(status):
+        return Count(relation, filter=Q(**{f'{relation}__status': status}))
+
+    rows = queryset.values('employee_id', 'full_name').annotate(
+        total_days=Count(relation),
+        present_days=days('Present'),
+        absent_days=days('Absent'),
+        late_days=days('Late'),
+        half_days=days('Half Day'),
+    ).order_by()
+
+    stats = {}
+    for row in rows:
+        total_days = row['total_days']
+        stats[row['employee_id']] = {
+            'employee_id': row['employee_id'],
+            'employee_name': row['full_name'],
+            'total_days': total_days,
+            'present_days': row['present_days'],
+            'absent_days': row['absent_days'],
+            'late_days': row['late_days'],
+            'half_days': row['half_days'],
+            'attendance_percentage': round((row['present_days'] / total_days * 100) if total_days > 0 else 0, 2),
+        }
+    return stats
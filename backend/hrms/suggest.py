@@ -0,0 +1,194 @@
+"""
+In-process prefix index for employee typeahead.
+
+Three sorted arrays hold lowercased keys: employee ids, full names, and the
+later words of each name (so "smi" finds "John Smith"). A lookup bisects to
+the first key with the prefix and reads forward, so it touches about `limit`
+entries whatever the table size. The index also keeps the vocabulary of name
+and department words, which the ranked search corrects typos against.
+
+Employee save/delete signals update the index in place once the write
+commits. Writes that skip signals (bulk_create, raw deletes) call
+invalidate_suggest_index() instead. Either way, a version number in the
+Django cache is bumped. A process whose version is out of date reloads the
+index with one query on its next lookup.
+
+That only reaches other processes when they share the cache (see CACHES in
+settings). With the default per-process LocMemCache they never see the
+bump, so an index is also reloaded once it is older than
+HRMS_SUGGEST_MAX_AGE seconds. This caps how long another process's writes
+take to appear.
+"""
+import threading
+import time
+from bisect import bisect_left, insort
+from collections import Counter
+
+from django.conf import settings
+from django.core.cache import cache
+from django.db import transaction
+
+from .models import Employee
+
+SUGGEST_VERSION_KEY = 'hrms:employee_suggest:version'
+DEFAULT_MAX_AGE = 60
+
+ID, NAME, WORD = range(3)
+
+
+def _keys(employee_id, full_name):
+    name = full_name.lower()
+    keys = [(ID, employee_id.lower()), (NAME, name)]
+    keys.extend((WORD, word) for word in name.split()[1:])
+    return keys
+
+
+def _vocabulary_words(full_name, department):
+    return full_name.lower().split() + (department or '').lower().split()
+
+
+def _bump_version():
+    try:
+        return cache.incr(SUGGEST_VERSION_KEY)
+    except ValueError:
+        cache.add(SUGGEST_VERSION_KEY, 1, None)
+        return cache.get(SUGGEST_VERSION_KEY)
+
+
+class SuggestIndex:
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._loaded = False
+        self._loaded_at = 0.0
+        self._version = None
+        self._arrays = ([], [], [])
+        self._entries = {}
+        self._vocabulary = Counter()
+        self._words = None
+
+    def _add(self, pk, employee_id, full_name, department):
+        keys = _keys(employee_id, full_name)
+        self._entries[pk] = (employee_id, full_name, department, keys)
+        for kind, key in keys:
+            insort(self._arrays[kind], (key, pk))
+        self._vocabulary.update(_vocabulary_words(full_name, department))
+        self._words = None
+
+    def _remove(self, pk):
+        entry = self._entries.pop(pk, None)
+        if entry is None:
+            return
+        for kind, key in entry[3]:
+            array = self._arrays[kind]
+            position = bisect_left(array, (key, pk))
+            if position < len(array) and array[position] == (key, pk):
+                del array[position]
+        for word in _vocabulary_words(entry[1], entry[2]):
+            self._vocabulary[word] -= 1
+            if self._vocabulary[word] <= 0:
+                del self._vocabulary[word]
+        self._words = None
+
+    def _load(self, version):
+        rows = Employee.objects.values_list('pk', 'employee_id', 'full_name', 'department')
+        entries = {}
+        arrays = ([], [], [])
+        vocabulary = Counter()
+        for pk, employee_id, full_name, department in rows.iterator(chunk_size=5000):
+            keys = _keys(employee_id, full_name)
+            entries[pk] = (employee_id, full_name, department, keys)
+            for kind, key in keys:
+                arrays[kind].append((key, pk))
+            vocabulary.update(_vocabulary_words(full_name, department))
+        for array in arrays:
+            array.sort()
+        self._entries, self._arrays = entries, arrays
+        self._vocabulary, self._words = vocabulary, None
+        self._version = version
+        self._loaded = True
+        self._loaded_at = time.monotonic()
+
+    def _refresh(self, version):
+        # Called with the lock held. The version is read before taking it, so
+        # a write that lands mid-load triggers another load
+        max_age = getattr(settings, 'HRMS_SUGGEST_MAX_AGE', DEFAULT_MAX_AGE)
+        if not self._loaded or version != self._version or time.monotonic() - self._loaded_at > max_age:
+            self._load(version)
+
+    def suggest(self, query, limit=10):
+        """Up to `limit` {employee_id, full_name, department}: id matches, then names, then later words."""
+        prefix = ' '.join(query.lower().split())
+        if not prefix:
+            return []
+        version = cache.get(SUGGEST_VERSION_KEY)
+        with self._lock:
+            self._refresh(version)
+
+            results = []
+            seen = set()
+            for array in self._arrays:
+                position = bisect_left(array, (prefix,))
+                while len(results) < limit and position < len(array):
+                    key, pk = array[position]
+                    if not key.startswith(prefix):
+                        break
+                    if pk not in seen:
+                        seen.add(pk)
+                        employee_id, full_name, department, _ = self._entries[pk]
+                        results.append({
+                            'employee_id': employee_id,
+                            'full_name': full_name,
+                            'department': department,
+                        })
+                    position += 1
+            return results
+
+    def words(self):
+        """The distinct lowercased words of every employee's name and department."""
+        version = cache.get(SUGGEST_VERSION_KEY)
+        with self._lock:
+            self._refresh(version)
+            if self._words is None:
+                self._words = tuple(self._vocabulary)
+            return self._words
+
+    def _applied(self, change):
+        with self._lock:
+            if self._loaded:
+                change()
+            version = _bump_version()
+            # Only skip the reload if no other process wrote in between
+            if self._loaded and self._version is not None and version == self._version + 1:
+                self._version = version
+            else:
+                self._loaded = False
+
+    def upsert(self, pk, employee_id, full_name, department):
+        def change():
+            self._remove(pk)
+            self._add(pk, employee_id, full_name, department)
+        self._applied(change)
+
+    def remove(self, pk):
+        self._applied(lambda: self._remove(pk))
+
+    def invalidate(self):
+        with self._lock:
+            self._loaded = False
+            _bump_version()
+
+
+suggest_index = SuggestIndex()
+
+
+def employee_saved(employee):
+    values = (employee.pk, employee.employee_id, employee.full_name, employee.department)
+    transaction.on_commit(lambda: suggest_index.upsert(*values))
+
+
+def employee_deleted(pk):
+    transaction.on_commit(lambda: suggest_index.remove(pk))
+
+
+def invalidate_suggest_index():
+    transaction.on_commit(suggest_index.invalidate)
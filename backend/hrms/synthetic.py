@@ -0,0 +1,227 @@
+"""
+Synthetic dataset generator for load testing and benchmarks.
+
+Everything is written with bulk_create in fixed-size chunks, so memory stays
+flat and the cost is a handful of INSERTs per chunk rather than a save() per
+row. Rows are deterministic for a given seed.
+"""
+import random
+from datetime import date, time, timedelta
+from decimal import Decimal
+
+from django.db import transaction
+
+from .models import (
+    Employee, Department, Attendance, AttendanceRollup, LeaveType, LeaveRequest, LeaveBalance,
+    Performance, Payroll, Notification, NotificationCounter
+)
+from .balances import rebuild_balances
+from .notifications import rebuild_counters
+from .rollup import rebuild_rollup
+from .stats import invalidate_dashboard_stats
+from .suggest import invalidate_suggest_index
+
+DEPARTMENT_NAMES = [
+    'Engineering', 'Marketing', 'HR', 'Finance', 'Sales', 'Operations',
+    'Support', 'Legal', 'Product', 'Design', 'Research', 'Facilities',
+]
+FIRST_NAMES = [
+    'John', 'Sarah', 'Mike', 'Emily', 'David', 'Priya', 'Carlos', 'Mei',
+    'Ahmed', 'Olga', 'Kwame', 'Lucia', 'Hiro', 'Fatima', 'Tom', 'Ana',
+]
+LAST_NAMES = [
+    'Smith', 'Johnson', 'Davis', 'Brown', 'Wilson', 'Patel', 'Garcia', 'Chen',
+    'Khan', 'Ivanova', 'Mensah', 'Rossi', 'Tanaka', 'Ali', 'Miller', 'Silva',
+]
+LEAVE_TYPES = [
+    {'name': 'Annual Leave', 'days_allowed': 21, 'description': 'Yearly vacation days', 'is_paid': True},
+    {'name': 'Sick Leave', 'days_allowed': 10, 'description': 'Medical leave', 'is_paid': True},
+    {'name': 'Personal Leave', 'days_allowed': 5, 'description': 'Personal time off', 'is_paid': False},
+]
+
+CHUNK_SIZE = 5000
+
+
+def _chunked_insert(model, rows, chunk_size=CHUNK_SIZE):
+    count = 0
+    chunk = []
+    for row in rows:
+        chunk.append(row)
+        if len(chunk) >= chunk_size:
+            model.objects.bulk_create(chunk)
+            count += len(chunk)
+            chunk = []
+    if chunk:
+        model.objects.bulk_create(chunk)
+        count += len(chunk)
+    return count
+
+
+def clear_dataset():
+    # Children first, and without the per-row delete signals: at benchmark
+    # sizes those would be millions of rollup updates for a table being emptied
+    for model in (NotificationCounter, Notification, Payroll, Performance, LeaveBalance, LeaveRequest, AttendanceRollup, Attendance,
+                  Employee, LeaveType, Department):
+        model.objects.all()._raw_delete(model.objects.db)
+    invalidate_dashboard_stats()
+    invalidate_suggest_index()
+
+
+def generate_dataset(employees=1000, departments=8, days=30, leave_per_employee=2,
+                     payroll_months=3, reviews_per_employee=1, notifications_per_employee=3,
+                     seed=42, prefix='EMP', today=None):
+    """
+    Create `employees` employees across `departments` departments with
+    `days` days of attendance ending today, plus leave, payroll, performance
+    and notification history. Returns the number of rows written per model.
+    """
+    rng = random.Random(seed)
+    today = today or date.today()
+    counts = {}
+
+    with transaction.atomic():
+        names = [
+            DEPARTMENT_NAMES[i] if i < len(DEPARTMENT_NAMES) else f'Department {i + 1}'
+            for i in range(departments)
+        ]
+        existing = set(Department.objects.filter(name__in=names).values_list('name', flat=True))
+        counts['departments'] = _chunked_insert(Department, (
+            Department(name=name, description=f'{name} team', budget=Decimal(rng.randrange(100000, 900000)))
+            for name in names if name not in existing
+        ))
+
+        existing = set(LeaveType.objects.values_list('name', flat=True))
+        LeaveType.objects.bulk_create([LeaveType(**data) for data in LEAVE_TYPES if data['name'] not in existing])
+        leave_types = list(LeaveType.objects.filter(name__in=[data['name'] for data in LEAVE_TYPES]))
+
+        width = max(len(str(employees)), 6)
+        employee_ids = [f'{prefix}{i:0{width}d}' for i in range(1, employees + 1)]
+        salaries = {}
+
+        def employee_rows():
+            for number, employee_id in enumerate(employee_ids):
+                salary = Decimal(rng.randrange(40000, 160000))
+                salaries[employee_id] = salary
+                first, last = rng.choice(FIRST_NAMES), rng.choice(LAST_NAMES)
+                yield Employee(
+                    employee_id=employee_id,
+                    full_name=f'{first} {last}',
+                    email=f'{employee_id.lower()}@example.com',
+                    phone=f'+1-555-{number % 10000:04d}',
+                    department=names[number % len(names)],
+                    position='Staff',
+                    hire_date=today - timedelta(days=rng.randrange(30, 3650)),
+                    salary=salary,
+                    status='Active' if rng.random() < 0.95 else 'Inactive',
+                )
+
+        counts['employees'] = _chunked_insert(Employee, employee_rows())
+
+        def attendance_rows():
+            for offset in range(days):
+                day = today - timedelta(days=offset)
+                for employee_id in employee_ids:
+                    roll = rng.random()
+                    if roll < 0.85:
+                        status, hours, check_in = 'Present', Decimal('8.50'), time(9, 0)
+                    elif roll < 0.92:
+                        status, hours, check_in = 'Late', Decimal('7.50'), time(10, 0)
+                    elif roll < 0.95:
+                        status, hours, check_in = 'Half Day', Decimal('4.00'), time(9, 0)
+                    else:
+                        status, hours, check_in = 'Absent', None, None
+                    yield Attendance(
+                        employee_id=employee_id, date=day, status=status,
+                        check_in_time=check_in,
+                        check_out_time=time(17, 30) if check_in else None,
+                        hours_worked=hours,
+                    )
+
+        counts['attendance'] = _chunked_insert(Attendance, attendance_rows())
+        rebuild_rollup(start=today - timedelta(days=days - 1), end=today)
+
+        def leave_rows():
+            for employee_id in employee_ids:
+                start = today - timedelta(days=rng.randrange(0, 365))
+                for _ in range(leave_per_employee):
+                    length = rng.randrange(1, 6)
+                    status = rng.choice(['Pending', 'Approved', 'Approved', 'Rejected'])
+                    yield LeaveRequest(
+                        employee_id=employee_id,
+                        leave_type=rng.choice(leave_types),
+                        start_date=start,
+                        end_date=start + timedelta(days=length - 1),
+                        days_requested=length,
+                        reason='Synthetic leave request',
+                        status=status,
+                        approved_by='ADMIN' if status != 'Pending' else None,
+                    )
+                    # Keep each employee's requests from overlapping
+                    start += timedelta(days=length + rng.randrange(7, 60))
+
+        counts['leave_requests'] = _chunked_insert(LeaveRequest, leave_rows())
+        rebuild_balances()
+
+        def payroll_rows():
+            month_start = today.replace(day=1)
+            periods = []
+            for _ in range(payroll_months):
+                period_end = month_start - timedelta(days=1)
+                month_start = period_end.replace(day=1)
+                periods.append((month_start, period_end))
+            for employee_id in employee_ids:
+                basic = (salaries[employee_id] / 12).quantize(Decimal('0.01'))
+                for period_start, period_end in periods:
+                    overtime_hours = Decimal(rng.randrange(0, 20))
+                    overtime_rate = Decimal('25.00')
+                    tax = (basic * Decimal('0.2')).quantize(Decimal('0.01'))
+                    # bulk_create skips Payroll.save(), so net pay is set here
+                    yield Payroll(
+                        employee_id=employee_id,
+                        pay_period_start=period_start,
+                        pay_period_end=period_end,
+                        basic_salary=basic,
+                        overtime_hours=overtime_hours,
+                        overtime_rate=overtime_rate,
+                        tax_deduction=tax,
+                        net_salary=basic + overtime_hours * overtime_rate - tax,
+                        status='Processed',
+                    )
+
+        counts['payroll'] = _chunked_insert(Payroll, payroll_rows())
+
+        def performance_rows():
+            for employee_id in employee_ids:
+                for review in range(reviews_per_employee):
+                    end = today - timedelta(days=180 * review)
+                    yield Performance(
+                        employee_id=employee_id,
+                        review_period_start=end - timedelta(days=180),
+                        review_period_end=end,
+                        overall_rating=rng.randint(1, 5),
+                        goals_achievement=rng.randint(1, 5),
+                        communication=rng.randint(1, 5),
+                        teamwork=rng.randint(1, 5),
+                        technical_skills=rng.randint(1, 5),
+                        reviewer_id='ADMIN',
+                    )
+
+        counts['performance'] = _chunked_insert(Performance, performance_rows())
+
+        def notification_rows():
+            for employee_id in employee_ids:
+                for number in range(notifications_per_employee):
+                    yield Notification(
+                        employee_id=employee_id,
+                        title=f'Notification {number + 1}',
+                        message='Synthetic notification',
+                        notification_type=rng.choice(['leave_request', 'attendance_alert', 'payroll', 'general']),
+                        is_read=rng.random() < 0.6,
+                    )
+
+        counts['notifications'] = _chunked_insert(Notification, notification_rows())
+        rebuild_counters()
+
+    invalidate_dashboard_stats()
+    invalidate_suggest_index()
+    return counts
@@ -0,0 +1,99 @@
+from datetime import date
+from decimal import Decimal
+
+from django.db import connection
+from django.test import TestCase
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+
+from hrms.models import Attendance, AttendanceRollup, Employee
+
+
+class MarkAttendanceTests(TestCase):
+    """
+    POST /api/attendance/ looks the employee and the day up once and writes
+    the record once. The write and its attendance rollup upsert share a
+    transaction (a savepoint here, since each test runs inside one).
+    """
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.employee = Employee.objects.create(
+            employee_id='EMP1', full_name='Ana Silva', email='ana@example.com', department='Engineering',
+            position='Developer', hire_date=date(2024, 1, 1), salary=Decimal('1000.00'),
+        )
+
+    def mark(self, queries, **payload):
+        payload.setdefault('employee_id', 'EMP1')
+        payload.setdefault('date', '2025-03-10')
+        with CaptureQueriesContext(connection) as captured:
+            response = self.client.post(reverse('attendance-list-create'), payload, content_type='application/json')
+        statements = [query['sql'] for query in captured.captured_queries]
+        self.assertEqual(len(statements), len(queries), statements)
+        for statement, prefix in zip(statements, queries):
+            self.assertTrue(statement.startswith(prefix), statement)
+        return response
+
+    def rollup(self):
+        return list(AttendanceRollup.objects.exclude(count=0).values_list('status', 'count', 'hours_worked'))
+
+    def test_create_is_one_lookup_one_insert_and_one_rollup_upsert(self):
+        response = self.mark(
+            ['SELECT', 'SAVEPOINT', 'INSERT INTO "hrms_attendance"', 'INSERT INTO "hrms_attendancerollup"',
+             'RELEASE SAVEPOINT'],
+            status='Present', hours_worked='8.00',
+        )
+        self.assertEqual(response.status_code, 201)
+        self.assertEqual(response.json()['employee_name'], 'Ana Silva')
+        self.assertEqual(self.rollup(), [('Present', 1, Decimal('8.00'))])
+
+    def test_update_is_one_lookup_one_update_and_one_rollup_upsert(self):
+        self.client.post(
+            reverse('attendance-list-create'),
+            {'employee_id': 'EMP1', 'date': '2025-03-10', 'status': 'Present', 'hours_worked': '8.00', 'notes': 'on site'},
+            content_type='application/json',
+        )
+        # Both buckets change in the one upsert
+        response = self.mark(
+            ['SELECT', 'SAVEPOINT', 'UPDATE "hrms_attendance"', 'INSERT INTO "hrms_attendancerollup"',
+             'RELEASE SAVEPOINT'],
+            status='Late',
+        )
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.json()['status'], 'Late')
+
+        # Fields that weren't sent keep their values
+        attendance = Attendance.objects.get(employee=self.employee, date=date(2025, 3, 10))
+        self.assertEqual((attendance.status, attendance.hours_worked, attendance.notes), ('Late', Decimal('8.00'), 'on site'))
+        self.assertEqual(Attendance.objects.count(), 1)
+        self.assertEqual(self.rollup(), [('Late', 1, Decimal('8.00'))])
+
+    def test_update_outside_the_rollup_skips_it(self):
+        self.client.post(
+            reverse('attendance-list-create'), {'employee_id': 'EMP1', 'date': '2025-03-10', 'status': 'Present'},
+            content_type='application/json',
+        )
+        response = self.mark(
+            ['SELECT', 'SAVEPOINT', 'UPDATE "hrms_attendance"', 'RELEASE SAVEPOINT'],
+            status='Present', notes='late bus',
+        )
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.json()['notes'], 'late bus')
+
+    def test_unknown_employee_is_one_query(self):
+        with self.assertNumQueries(1):
+            response = self.client.post(
+                reverse('attendance-list-create'),
+                {'employee_id': 'NOPE', 'date': '2025-03-10', 'status': 'Present'},
+                content_type='application/json',
+            )
+        self.assertEqual(response.status_code, 404)
+
+    def test_invalid_payload_runs_no_queries(self):
+        with self.assertNumQueries(0):
+            response = self.client.post(
+                reverse('attendance-list-create'),
+                {'employee_id': 'EMP1', 'date': '2025-03-10', 'status': 'Sleeping'},
+                content_type='application/json',
+            )
+        self.assertEqual(response.status_code, 400)
@@ -0,0 +1,91 @@
+from datetime import date
+from decimal import Decimal
+
+from django.test import TestCase
+from django.urls import reverse
+
+from hrms.models import Attendance, AttendanceRollup, Employee
+from hrms.rollup import rebuild_rollup
+from hrms.views import MAX_BULK_ATTENDANCE_RECORDS
+
+
+class BulkMarkAttendanceTests(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        for employee_id in ('EMP1', 'EMP2'):
+            Employee.objects.create(
+                employee_id=employee_id, full_name=f'Employee {employee_id}', email=f'{employee_id.lower()}@example.com',
+                department='Engineering', position='Staff', hire_date=date(2024, 1, 1), salary=Decimal('1000.00'),
+            )
+        Attendance.objects.create(
+            employee_id='EMP1', date=date(2025, 3, 10), status='Present', hours_worked=Decimal('8.00'), notes='on site',
+        )
+
+    def mark(self, records):
+        return self.client.post(reverse('attendance-bulk'), {'records': records}, content_type='application/json')
+
+    def rollup(self):
+        return sorted(AttendanceRollup.objects.exclude(count=0).values_list('date', 'status', 'count', 'hours_worked'))
+
+    def test_creates_and_updates(self):
+        response = self.mark([
+            {'employee_id': 'EMP1', 'date': '2025-03-10', 'status': 'Late'},
+            {'employee_id': 'EMP2', 'date': '2025-03-10', 'status': 'Present', 'hours_worked': '7.50'},
+        ])
+        self.assertEqual(response.status_code, 200)
+        body = response.json()
+        self.assertEqual((body['created_count'], body['updated_count'], body['total_count']), (1, 1, 2))
+        self.assertEqual([item['result'] for item in body['results']], ['updated', 'created'])
+
+        # An update only changes the fields that were sent
+        updated = Attendance.objects.get(employee_id='EMP1', date=date(2025, 3, 10))
+        self.assertEqual((updated.status, updated.hours_worked, updated.notes), ('Late', Decimal('8.00'), 'on site'))
+        self.assertEqual(Attendance.objects.count(), 2)
+
+    def test_rollup_is_rebuilt_for_the_dates_written(self):
+        self.mark([
+            {'employee_id': 'EMP1', 'date': '2025-03-10', 'status': 'Absent', 'hours_worked': None},
+            {'employee_id': 'EMP2', 'date': '2025-03-11', 'status': 'Present', 'hours_worked': '7.50'},
+        ])
+        self.assertEqual(self.rollup(), [
+            (date(2025, 3, 10), 'Absent', 1, Decimal('0.00')),
+            (date(2025, 3, 11), 'Present', 1, Decimal('7.50')),
+        ])
+        incremental = self.rollup()
+        rebuild_rollup()
+        self.assertEqual(self.rollup(), incremental)
+
+    def test_later_items_supersede_earlier_ones(self):
+        response = self.mark([
+            {'employee_id': 'EMP2', 'date': '2025-03-10', 'status': 'Present'},
+            {'employee_id': 'EMP2', 'date': '2025-03-10', 'status': 'Late'},
+        ])
+        results = response.json()['results']
+        self.assertEqual([item['result'] for item in results], ['skipped', 'created'])
+        self.assertEqual(Attendance.objects.get(employee_id='EMP2').status, 'Late')
+
+    def test_item_errors(self):
+        response = self.mark([
+            {'employee_id': 'NOPE', 'date': '2025-03-10', 'status': 'Present'},
+            {'employee_id': 'EMP2', 'date': '2025-03-10', 'status': 'Sleeping'},
+            {'employee_id': 'EMP2', 'date': '2025-03-11', 'status': 'Present'},
+        ])
+        self.assertEqual(response.status_code, 200)
+        results = response.json()['results']
+        self.assertEqual([item['result'] for item in results], ['error', 'error', 'created'])
+        self.assertEqual(results[0]['errors'], {'employee_id': ['Employee not found']})
+        self.assertEqual(list(results[1]['errors']), ['status'])
+        self.assertIsInstance(results[1]['errors']['status'], list)
+        self.assertEqual(response.json()['created_count'], 1)
+
+    def test_request_shape(self):
+        response = self.client.post(reverse('attendance-bulk'), {'records': 'EMP1'}, content_type='application/json')
+        self.assertEqual(response.status_code, 400)
+
+        records = [
+            {'employee_id': 'EMP1', 'date': '2025-03-10', 'status': 'Present'}
+        ] * (MAX_BULK_ATTENDANCE_RECORDS + 1)
+        with self.assertNumQueries(0):
+            response = self.mark(records)
+        self.assertEqual(response.status_code, 400)
+        self.assertEqual(self.mark(records[:MAX_BULK_ATTENDANCE_RECORDS]).status_code, 200)
@@ -0,0 +1,102 @@
+from datetime import date
+from decimal import Decimal
+from unittest import mock
+
+from django.db import connection
+from django.test import TestCase
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+
+from hrms import views
+from hrms.models import Employee
+
+
+def row(number, **overrides):
+    return dict({
+        'employee_id': f'NEW{number}', 'full_name': f'New Hire {number}', 'email': f'new{number}@example.com',
+        'department': 'Engineering', 'position': 'Staff', 'hire_date': '2025-01-01', 'salary': '1000.00',
+    }, **overrides)
+
+
+class BulkImportEmployeesTests(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        Employee.objects.create(
+            employee_id='OLD1', full_name='Old Hand', email='old1@example.com', department='Engineering',
+            position='Staff', hire_date=date(2020, 1, 1), salary=Decimal('1000.00'),
+        )
+
+    def import_rows(self, rows, mode=None):
+        payload = {'employees': rows}
+        if mode:
+            payload['mode'] = mode
+        response = self.client.post(reverse('bulk-import-employees'), payload, content_type='application/json')
+        self.assertEqual(response.status_code, 200)
+        return response.json()
+
+    def mixed_rows(self):
+        return [
+            row(1),
+            row(2, email='not-an-email'),
+            row(3, employee_id='OLD1'),
+            row(4, email='new1@example.com'),
+            row(5),
+        ]
+
+    def test_partial_saves_valid_rows_and_reports_the_rest(self):
+        body = self.import_rows(self.mixed_rows())
+        self.assertEqual((body['created_count'], body['total_count']), (2, 5))
+        errors = {error['row']: error for error in body['errors']}
+        self.assertEqual(sorted(errors), [1, 2, 3])
+        self.assertEqual(list(errors[1]['errors']), ['email'])
+        self.assertEqual(errors[2]['errors'], {'employee_id': ['Employee ID already exists']})
+        self.assertEqual(errors[3]['errors'], {'email': ['Email appears more than once in this import']})
+        # Every error maps fields to lists of messages
+        for error in body['errors']:
+            for messages in error['errors'].values():
+                self.assertIsInstance(messages, list)
+        self.assertEqual(set(Employee.objects.values_list('employee_id', flat=True)), {'OLD1', 'NEW1', 'NEW5'})
+
+    def test_all_or_nothing_saves_nothing_on_any_error(self):
+        body = self.import_rows(self.mixed_rows(), mode='all_or_nothing')
+        self.assertEqual(body['created_count'], 0)
+        self.assertEqual(len(body['errors']), 3)
+        self.assertEqual(Employee.objects.count(), 1)
+
+        body = self.import_rows([row(1), row(5)], mode='all_or_nothing')
+        self.assertEqual((body['created_count'], body['errors']), (2, []))
+        self.assertEqual(Employee.objects.count(), 3)
+
+    def test_conflicts_are_found_past_the_first_lookup_chunk(self):
+        rows = [row(number) for number in range(views.IMPORT_LOOKUP_CHUNK * 2)]
+        rows[-1] = row(len(rows), email='old1@example.com')
+        with CaptureQueriesContext(connection) as queries:
+            body = self.import_rows(rows)
+        self.assertEqual(body['created_count'], len(rows) - 1)
+        self.assertEqual(body['errors'][0]['row'], len(rows) - 1)
+        self.assertEqual(body['errors'][0]['errors'], {'email': ['Email already exists']})
+        lookups = [query for query in queries.captured_queries if query['sql'].startswith('SELECT')]
+        self.assertEqual(len(lookups), 2)
+
+    def test_partial_retries_a_conflicting_batch_row_by_row(self):
+        # The batch lookup misses OLD1, as if it were inserted concurrently
+        real_lookup = views._existing_employee_keys
+        calls = []
+
+        def lookup(employee_ids, emails):
+            calls.append(1)
+            return (set(), set()) if len(calls) == 1 else real_lookup(employee_ids, emails)
+
+        with mock.patch('hrms.views._existing_employee_keys', side_effect=lookup):
+            body = self.import_rows([row(1), row(2, employee_id='OLD1'), row(3)])
+        self.assertEqual(body['created_count'], 2)
+        self.assertEqual(body['errors'], [
+            {'row': 1, 'employee_id': 'OLD1', 'errors': {'employee_id': ['Employee ID already exists']}}
+        ])
+        self.assertEqual(set(Employee.objects.values_list('employee_id', flat=True)), {'OLD1', 'NEW1', 'NEW3'})
+
+    def test_employees_must_be_a_list(self):
+        response = self.client.post(
+            reverse('bulk-import-employees'), {'employees': {'employee_id': 'X'}}, content_type='application/json'
+        )
+        self.assertEqual(response.status_code, 400)
@@ -0,0 +1,126 @@
+from datetime import date
+from decimal import Decimal
+
+from django.test import TestCase
+from django.urls import reverse
+
+from hrms.balances import rebuild_balances
+from hrms.models import Employee, LeaveBalance, LeaveRequest, LeaveType
+
+
+class LeaveBalanceLedgerTests(TestCase):
+    """The ledger follows every leave request change and matches a rebuild from scratch."""
+
+    @classmethod
+    def setUpTestData(cls):
+        for employee_id in ('EMP1', 'EMP2'):
+            Employee.objects.create(
+                employee_id=employee_id, full_name=f'Employee {employee_id}', email=f'{employee_id.lower()}@example.com',
+                department='Engineering', position='Staff', hire_date=date(2024, 1, 1), salary=Decimal('1000.00'),
+            )
+        cls.annual = LeaveType.objects.create(name='Annual', days_allowed=20)
+        cls.sick = LeaveType.objects.create(name='Sick', days_allowed=10)
+
+    def request_leave(self, start, end, days, employee_id='EMP1', leave_type=None):
+        response = self.client.post(reverse('leave-request-list-create'), {
+            'employee_id': employee_id, 'leave_type': (leave_type or self.annual).pk,
+            'start_date': start, 'end_date': end, 'days_requested': days, 'reason': 'Holiday',
+        }, content_type='application/json')
+        self.assertEqual(response.status_code, 201, response.content)
+        return response.json()['id']
+
+    def update(self, pk, **changes):
+        response = self.client.patch(
+            reverse('leave-request-detail', args=[pk]), changes, content_type='application/json'
+        )
+        self.assertEqual(response.status_code, 200, response.content)
+
+    def balance(self, year=2025, leave_type=None, employee_id='EMP1'):
+        row = LeaveBalance.objects.filter(
+            employee_id=employee_id, leave_type=leave_type or self.annual, year=year
+        ).values_list('days_used', 'days_pending').first()
+        return row or (0, 0)
+
+    def ledger(self):
+        return sorted(
+            LeaveBalance.objects.exclude(days_used=0, days_pending=0).values_list(
+                'employee_id', 'leave_type_id', 'year', 'days_used', 'days_pending'
+            )
+        )
+
+    def assertMatchesRebuild(self):
+        incremental = self.ledger()
+        rebuild_balances()
+        self.assertEqual(self.ledger(), incremental)
+
+    def test_pending_approved_rejected(self):
+        pk = self.request_leave('2025-03-10', '2025-03-12', 3)
+        self.assertEqual(self.balance(), (0, 3))
+        self.update(pk, status='Approved')
+        self.assertEqual(self.balance(), (3, 0))
+        self.update(pk, status='Rejected')
+        self.assertEqual(self.balance(), (0, 0))
+        # Back to Pending from Rejected holds the days again
+        self.update(pk, status='Pending')
+        self.assertEqual(self.balance(), (0, 3))
+        self.assertMatchesRebuild()
+
+    def test_days_requested_edit(self):
+        pk = self.request_leave('2025-03-10', '2025-03-12', 3)
+        self.update(pk, status='Approved')
+        self.update(pk, days_requested=5, end_date='2025-03-14')
+        self.assertEqual(self.balance(), (5, 0))
+        self.assertMatchesRebuild()
+
+    def test_moving_to_another_year_or_leave_type(self):
+        pk = self.request_leave('2025-12-29', '2025-12-31', 3)
+        self.update(pk, start_date='2026-01-05', end_date='2026-01-07')
+        self.assertEqual((self.balance(2025), self.balance(2026)), ((0, 0), (0, 3)))
+        self.update(pk, leave_type=self.sick.pk)
+        self.assertEqual((self.balance(2026), self.balance(2026, self.sick)), ((0, 0), (0, 3)))
+        self.assertMatchesRebuild()
+
+    def test_delete(self):
+        approved = self.request_leave('2025-03-10', '2025-03-12', 3)
+        self.update(approved, status='Approved')
+        pending = self.request_leave('2025-04-01', '2025-04-01', 1)
+        self.assertEqual(self.balance(), (3, 1))
+        response = self.client.delete(reverse('leave-request-detail', args=[approved]))
+        self.assertEqual(response.status_code, 204)
+        self.assertEqual(self.balance(), (0, 1))
+        LeaveRequest.objects.get(pk=pending).delete()
+        self.assertEqual(self.balance(), (0, 0))
+        self.assertMatchesRebuild()
+
+    def test_rebuild_matches_incremental_ledger(self):
+        first = self.request_leave('2025-01-06', '2025-01-10', 5)
+        self.request_leave('2025-02-03', '2025-02-04', 2, leave_type=self.sick)
+        self.request_leave('2025-03-03', '2025-03-03', 1, employee_id='EMP2')
+        cancelled = self.request_leave('2025-05-05', '2025-05-06', 2, employee_id='EMP2')
+        self.update(first, status='Approved')
+        self.update(cancelled, status='Cancelled')
+        self.assertEqual(self.ledger(), [
+            ('EMP1', self.annual.pk, 2025, 5, 0),
+            ('EMP1', self.sick.pk, 2025, 0, 2),
+            ('EMP2', self.annual.pk, 2025, 0, 1),
+        ])
+        self.assertMatchesRebuild()
+
+        # A ledger that drifted is put right for the employees asked for only
+        LeaveBalance.objects.update(days_used=99)
+        rebuild_balances(employee_ids=['EMP1'])
+        self.assertEqual(self.balance(), (5, 0))
+        self.assertEqual(self.balance(employee_id='EMP2'), (99, 1))
+
+    def test_balances_endpoint(self):
+        pk = self.request_leave('2025-03-10', '2025-03-12', 3)
+        self.update(pk, status='Approved')
+        response = self.client.get(reverse('leave-balances'), {'employee_id': 'EMP1', 'year': 2025})
+        self.assertEqual(response.status_code, 200)
+        [employee] = response.json()['results']
+        annual, sick = employee['balances']
+        self.assertEqual(
+            (annual['leave_type_name'], annual['days_used'], annual['days_pending'], annual['days_remaining']),
+            ('Annual', 3, 0, 17),
+        )
+        self.assertEqual((sick['days_used'], sick['days_remaining']), (0, 10))
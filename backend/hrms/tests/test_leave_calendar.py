@@ -0,0 +1,139 @@
+from datetime import date, timedelta
+from decimal import Decimal
+
+from django.test import SimpleTestCase, TestCase
+from django.urls import reverse
+
+from hrms.leave_calendar import MAX_CALENDAR_DAYS, LeaveCalendar
+from hrms.models import Employee, LeaveType
+
+
+class LeaveOverlapTests(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        for employee_id in ('EMP1', 'EMP2'):
+            Employee.objects.create(
+                employee_id=employee_id, full_name=f'Employee {employee_id}', email=f'{employee_id.lower()}@example.com',
+                department='Engineering', position='Staff', hire_date=date(2024, 1, 1), salary=Decimal('1000.00'),
+            )
+        cls.annual = LeaveType.objects.create(name='Annual', days_allowed=20)
+
+    def request_leave(self, start, end, employee_id='EMP1', **extra):
+        return self.client.post(reverse('leave-request-list-create'), dict({
+            'employee_id': employee_id, 'leave_type': self.annual.pk, 'start_date': start, 'end_date': end,
+            'days_requested': (date.fromisoformat(end) - date.fromisoformat(start)).days + 1, 'reason': 'Holiday',
+        }, **extra), content_type='application/json')
+
+    def update(self, pk, **changes):
+        return self.client.patch(reverse('leave-request-detail', args=[pk]), changes, content_type='application/json')
+
+    def test_overlapping_create_is_rejected(self):
+        first = self.request_leave('2025-03-10', '2025-03-14').json()['id']
+        # Sharing only the last day still overlaps; both ends are inclusive
+        response = self.request_leave('2025-03-14', '2025-03-18')
+        self.assertEqual(response.status_code, 400)
+        self.assertIn(f'Overlaps leave request {first}', response.json()['non_field_errors'][0])
+
+        # The day after, another employee, or a request that doesn't hold
+        # its dates are all fine
+        self.assertEqual(self.request_leave('2025-03-15', '2025-03-18').status_code, 201)
+        self.assertEqual(self.request_leave('2025-03-10', '2025-03-14', employee_id='EMP2').status_code, 201)
+        self.assertEqual(self.request_leave('2025-03-12', '2025-03-12', status='Rejected').status_code, 201)
+
+    def test_update_does_not_overlap_itself(self):
+        pk = self.request_leave('2025-03-10', '2025-03-14').json()['id']
+        self.assertEqual(self.update(pk, end_date='2025-03-16', days_requested=7).status_code, 200)
+        self.assertEqual(self.update(pk, status='Approved').status_code, 200)
+
+    def test_update_into_another_request_is_rejected(self):
+        self.request_leave('2025-03-10', '2025-03-14')
+        pk = self.request_leave('2025-03-20', '2025-03-21').json()['id']
+        self.assertEqual(self.update(pk, start_date='2025-03-13').status_code, 400)
+
+        # Freed dates can be taken again, and rejected requests can't be
+        # re-opened on top of them
+        other = self.request_leave('2025-04-01', '2025-04-02').json()['id']
+        self.assertEqual(self.update(other, status='Rejected').status_code, 200)
+        self.assertEqual(self.request_leave('2025-04-02', '2025-04-03').status_code, 201)
+        self.assertEqual(self.update(other, status='Pending').status_code, 400)
+
+    def test_start_after_end_is_rejected(self):
+        response = self.request_leave('2025-03-14', '2025-03-10')
+        self.assertEqual(response.status_code, 400)
+        self.assertEqual(response.json(), {'non_field_errors': ['start_date must not be after end_date']})
+
+        pk = self.request_leave('2025-03-10', '2025-03-14').json()['id']
+        self.assertEqual(self.update(pk, start_date='2025-03-20').status_code, 400)
+
+    def test_calendar_endpoint(self):
+        self.request_leave('2025-02-27', '2025-03-02')
+        self.request_leave('2025-03-02', '2025-03-05', employee_id='EMP2', status='Approved')
+        response = self.client.get(reverse('leave-calendar'), {'start': '2025-03-01', 'end': '2025-03-03'})
+        self.assertEqual(response.status_code, 200)
+        body = response.json()
+        self.assertEqual(body['days'], [
+            {'date': '2025-03-01', 'out': 0, 'pending': 1},
+            {'date': '2025-03-02', 'out': 1, 'pending': 1},
+            {'date': '2025-03-03', 'out': 1, 'pending': 0},
+        ])
+        self.assertEqual([employee['employee_id'] for employee in body['employees']], ['EMP1', 'EMP2'])
+        self.assertEqual(body['employees'][0]['leave'][0]['start_date'], '2025-02-27')
+
+        response = self.client.get(reverse('leave-calendar'), {'start': '2025-03-01', 'end': '2025-03-03', 'status': 'Approved'})
+        self.assertEqual([employee['employee_id'] for employee in response.json()['employees']], ['EMP2'])
+
+    def test_calendar_window_is_validated(self):
+        url = reverse('leave-calendar')
+        self.assertEqual(self.client.get(url, {'start': '2025-03-03', 'end': '2025-03-01'}).status_code, 400)
+        end = date(2025, 1, 1) + timedelta(days=MAX_CALENDAR_DAYS)
+        self.assertEqual(self.client.get(url, {'start': '2025-01-01', 'end': end.isoformat()}).status_code, 400)
+
+
+class LeaveCalendarTests(SimpleTestCase):
+    START = date(2025, 3, 1)
+    END = date(2025, 3, 5)
+
+    def calendar(self, *intervals):
+        rows = [
+            (number, f'EMP{number}', f'Employee {number}', 'Engineering', 'Annual', start, end, status)
+            for number, (start, end, status) in enumerate(intervals)
+        ]
+        return LeaveCalendar(self.START, self.END, rows)
+
+    def counts(self, calendar, key='out'):
+        return [day[key] for day in calendar.daily_counts()]
+
+    def test_intervals_are_clipped_to_the_window(self):
+        calendar = self.calendar(
+            (date(2025, 2, 1), date(2025, 3, 1), 'Approved'),   # ends on the first day
+            (date(2025, 3, 5), date(2025, 4, 1), 'Approved'),   # starts on the last day
+            (date(2025, 2, 1), date(2025, 4, 1), 'Approved'),   # covers the whole window
+            (date(2025, 3, 2), date(2025, 3, 3), 'Pending'),
+        )
+        self.assertEqual(self.counts(calendar), [2, 1, 1, 1, 2])
+        self.assertEqual(self.counts(calendar, 'pending'), [0, 1, 1, 0, 0])
+        self.assertEqual(
+            [day['date'] for day in calendar.daily_counts()],
+            ['2025-03-01', '2025-03-02', '2025-03-03', '2025-03-04', '2025-03-05'],
+        )
+
+    def test_single_day_window(self):
+        calendar = LeaveCalendar(self.START, self.START, [
+            (1, 'EMP1', 'Employee 1', 'Engineering', 'Annual', date(2025, 2, 1), date(2025, 4, 1), 'Approved'),
+        ])
+        self.assertEqual(calendar.daily_counts(), [{'date': '2025-03-01', 'out': 1, 'pending': 0}])
+
+    def test_inactive_statuses_are_ignored(self):
+        calendar = self.calendar((self.START, self.END, 'Rejected'), (self.START, self.END, 'Cancelled'))
+        self.assertEqual(self.counts(calendar), [0] * 5)
+        self.assertEqual(self.counts(calendar, 'pending'), [0] * 5)
+
+    def test_by_employee_groups_in_order_of_first_leave(self):
+        calendar = LeaveCalendar(self.START, self.END, [
+            (1, 'EMP2', 'Employee 2', 'Sales', 'Annual', date(2025, 3, 1), date(2025, 3, 1), 'Approved'),
+            (2, 'EMP1', 'Employee 1', 'Engineering', 'Sick', date(2025, 3, 2), date(2025, 3, 2), 'Pending'),
+            (3, 'EMP2', 'Employee 2', 'Sales', 'Annual', date(2025, 3, 4), date(2025, 3, 5), 'Approved'),
+        ])
+        employees = calendar.by_employee()
+        self.assertEqual([employee['employee_id'] for employee in employees], ['EMP2', 'EMP1'])
+        self.assertEqual([leave['id'] for leave in employees[0]['leave']], [1, 3])
@@ -0,0 +1,90 @@
+from datetime import date
+from decimal import Decimal
+
+from django.db import connection
+from django.test import TestCase
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+
+from hrms.leave_decisions import MAX_DECISION_IDS
+from hrms.models import Employee, LeaveBalance, LeaveRequest, LeaveType, Notification
+
+
+class BulkLeaveDecisionTests(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        for employee_id in ('EMP1', 'EMP2'):
+            Employee.objects.create(
+                employee_id=employee_id, full_name=f'Employee {employee_id}', email=f'{employee_id.lower()}@example.com',
+                department='Engineering', position='Staff', hire_date=date(2024, 1, 1), salary=Decimal('1000.00'),
+            )
+        annual = LeaveType.objects.create(name='Annual', days_allowed=20)
+
+        def leave(employee_id, month, days, status='Pending'):
+            return LeaveRequest.objects.create(
+                employee_id=employee_id, leave_type=annual, start_date=date(2025, month, 1),
+                end_date=date(2025, month, days), days_requested=days, reason='Holiday', status=status,
+            ).pk
+
+        cls.pending = [leave('EMP1', 3, 2), leave('EMP2', 3, 3), leave('EMP1', 4, 1)]
+        cls.approved = leave('EMP2', 5, 4, status='Approved')
+
+    def decide(self, ids, status='Approved'):
+        return self.client.post(reverse('leave-request-bulk-decision'), {
+            'ids': ids, 'status': status, 'approved_by': 'MGR1', 'comments': 'Enjoy',
+        }, content_type='application/json')
+
+    def balance(self, employee_id):
+        return LeaveBalance.objects.filter(employee_id=employee_id, year=2025).values_list(
+            'days_used', 'days_pending'
+        ).get()
+
+    def test_one_update_and_one_notification_insert(self):
+        missing = max(self.pending + [self.approved]) + 100
+        with CaptureQueriesContext(connection) as queries:
+            response = self.decide(self.pending + [self.approved, missing, self.pending[0]])
+        self.assertEqual(response.status_code, 200)
+        body = response.json()
+        self.assertEqual(body['decided'], self.pending)
+        self.assertEqual(body['decided_count'], 3)
+        self.assertEqual(body['skipped'], [{'id': self.approved, 'status': 'Approved'}])
+        self.assertEqual(body['not_found'], [missing])
+
+        statements = [query['sql'] for query in queries.captured_queries]
+        self.assertEqual(len([sql for sql in statements if sql.startswith('UPDATE "hrms_leaverequest"')]), 1)
+        self.assertEqual(len([sql for sql in statements if sql.startswith('INSERT INTO "hrms_notification"')]), 1)
+
+        self.assertEqual(
+            set(LeaveRequest.objects.filter(pk__in=self.pending).values_list('status', 'approved_by')),
+            {('Approved', 'MGR1')},
+        )
+        # Requests that were not Pending are left alone
+        self.assertIsNone(LeaveRequest.objects.get(pk=self.approved).approved_by)
+
+    def test_notifications_and_counters(self):
+        self.decide(self.pending, status='Rejected')
+        self.assertEqual(Notification.objects.filter(employee_id='EMP1').count(), 2)
+        notification = Notification.objects.get(employee_id='EMP2')
+        self.assertEqual(notification.title, 'Leave request rejected')
+        self.assertIn('(3 days) was rejected by MGR1. Comments: Enjoy', notification.message)
+
+        response = self.client.get(reverse('notification-unread-count'), {'employee_id': 'EMP1'})
+        self.assertEqual(response.json()['unread'], 2)
+        self.assertEqual(response.json()['last_id'], Notification.objects.filter(employee_id='EMP1').latest('id').id)
+
+    def test_balances_are_rebuilt(self):
+        self.assertEqual((self.balance('EMP1'), self.balance('EMP2')), ((0, 3), (4, 3)))
+        self.decide(self.pending[:2])
+        self.assertEqual((self.balance('EMP1'), self.balance('EMP2')), ((2, 1), (7, 0)))
+        self.decide(self.pending[2:], status='Rejected')
+        self.assertEqual(self.balance('EMP1'), (2, 0))
+
+    def test_id_cap(self):
+        with self.assertNumQueries(0):
+            response = self.decide(list(range(1, MAX_DECISION_IDS + 2)))
+        self.assertEqual(response.status_code, 400)
+        self.assertIn('ids', response.json())
+
+        response = self.decide(list(range(1, MAX_DECISION_IDS + 1)))
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.json()['decided_count'], 3)
@@ -0,0 +1,61 @@
+from datetime import date
+from decimal import Decimal
+
+from django.test import TestCase
+from django.urls import reverse
+
+from hrms.models import Employee, Notification
+
+
+class NotificationTests(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        for employee_id in ('EMP1', 'EMP2'):
+            Employee.objects.create(
+                employee_id=employee_id, full_name=f'Employee {employee_id}', email=f'{employee_id.lower()}@example.com',
+                department='Engineering', position='Staff', hire_date=date(2024, 1, 1), salary=Decimal('1000.00'),
+            )
+            for number in range(3):
+                Notification.objects.create(employee_id=employee_id, title=f'Notice {number}', message='m')
+
+    def unread(self, employee_id):
+        response = self.client.get(reverse('notification-unread-count'), {'employee_id': employee_id})
+        self.assertEqual(response.status_code, 200)
+        return response.json()['unread']
+
+    def test_list_without_employee_returns_everyone(self):
+        with self.assertNumQueries(1):
+            response = self.client.get(reverse('notification-list'))
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(len(response.json()['results']), 6)
+
+    def test_list_for_one_employee(self):
+        with self.assertNumQueries(1):
+            response = self.client.get(reverse('notification-list'), {'employee_id': 'EMP1', 'unread': 'true'})
+        results = response.json()['results']
+        self.assertEqual(len(results), 3)
+        self.assertEqual({item['employee_name'] for item in results}, {'Employee EMP1'})
+
+    def test_counter_follows_creates_and_mark_read(self):
+        self.assertEqual(self.unread('EMP1'), 3)
+        first = Notification.objects.filter(employee_id='EMP1').order_by('id').first()
+        response = self.client.post(
+            reverse('notification-mark-read'), {'employee_id': 'EMP1', 'ids': [first.id]},
+            content_type='application/json',
+        )
+        self.assertEqual(response.json(), {'marked': 1, 'unread': 2})
+
+        # Marking the same one again changes nothing
+        response = self.client.post(
+            reverse('notification-mark-read'), {'employee_id': 'EMP1', 'ids': [first.id]},
+            content_type='application/json',
+        )
+        self.assertEqual(response.json(), {'marked': 0, 'unread': 2})
+
+        Notification.objects.create(employee_id='EMP1', title='New', message='m')
+        self.assertEqual(self.unread('EMP1'), 3)
+        response = self.client.post(
+            reverse('notification-mark-read'), {'employee_id': 'EMP1'}, content_type='application/json',
+        )
+        self.assertEqual(response.json(), {'marked': 3, 'unread': 0})
+        self.assertEqual(self.unread('EMP2'), 3)
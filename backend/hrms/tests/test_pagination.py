@@ -0,0 +1,98 @@
+from datetime import date
+from decimal import Decimal
+
+from django.test import TestCase
+from django.urls import reverse
+
+from hrms.models import Attendance, Employee
+
+# Three share a hire date and two have none, so pages split ties and NULLs
+HIRE_DATES = [
+    date(2024, 1, 1), date(2024, 1, 1), None, date(2023, 5, 1), None, date(2024, 1, 1), date(2022, 1, 1),
+]
+
+
+class KeysetPaginationTests(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        for number, hire_date in enumerate(HIRE_DATES):
+            Employee.objects.create(
+                employee_id=f'EMP{number}', full_name=f'Employee {number}', email=f'emp{number}@example.com',
+                department='Engineering', position='Staff', hire_date=hire_date, salary=Decimal('1000.00'),
+            )
+
+    def expected(self, descending):
+        # NULLs last in both directions, then the primary key in the
+        # direction of the last ordering column
+        employees = list(Employee.objects.values_list('employee_id', 'hire_date', 'id'))
+        dated = sorted((row for row in employees if row[1]), key=lambda row: (row[1], row[2]), reverse=descending)
+        undated = sorted((row for row in employees if not row[1]), key=lambda row: row[2], reverse=descending)
+        return [row[0] for row in dated + undated]
+
+    def get(self, url, params=None):
+        response = self.client.get(url, params)
+        self.assertEqual(response.status_code, 200)
+        return response.json()
+
+    def walk(self, ordering):
+        """Follow next links to the end, then previous links back to the start."""
+        page = self.get(reverse('employee-list-create'), {'ordering': ordering, 'page_size': 2})
+        self.assertIsNone(page['previous'])
+        forward = [[item['employee_id'] for item in page['results']]]
+        while page['next']:
+            page = self.get(page['next'])
+            forward.append([item['employee_id'] for item in page['results']])
+
+        backward = [forward[-1]]
+        while page['previous']:
+            page = self.get(page['previous'])
+            backward.append([item['employee_id'] for item in page['results']])
+        return forward, backward
+
+    def test_ascending_with_ties_and_nulls(self):
+        forward, backward = self.walk('hire_date')
+        self.assertEqual([len(page) for page in forward], [2, 2, 2, 1])
+        self.assertEqual(sum(forward, []), self.expected(descending=False))
+        self.assertEqual(backward, forward[::-1])
+
+    def test_descending_with_ties_and_nulls(self):
+        forward, backward = self.walk('-hire_date')
+        self.assertEqual(sum(forward, []), self.expected(descending=True))
+        self.assertEqual(backward, forward[::-1])
+
+    def test_unique_ordering(self):
+        forward, backward = self.walk('employee_id')
+        self.assertEqual(sum(forward, []), [f'EMP{number}' for number in range(len(HIRE_DATES))])
+        self.assertEqual(backward, forward[::-1])
+
+    def test_cursor_keeps_page_size_and_filters(self):
+        page = self.get(reverse('employee-list-create'), {'ordering': 'hire_date', 'page_size': 3, 'status': 'Active'})
+        page = self.get(page['next'])
+        self.assertEqual(len(page['results']), 3)
+        self.assertIn('status=Active', page['next'])
+
+    def test_invalid_cursor_is_404(self):
+        url = reverse('employee-list-create')
+        # Not base64 JSON, too few values, and a value that is not a date
+        for cursor in ('not-a-cursor', 'eyJwIjpbMV19', 'eyJwIjpbIm5vcGUiLDFdfQ'):
+            response = self.client.get(url, {'cursor': cursor, 'ordering': 'hire_date'})
+            self.assertEqual(response.status_code, 404, cursor)
+            self.assertEqual(response.json(), {'detail': 'Invalid cursor'})
+
+    def test_ordering_through_a_relation(self):
+        # (-date, employee__employee_id) is unique through unique_together,
+        # so no primary key is appended
+        for number in range(3):
+            for day in (1, 2):
+                Attendance.objects.create(employee_id=f'EMP{number}', date=date(2025, 3, day), status='Present')
+        page = self.get(reverse('attendance-list-create'), {'page_size': 4})
+        rows = [(item['date'], item['employee_id']) for item in page['results']]
+        page = self.get(page['next'])
+        rows += [(item['date'], item['employee_id']) for item in page['results']]
+        self.assertIsNone(page['next'])
+        self.assertEqual(rows, [
+            ('2025-03-02', 'EMP0'), ('2025-03-02', 'EMP1'), ('2025-03-02', 'EMP2'),
+            ('2025-03-01', 'EMP0'), ('2025-03-01', 'EMP1'), ('2025-03-01', 'EMP2'),
+        ])
+        previous = self.get(page['previous'])
+        self.assertEqual([(item['date'], item['employee_id']) for item in previous['results']], rows[:4])
@@ -0,0 +1,87 @@
+from datetime import date, timedelta
+from decimal import Decimal
+
+from django.test import TestCase
+from django.urls import reverse
+
+from hrms.models import Attendance, Employee, Payroll
+from hrms.payroll import MAX_OVERTIME_HOURS
+
+
+class PayrollRunTests(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        for employee_id, status, salary in (
+            ('EMP1', 'Active', Decimal('52000.00')),
+            ('EMP2', 'Active', Decimal('104000.00')),
+            ('EMP3', 'Inactive', Decimal('52000.00')),
+            ('EMP4', 'Active', None),
+        ):
+            Employee.objects.create(
+                employee_id=employee_id, full_name=f'Employee {employee_id}', email=f'{employee_id.lower()}@example.com',
+                department='Engineering', position='Staff', hire_date=date(2024, 1, 1), salary=salary, status=status,
+            )
+        # Two hours of overtime for EMP1 in March
+        Attendance.objects.create(employee_id='EMP1', date=date(2025, 3, 3), status='Present', hours_worked=Decimal('10.00'))
+        Attendance.objects.create(employee_id='EMP1', date=date(2025, 3, 4), status='Present', hours_worked=Decimal('7.00'))
+
+    def run_payroll(self, start='2025-03-01', end='2025-03-31', **options):
+        response = self.client.post(reverse('payroll-run'), dict({
+            'pay_period_start': start, 'pay_period_end': end,
+        }, **options), content_type='application/json')
+        self.assertEqual(response.status_code, 200, response.content)
+        return response.json()
+
+    def payroll(self, employee_id):
+        return Payroll.objects.get(employee_id=employee_id, pay_period_start=date(2025, 3, 1))
+
+    def test_drafts_for_active_salaried_employees(self):
+        summary = self.run_payroll()
+        self.assertEqual((summary['employees'], summary['created'], summary['updated'], summary['skipped']), (2, 2, 0, 0))
+        self.assertEqual(summary['overtime_capped'], [])
+        self.assertEqual(set(Payroll.objects.values_list('employee_id', 'status')), {('EMP1', 'Draft'), ('EMP2', 'Draft')})
+
+        payroll = self.payroll('EMP1')
+        # A month is a twelfth of the salary; overtime is paid at 1.5x the
+        # hourly rate of salary / 2080
+        self.assertEqual(payroll.basic_salary, Decimal('4333.33'))
+        self.assertEqual((payroll.overtime_hours, payroll.overtime_rate), (Decimal('2.00'), Decimal('37.50')))
+        self.assertEqual(payroll.net_salary, Decimal('4408.33'))
+
+    def test_rerun_keeps_bonuses_and_skips_non_draft_rows(self):
+        self.run_payroll()
+        Payroll.objects.filter(employee_id='EMP1').update(bonuses=Decimal('100.00'), deductions=Decimal('8.33'))
+        Payroll.objects.filter(employee_id='EMP2').update(status='Processed', net_salary=Decimal('1.00'))
+        Attendance.objects.create(employee_id='EMP1', date=date(2025, 3, 5), status='Present', hours_worked=Decimal('9.00'))
+
+        summary = self.run_payroll(tax_rate='0.1')
+        self.assertEqual((summary['created'], summary['updated'], summary['skipped']), (0, 1, 1))
+
+        payroll = self.payroll('EMP1')
+        self.assertEqual((payroll.bonuses, payroll.deductions), (Decimal('100.00'), Decimal('8.33')))
+        self.assertEqual(payroll.overtime_hours, Decimal('3.00'))
+        # (4333.33 + 3 * 37.50) * 0.9 + 100 - 8.33
+        self.assertEqual(payroll.tax_deduction, Decimal('444.58'))
+        self.assertEqual(payroll.net_salary, Decimal('4092.92'))
+
+        processed = self.payroll('EMP2')
+        self.assertEqual((processed.status, processed.net_salary), ('Processed', Decimal('1.00')))
+
+    def test_overtime_from_bad_hours_is_capped(self):
+        # A day counts at most 16 hours of overtime, however many are recorded
+        Attendance.objects.filter(employee_id='EMP1', date=date(2025, 3, 3)).update(hours_worked=Decimal('99.99'))
+        self.run_payroll()
+        self.assertEqual(self.payroll('EMP1').overtime_hours, Decimal('16.00'))
+
+        # A period's total at most what overtime_hours can hold
+        Attendance.objects.bulk_create([
+            Attendance(employee_id='EMP2', date=date(2025, 1, 1) + timedelta(days=offset), status='Present',
+                       hours_worked=Decimal('99.99'))
+            for offset in range(70)
+        ])
+        summary = self.run_payroll('2025-01-01', '2025-12-31')
+        self.assertEqual(summary['overtime_capped'], ['EMP2'])
+        self.assertEqual(
+            Payroll.objects.get(employee_id='EMP2', pay_period_start=date(2025, 1, 1)).overtime_hours,
+            MAX_OVERTIME_HOURS,
+        )
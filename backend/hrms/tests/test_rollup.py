@@ -0,0 +1,102 @@
+from datetime import date, timedelta
+from decimal import Decimal
+from unittest import mock
+
+from django.db import connection
+from django.test import TestCase
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+
+from hrms.models import Attendance, AttendanceRollup, Employee
+from hrms.rollup import rebuild_rollup
+
+STATUSES = ['Present', 'Late', 'Absent', 'Half Day']
+
+
+class RollupMaintenanceTests(TestCase):
+    """Employee changes re-file their attendance with a fixed number of statements."""
+
+    @classmethod
+    def setUpTestData(cls):
+        for employee_id, days in (('E1', 30), ('E2', 5)):
+            Employee.objects.create(
+                employee_id=employee_id, full_name=f'Employee {employee_id}', email=f'{employee_id.lower()}@example.com',
+                department='Engineering', position='Staff', hire_date=date(2024, 1, 1), salary=Decimal('1000.00'),
+            )
+            for offset in range(days):
+                status = STATUSES[offset % len(STATUSES)]
+                Attendance.objects.create(
+                    employee_id=employee_id, date=date(2025, 3, 1) + timedelta(days=offset), status=status,
+                    hours_worked=None if status == 'Absent' else Decimal('7.25'),
+                )
+
+    def rollup(self):
+        return sorted(
+            (row.date, row.department, row.active, row.status, row.count, row.hours_worked)
+            for row in AttendanceRollup.objects.exclude(count=0)
+        )
+
+    def assertMatchesRebuild(self):
+        incremental = self.rollup()
+        rebuild_rollup()
+        self.assertEqual(incremental, self.rollup())
+
+    def request(self, method, employee_id, payload=None):
+        with CaptureQueriesContext(connection) as queries:
+            response = getattr(self.client, method)(
+                reverse('employee-detail', args=[employee_id]), payload, content_type='application/json'
+            )
+        self.assertEqual(response.status_code, 200)
+        rollup = [query['sql'] for query in queries.captured_queries if 'hrms_attendancerollup' in query['sql']]
+        return len(queries.captured_queries), rollup
+
+    def test_department_change_moves_history_in_two_statements(self):
+        # 30 days of history cost the same as 5
+        long_history = self.request('patch', 'E1', {'department': 'Sales'})
+        short_history = self.request('patch', 'E2', {'department': 'Sales'})
+        self.assertEqual(long_history[0], short_history[0])
+        self.assertEqual(len(long_history[1]), 2)
+
+        self.assertEqual(sum(AttendanceRollup.objects.filter(department='Sales').values_list('count', flat=True)), 35)
+        self.assertFalse(AttendanceRollup.objects.filter(department='Engineering').exclude(count=0).exists())
+        self.assertMatchesRebuild()
+
+    def test_status_change_moves_history_out_of_active(self):
+        self.request('patch', 'E2', {'status': 'Inactive'})
+        self.assertEqual(sum(AttendanceRollup.objects.filter(active=False).values_list('count', flat=True)), 5)
+        self.assertMatchesRebuild()
+
+    def test_employee_delete_removes_history_in_one_statement(self):
+        long_history = self.request('delete', 'E1')
+        short_history = self.request('delete', 'E2')
+        self.assertEqual(long_history[0], short_history[0])
+        self.assertEqual(len(long_history[1]), 1)
+
+        self.assertFalse(Attendance.objects.exists())
+        self.assertFalse(AttendanceRollup.objects.exclude(count=0).exists())
+
+    def test_attendance_delete_outside_a_cascade_updates_its_bucket(self):
+        Attendance.objects.filter(employee_id='E2', date=date(2025, 3, 1)).get().delete()
+        self.assertMatchesRebuild()
+
+    def test_hours_assigned_as_a_string(self):
+        Attendance.objects.create(employee_id='E2', date=date(2025, 4, 1), status='Present', hours_worked='8.50')
+        self.assertEqual(
+            AttendanceRollup.objects.get(date=date(2025, 4, 1)).hours_worked, Decimal('8.50')
+        )
+        self.assertMatchesRebuild()
+
+    def test_employee_update_rolls_back_with_its_rollup_change(self):
+        with mock.patch('hrms.signals.move_employee', side_effect=RuntimeError), self.assertRaises(RuntimeError):
+            self.client.patch(
+                reverse('employee-detail', args=['E1']), {'department': 'Sales'}, content_type='application/json'
+            )
+        self.assertEqual(Employee.objects.get(employee_id='E1').department, 'Engineering')
+
+    def test_attendance_update_rolls_back_with_its_rollup_change(self):
+        with mock.patch('hrms.views.apply_rollup_change', side_effect=RuntimeError), self.assertRaises(RuntimeError):
+            self.client.post(
+                reverse('attendance-list-create'), {'employee_id': 'E1', 'date': '2025-03-01', 'status': 'Absent'},
+                content_type='application/json',
+            )
+        self.assertEqual(Attendance.objects.get(employee_id='E1', date=date(2025, 3, 1)).status, 'Present')
@@ -0,0 +1,95 @@
+from datetime import date
+from decimal import Decimal
+from unittest import mock
+
+from django.test import SimpleTestCase, TestCase
+from django.urls import reverse
+
+from hrms.models import Employee
+from hrms.search import edit_distance, install_search_index
+from hrms.suggest import suggest_index
+
+EMPLOYEES = [
+    ('EMP1', 'John Smith', 'Engineering'),
+    ('EMP2', 'Mike Ali', 'Sales'),
+    ('EMP3', 'Sarah Johnson', 'Marketing'),
+    ('EMP4', 'Tom Smith', 'HR'),
+    ('EMP5', 'Priya Patel', 'Engineering'),
+    ('EMP6', 'Carlos Garcia', 'Finance'),
+]
+
+
+class EditDistanceTests(SimpleTestCase):
+    def test_distances(self):
+        self.assertEqual(edit_distance('john', 'john', 2), 0)
+        self.assertEqual(edit_distance('jhon', 'john', 2), 1)
+        self.assertEqual(edit_distance('smth', 'smith', 2), 1)
+        self.assertEqual(edit_distance('kitten', 'sitting', 3), 3)
+
+    def test_stops_past_limit(self):
+        self.assertEqual(edit_distance('kitten', 'sitting', 1), 2)
+        self.assertEqual(edit_distance('a', 'abcdef', 2), 3)
+
+
+class EmployeeSearchTests(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        for number, (employee_id, full_name, department) in enumerate(EMPLOYEES):
+            Employee.objects.create(
+                employee_id=employee_id, full_name=full_name, email=f'{employee_id.lower()}@example.com',
+                department=department, position='Staff', hire_date=date(2024, 1, 1),
+                salary=Decimal('1000.00') + number,
+            )
+
+    def setUp(self):
+        # The index is updated on commit, which never happens inside a test
+        suggest_index.invalidate()
+
+    def search(self, query):
+        response = self.client.get(reverse('employee-search'), {'q': query})
+        self.assertEqual(response.status_code, 200)
+        return [item['full_name'] for item in response.json()]
+
+    def test_exact_prefix(self):
+        self.assertEqual(self.search('smi'), ['John Smith', 'Tom Smith'])
+
+    def test_transposed_letters(self):
+        self.assertEqual(self.search('jhon')[0], 'John Smith')
+        self.assertEqual(self.search('mkie'), ['Mike Ali'])
+        self.assertEqual(self.search('smtih'), ['John Smith', 'Tom Smith'])
+
+    def test_missing_letter(self):
+        self.assertEqual(self.search('smth'), ['John Smith', 'Tom Smith'])
+        self.assertEqual(self.search('engneering'), ['John Smith', 'Priya Patel'])
+
+    def test_several_words_with_typos(self):
+        self.assertEqual(self.search('jhon smtih')[0], 'John Smith')
+        self.assertEqual(self.search('tom smiht'), ['Tom Smith'])
+        self.assertEqual(self.search('priya engneering'), ['Priya Patel'])
+
+    def test_exact_matches_rank_first(self):
+        response = self.client.get(reverse('employee-search'), {'q': 'john'})
+        results = response.json()
+        self.assertEqual([item['full_name'] for item in results], ['John Smith', 'Sarah Johnson'])
+        self.assertGreater(results[0]['score'], 3)
+
+    def test_unrelated_query(self):
+        self.assertEqual(self.search('xqzv'), [])
+        self.assertEqual(self.search('zzzzzzz'), [])
+
+
+class EmployeeSearchWithoutFtsTests(EmployeeSearchTests):
+    """SQLite builds without FTS5 trigram support search with icontains lookups."""
+
+    def setUp(self):
+        super().setUp()
+        patcher = mock.patch('hrms.search.fts_available', return_value=False)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def test_index_is_not_installed(self):
+        self.assertFalse(install_search_index())
+
+    def test_search_filter(self):
+        response = self.client.get(reverse('employee-list-create'), {'search': 'smith eng'})
+        self.assertEqual([item['full_name'] for item in response.json()['results']], ['John Smith'])
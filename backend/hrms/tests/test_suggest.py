@@ -0,0 +1,40 @@
+from datetime import date
+from decimal import Decimal
+
+from django.test import TestCase, override_settings
+from django.urls import reverse
+
+from hrms.models import Employee
+from hrms.suggest import suggest_index
+
+
+class SuggestIndexTests(TestCase):
+    def create(self, employee_id, full_name):
+        return Employee.objects.create(
+            employee_id=employee_id, full_name=full_name, email=f'{employee_id.lower()}@example.com',
+            department='Engineering', position='Staff', hire_date=date(2024, 1, 1), salary=Decimal('1000.00'),
+        )
+
+    def suggest(self, query):
+        response = self.client.get(reverse('employee-suggest'), {'q': query})
+        self.assertEqual(response.status_code, 200)
+        return [item['full_name'] for item in response.json()]
+
+    def test_prefix_of_any_word(self):
+        suggest_index.invalidate()
+        self.create('EMP1', 'John Smith')
+        self.assertEqual(self.suggest('smi'), ['John Smith'])
+        self.assertEqual(self.suggest('emp1'), ['John Smith'])
+
+    def test_reloads_once_older_than_max_age(self):
+        # A write the version number never reports, as from another process
+        # that doesn't share this cache
+        suggest_index.invalidate()
+        self.assertEqual(self.suggest('sarah'), [])
+        Employee.objects.bulk_create([Employee(
+            employee_id='EMP2', full_name='Sarah Khan', email='emp2@example.com', department='HR',
+            position='Staff', hire_date=date(2024, 1, 1), salary=Decimal('1000.00'),
+        )])
+        self.assertEqual(self.suggest('sarah'), [])
+        with override_settings(HRMS_SUGGEST_MAX_AGE=0):
+            self.assertEqual(self.suggest('sarah'), ['Sarah Khan'])
@@ -1,9 +1,13 @@
 from django.urls import path
-from . import views
+from . import async_views, views
 
 urlpatterns = [
     # Employee URLs
     path('employees/', views.EmployeeListCreateView.as_view(), name='employee-list-create'),
+    # Registered before employee-detail, which would otherwise capture them
+    path('employees/bulk-import/', views.bulk_import_employees, name='bulk-import-employees'),
+    path('employees/search/', views.search_employees, name='employee-search'),
+    path('employees/suggest/', views.suggest_employees, name='employee-suggest'),
     path('employees/<str:employee_id>/', views.EmployeeDetailView.as_view(), name='employee-detail'),
     
     # Department URLs
@@ -12,28 +16,45 @@ urlpatterns = [
     
     # Attendance URLs
     path('attendance/', views.AttendanceListCreateView.as_view(), name='attendance-list-create'),
+    path('attendance/bulk/', views.bulk_mark_attendance, name='attendance-bulk'),
+    path('attendance/stats/', views.attendance_stats, name='attendance-stats-batch'),
     path('attendance/stats/<str:employee_id>/', views.attendance_stats, name='attendance-stats'),
     
     # Leave Management URLs
     path('leave-types/', views.LeaveTypeListCreateView.as_view(), name='leave-type-list-create'),
     path('leave-requests/', views.LeaveRequestListCreateView.as_view(), name='leave-request-list-create'),
+    path('leave-requests/bulk-decision/', views.bulk_decide_leave_requests, name='leave-request-bulk-decision'),
     path('leave-requests/<int:pk>/', views.LeaveRequestDetailView.as_view(), name='leave-request-detail'),
+    path('leave-balances/', views.leave_balances, name='leave-balances'),
+    path('leave-calendar/', views.leave_calendar, name='leave-calendar'),
     
     # Performance URLs
     path('performance/', views.PerformanceListCreateView.as_view(), name='performance-list-create'),
     
     # Payroll URLs
     path('payroll/', views.PayrollListCreateView.as_view(), name='payroll-list-create'),
+    path('payroll/run/', views.payroll_run, name='payroll-run'),
     
     # Notification URLs
     path('notifications/', views.NotificationListView.as_view(), name='notification-list'),
+    path('notifications/unread-count/', views.notification_unread_count, name='notification-unread-count'),
+    path('notifications/mark-read/', views.mark_notifications_read, name='notification-mark-read'),
     
     # Dashboard and Analytics URLs
     path('dashboard/stats/', views.dashboard_stats, name='dashboard-stats'),
     path('analytics/department-stats/', views.department_stats, name='department-stats'),
     
+    # Async variants, for ASGI deployments
+    path('async/dashboard/stats/', async_views.dashboard_stats, name='dashboard-stats-async'),
+    path('async/analytics/department-stats/', async_views.department_stats, name='department-stats-async'),
+    path('async/attendance/stats/', async_views.attendance_stats, name='attendance-stats-batch-async'),
+    path('async/attendance/stats/<str:employee_id>/', async_views.attendance_stats, name='attendance-stats-async'),
+    path('async/notifications/poll/', async_views.poll_notifications, name='notification-poll-async'),
+    
     # Bulk Operations URLs
-    path('employees/bulk-import/', views.bulk_import_employees, name='bulk-import-employees'),
     path('export/employees/', views.export_employees_csv, name='export-employees'),
     path('export/attendance/', views.export_attendance_csv, name='export-attendance'),
+    
+    # Instrumentation URLs
+    path('_metrics/', views.api_metrics, name='api-metrics'),
 ]
\ No newline at end of file
@@ -1,42 +1,101 @@
-from rest_framework import generics, status, filters
+from rest_framework import generics, status, filters, serializers
 from rest_framework.response import Response
 from rest_framework.decorators import api_view
 from django.shortcuts import get_object_or_404
-from django.db import IntegrityError
-from django.db.models import Count, Q, Avg, Sum
+from django.core.exceptions import ValidationError as DjangoValidationError
+from django.db import IntegrityError, transaction
+from django.db.models import Count, Q, F, Avg, Sum, OuterRef, Subquery, IntegerField, FilteredRelation
+from django.db.models.functions import Coalesce
 from django.utils import timezone
+from django.utils.decorators import method_decorator
 from datetime import date, datetime, timedelta
 from decimal import Decimal
 import csv
-from django.http import HttpResponse
+from django.http import StreamingHttpResponse
 from .models import Employee, Attendance, LeaveRequest, LeaveType, Performance, Payroll, Department, Notification
+from .conditional import (
+    employee_list_condition, employee_detail_condition, department_list_condition,
+    department_detail_condition, leave_type_list_condition, leave_request_detail_condition,
+    dashboard_condition
+)
+from .fastpath import FastListMixin
+from .fieldsets import SparseFieldsetViewMixin
+from .metrics import registry as metrics_registry
+from .pagination import KeysetPagination
+from .payroll import run_payroll
+from .balances import employee_balances, ledger_entry
+from .leave_calendar import LeaveCalendar
+from .leave_decisions import decide_leave_requests
+from .notifications import counter_state, mark_read
+from .rollup import apply_change as apply_rollup_change, attendance_key, rebuild_rollup
+from .search import SEARCH_COLUMNS, filter_employees_by_terms, rank_employees
+from .suggest import suggest_index, invalidate_suggest_index
+from .stats import (
+    get_dashboard_stats, compute_attendance_stats, compute_department_stats, invalidate_dashboard_stats
+)
 from .serializers import (
-    EmployeeSerializer, EmployeeCreateSerializer, AttendanceSerializer, 
+    EmployeeSerializer, EmployeeCreateSerializer, EmployeeImportSerializer, AttendanceSerializer, 
     LeaveRequestSerializer, LeaveTypeSerializer, PerformanceSerializer, 
-    PayrollSerializer, DepartmentSerializer, NotificationSerializer,
-    DashboardStatsSerializer, AttendanceStatsSerializer, DepartmentStatsSerializer
+    PayrollSerializer, PayrollRunSerializer, DepartmentSerializer, NotificationSerializer,
+    DashboardStatsSerializer, AttendanceStatsSerializer, AttendanceStatsQuerySerializer, DepartmentStatsSerializer,
+    LeaveBalanceQuerySerializer, EmployeeLeaveBalanceSerializer, LeaveCalendarQuerySerializer,
+    LeaveBulkDecisionSerializer, NotificationMarkReadSerializer
 )
 
+# Query filters shared by the list views and the CSV exports
+def filter_employees(queryset, params):
+    department = params.get('department', None)
+    status_filter = params.get('status', None)
+    
+    if department:
+        queryset = queryset.filter(department=department)
+    if status_filter:
+        queryset = queryset.filter(status=status_filter)
+        
+    return queryset
+
+def filter_attendance(queryset, params):
+    employee_id = params.get('employee_id', None)
+    department = params.get('department', None)
+    start_date = params.get('start_date', None)
+    end_date = params.get('end_date', None)
+    status_filter = params.get('status', None)
+    
+    if employee_id:
+        queryset = queryset.filter(employee__employee_id=employee_id)
+    if department:
+        queryset = queryset.filter(employee__department=department)
+    if start_date:
+        queryset = queryset.filter(date__gte=start_date)
+    if end_date:
+        queryset = queryset.filter(date__lte=end_date)
+    if status_filter:
+        queryset = queryset.filter(status=status_filter)
+        
+    return queryset
+
 # Employee Views
-class EmployeeListCreateView(generics.ListCreateAPIView):
+class EmployeeSearchFilter(filters.SearchFilter):
+    """?search= with the same all-terms semantics, answered from the FTS index."""
+
+    def filter_queryset(self, request, queryset, view):
+        terms = self.get_search_terms(request)
+        if not terms:
+            return queryset
+        return filter_employees_by_terms(queryset, terms)
+
+@method_decorator(employee_list_condition, name='get')
+class EmployeeListCreateView(FastListMixin, SparseFieldsetViewMixin, generics.ListCreateAPIView):
     queryset = Employee.objects.all()
     serializer_class = EmployeeSerializer
-    filter_backends = [filters.SearchFilter, filters.OrderingFilter]
-    search_fields = ['employee_id', 'full_name', 'email', 'department']
+    pagination_class = KeysetPagination
+    filter_backends = [EmployeeSearchFilter, filters.OrderingFilter]
+    search_fields = SEARCH_COLUMNS
     ordering_fields = ['employee_id', 'full_name', 'hire_date', 'department']
     ordering = ['employee_id']
 
     def get_queryset(self):
-        queryset = Employee.objects.all()
-        department = self.request.query_params.get('department', None)
-        status_filter = self.request.query_params.get('status', None)
-        
-        if department:
-            queryset = queryset.filter(department=department)
-        if status_filter:
-            queryset = queryset.filter(status=status_filter)
-            
-        return queryset
+        return self.narrow_queryset(filter_employees(Employee.objects.all(), self.request.query_params))
 
     def get_serializer_class(self):
         if self.request.method == 'POST':
@@ -63,11 +122,69 @@ class EmployeeListCreateView(generics.ListCreateAPIView):
                     status=status.HTTP_400_BAD_REQUEST
                 )
 
+EMPLOYEE_SEARCH_MAX_LIMIT = 100
+
+@api_view(['GET'])
+def search_employees(request):
+    """
+    Ranked, typo-tolerant employee search: ?q= (required) and ?limit=
+    (default 20). Items use the compact employee representation plus a score.
+    """
+    query = request.query_params.get('q', '').strip()
+    if not query:
+        return Response(
+            {'detail': 'q is required'},
+            status=status.HTTP_400_BAD_REQUEST
+        )
+    try:
+        limit = min(max(int(request.query_params.get('limit', 20)), 1), EMPLOYEE_SEARCH_MAX_LIMIT)
+    except ValueError:
+        return Response(
+            {'detail': 'limit must be an integer'},
+            status=status.HTTP_400_BAD_REQUEST
+        )
+
+    fields = EmployeeSerializer.Meta.list_fields
+    employees = rank_employees(query, limit=limit, fields=fields)
+    serializer = EmployeeSerializer(employees, many=True, context={'fields': fields})
+    return Response([
+        dict(item, score=employee.search_score)
+        for item, employee in zip(serializer.data, employees)
+    ])
+
+EMPLOYEE_SUGGEST_MAX_LIMIT = 50
+
+@api_view(['GET'])
+def suggest_employees(request):
+    """
+    Typeahead for employee pickers: ?q= prefix of an employee ID or name,
+    ?limit= (default 10). Served from the in-process prefix index.
+    """
+    try:
+        limit = min(max(int(request.query_params.get('limit', 10)), 1), EMPLOYEE_SUGGEST_MAX_LIMIT)
+    except ValueError:
+        return Response(
+            {'detail': 'limit must be an integer'},
+            status=status.HTTP_400_BAD_REQUEST
+        )
+    return Response(suggest_index.suggest(request.query_params.get('q', ''), limit=limit))
+
+@method_decorator(employee_detail_condition, name='get')
 class EmployeeDetailView(generics.RetrieveUpdateDestroyAPIView):
     queryset = Employee.objects.all()
     serializer_class = EmployeeSerializer
     lookup_field = 'employee_id'
 
+    # The employee write and the attendance rollup change its signals make
+    # commit together
+    def perform_update(self, serializer):
+        with transaction.atomic():
+            serializer.save()
+
+    def perform_destroy(self, instance):
+        with transaction.atomic():
+            instance.delete()
+
     def destroy(self, request, *args, **kwargs):
         try:
             instance = self.get_object()
@@ -80,78 +197,117 @@ class EmployeeDetailView(generics.RetrieveUpdateDestroyAPIView):
             )
 
 # Department Views
+def active_employee_count():
+    # Employee.department is a plain name, not a foreign key, so the count is
+    # a correlated subquery rather than a reverse-relation aggregate
+    counts = Employee.objects.filter(
+        department=OuterRef('name'), status='Active'
+    ).order_by().values('department').annotate(count=Count('id')).values('count')
+    return Coalesce(Subquery(counts, output_field=IntegerField()), 0)
+
+@method_decorator(department_list_condition, name='get')
 class DepartmentListCreateView(generics.ListCreateAPIView):
-    queryset = Department.objects.all()
+    queryset = Department.objects.annotate(employee_count=active_employee_count())
     serializer_class = DepartmentSerializer
 
+@method_decorator(department_detail_condition, name='get')
 class DepartmentDetailView(generics.RetrieveUpdateDestroyAPIView):
-    queryset = Department.objects.all()
+    queryset = Department.objects.annotate(employee_count=active_employee_count())
     serializer_class = DepartmentSerializer
 
 # Attendance Views
-class AttendanceListCreateView(generics.ListCreateAPIView):
+ATTENDANCE_UPSERT_FIELDS = ['status', 'check_in_time', 'check_out_time', 'hours_worked', 'notes']
+ATTENDANCE_ROW_FIELDS = ['id', 'employee_id', 'date'] + ATTENDANCE_UPSERT_FIELDS + ['created_at', 'updated_at']
+
+def attendance_for_mark(employee_id, day):
+    """
+    Return (employee, attendance or None) for marking `employee_id` on `day`,
+    or (None, None) for an unknown employee, with one query: the day's row is
+    joined onto the employee and rebuilt from the annotated columns.
+    """
+    employee = Employee.objects.filter(employee_id=employee_id).annotate(
+        marked=FilteredRelation('attendance', condition=Q(attendance__date=day)),
+        **{f'marked_{name}': F(f'marked__{name}') for name in ATTENDANCE_ROW_FIELDS}
+    ).first()
+    if employee is None or employee.marked_id is None:
+        return employee, None
+
+    attendance = Attendance.from_db(
+        'default', ATTENDANCE_ROW_FIELDS,
+        [getattr(employee, f'marked_{name}') for name in ATTENDANCE_ROW_FIELDS]
+    )
+    attendance.employee = employee
+    return employee, attendance
+
+class AttendanceListCreateView(FastListMixin, SparseFieldsetViewMixin, generics.ListCreateAPIView):
     serializer_class = AttendanceSerializer
+    pagination_class = KeysetPagination
+    ordering = ['-date', 'employee__employee_id']
 
     def get_queryset(self):
         queryset = Attendance.objects.select_related('employee').all()
-        employee_id = self.request.query_params.get('employee_id', None)
-        start_date = self.request.query_params.get('start_date', None)
-        end_date = self.request.query_params.get('end_date', None)
-        status_filter = self.request.query_params.get('status', None)
-        
-        if employee_id:
-            queryset = queryset.filter(employee__employee_id=employee_id)
-        if start_date:
-            queryset = queryset.filter(date__gte=start_date)
-        if end_date:
-            queryset = queryset.filter(date__lte=end_date)
-        if status_filter:
-            queryset = queryset.filter(status=status_filter)
-            
-        return queryset.order_by('-date')
+        queryset = filter_attendance(queryset, self.request.query_params).order_by(*self.ordering)
+        return self.narrow_queryset(queryset)
 
     def create(self, request, *args, **kwargs):
         serializer = self.get_serializer(data=request.data)
         serializer.is_valid(raise_exception=True)
-        
-        employee_id = request.data.get('employee_id')
-        date_val = request.data.get('date')
-        
-        try:
-            employee = Employee.objects.get(employee_id=employee_id)
-        except Employee.DoesNotExist:
+        data = serializer.validated_data
+        values = {field: data[field] for field in ATTENDANCE_UPSERT_FIELDS if field in data}
+
+        employee, existing_attendance = attendance_for_mark(data['employee_id'], data['date'])
+        if employee is None:
             return Response(
                 {'detail': 'Employee not found'}, 
                 status=status.HTTP_404_NOT_FOUND
             )
-        
-        # Check if attendance already exists for this date
-        existing_attendance = Attendance.objects.filter(
-            employee=employee, 
-            date=date_val
-        ).first()
-        
-        if existing_attendance:
-            # Update existing attendance
-            for attr, value in serializer.validated_data.items():
-                if attr != 'employee':
-                    setattr(existing_attendance, attr, value)
-            existing_attendance.save()
-            serializer = AttendanceSerializer(existing_attendance)
-            return Response(serializer.data)
-        else:
-            # Create new attendance
-            self.perform_create(serializer)
-            headers = self.get_success_headers(serializer.data)
-            return Response(serializer.data, status=status.HTTP_201_CREATED, headers=headers)
+
+        if existing_attendance is None:
+            attendance = Attendance(employee=employee, date=data['date'], **values)
+            try:
+                with transaction.atomic():
+                    attendance.save(force_insert=True)
+            except IntegrityError:
+                # Marked concurrently since the lookup; update that row instead
+                employee, existing_attendance = attendance_for_mark(data['employee_id'], data['date'])
+            else:
+                serializer = AttendanceSerializer(attendance)
+                headers = self.get_success_headers(serializer.data)
+                return Response(serializer.data, status=status.HTTP_201_CREATED, headers=headers)
+
+        # Update existing attendance, writing only the fields that were sent.
+        # The queryset update skips the Attendance signals, so the rollup is
+        # moved from the bucket read by the lookup here, in the same
+        # transaction.
+        previous = attendance_key(existing_attendance, employee)
+        for attr, value in values.items():
+            setattr(existing_attendance, attr, value)
+        existing_attendance.updated_at = timezone.now()
+        with transaction.atomic():
+            Attendance.objects.filter(pk=existing_attendance.pk).update(
+                updated_at=existing_attendance.updated_at, **values
+            )
+            apply_rollup_change(previous, attendance_key(existing_attendance, employee))
+        invalidate_dashboard_stats()
+        serializer = AttendanceSerializer(existing_attendance)
+        return Response(serializer.data)
 
 # Leave Management Views
+def lock_employees(*employee_ids):
+    """Lock employees' rows for the rest of the transaction."""
+    employee_ids = {employee_id for employee_id in employee_ids if isinstance(employee_id, str)}
+    if employee_ids:
+        list(Employee.objects.select_for_update().filter(employee_id__in=employee_ids).values_list('pk', flat=True))
+
+@method_decorator(leave_type_list_condition, name='get')
 class LeaveTypeListCreateView(generics.ListCreateAPIView):
     queryset = LeaveType.objects.all()
     serializer_class = LeaveTypeSerializer
 
-class LeaveRequestListCreateView(generics.ListCreateAPIView):
+class LeaveRequestListCreateView(FastListMixin, SparseFieldsetViewMixin, generics.ListCreateAPIView):
     serializer_class = LeaveRequestSerializer
+    pagination_class = KeysetPagination
+    ordering = ['-created_at']
 
     def get_queryset(self):
         queryset = LeaveRequest.objects.select_related('employee', 'leave_type').all()
@@ -163,15 +319,108 @@ class LeaveRequestListCreateView(generics.ListCreateAPIView):
         if status_filter:
             queryset = queryset.filter(status=status_filter)
             
-        return queryset.order_by('-created_at')
+        return self.narrow_queryset(queryset.order_by(*self.ordering))
+
+    def create(self, request, *args, **kwargs):
+        # Validation includes the overlap check; holding the employee's row
+        # until the insert commits stops two overlapping requests both passing
+        with transaction.atomic():
+            lock_employees(request.data.get('employee_id'))
+            return super().create(request, *args, **kwargs)
 
+@method_decorator(leave_request_detail_condition, name='get')
 class LeaveRequestDetailView(generics.RetrieveUpdateDestroyAPIView):
     queryset = LeaveRequest.objects.all()
     serializer_class = LeaveRequestSerializer
 
+    def update(self, request, *args, **kwargs):
+        with transaction.atomic():
+            lock_employees(self.get_object().employee_id, request.data.get('employee_id'))
+            return super().update(request, *args, **kwargs)
+
+    def perform_update(self, serializer):
+        # The status change and its leave balance update commit together.
+        # Locking the row first stops two concurrent transitions of the same
+        # request from both being applied to the ledger.
+        with transaction.atomic():
+            previous = LeaveRequest.objects.select_for_update().filter(pk=serializer.instance.pk).values_list(
+                'employee_id', 'leave_type_id', 'start_date', 'status', 'days_requested'
+            ).first()
+            serializer.instance._balance_previous = ledger_entry(*previous) if previous else None
+            serializer.save()
+
+    def perform_destroy(self, instance):
+        with transaction.atomic():
+            instance.delete()
+
+@api_view(['POST'])
+def bulk_decide_leave_requests(request):
+    """
+    Approve or reject many Pending leave requests at once:
+    {"ids": [...], "status": "Approved" | "Rejected", "approved_by": ..., "comments": ...}.
+    Each decided request's employee gets a notification.
+    """
+    serializer = LeaveBulkDecisionSerializer(data=request.data)
+    serializer.is_valid(raise_exception=True)
+    params = serializer.validated_data
+
+    result = decide_leave_requests(
+        params['ids'], params['status'], params['approved_by'], comments=params.get('comments'),
+    )
+    return Response({
+        'status': params['status'],
+        'decided_count': len(result['decided']),
+        **result,
+    })
+
+@api_view(['GET'])
+def leave_calendar(request):
+    """
+    Who is on leave between ?start= and ?end= (at most a year), optionally
+    for one ?department= and one ?status= (Approved or Pending; default
+    both). Returns per-day counts and each employee's leave intervals.
+    """
+    query = LeaveCalendarQuerySerializer(data=request.query_params)
+    query.is_valid(raise_exception=True)
+    params = query.validated_data
+
+    calendar = LeaveCalendar.load(
+        params['start'], params['end'],
+        department=params.get('department'),
+        statuses=[params['status']] if params.get('status') else None,
+    )
+    return Response({
+        'start': params['start'],
+        'end': params['end'],
+        'days': calendar.daily_counts(),
+        'employees': calendar.by_employee(),
+    })
+
+@api_view(['GET'])
+def leave_balances(request):
+    """
+    Leave balances for every leave type, for a ?department= or one
+    ?employee_id=, in ?year= (default: this year).
+    """
+    query = LeaveBalanceQuerySerializer(data=request.query_params)
+    query.is_valid(raise_exception=True)
+    year = query.validated_data.get('year') or date.today().year
+
+    balances = employee_balances(
+        year,
+        department=query.validated_data.get('department'),
+        employee_id=query.validated_data.get('employee_id'),
+    )
+    return Response({
+        'year': year,
+        'results': EmployeeLeaveBalanceSerializer(balances, many=True).data,
+    })
+
 # Performance Views
 class PerformanceListCreateView(generics.ListCreateAPIView):
     serializer_class = PerformanceSerializer
+    pagination_class = KeysetPagination
+    ordering = ['-created_at']
 
     def get_queryset(self):
         queryset = Performance.objects.select_related('employee').all()
@@ -180,11 +429,13 @@ class PerformanceListCreateView(generics.ListCreateAPIView):
         if employee_id:
             queryset = queryset.filter(employee__employee_id=employee_id)
             
-        return queryset.order_by('-created_at')
+        return queryset.order_by(*self.ordering)
 
 # Payroll Views
-class PayrollListCreateView(generics.ListCreateAPIView):
+class PayrollListCreateView(FastListMixin, SparseFieldsetViewMixin, generics.ListCreateAPIView):
     serializer_class = PayrollSerializer
+    pagination_class = KeysetPagination
+    ordering = ['-created_at']
 
     def get_queryset(self):
         queryset = Payroll.objects.select_related('employee').all()
@@ -196,209 +447,435 @@ class PayrollListCreateView(generics.ListCreateAPIView):
         if status_filter:
             queryset = queryset.filter(status=status_filter)
             
-        return queryset.order_by('-created_at')
+        return self.narrow_queryset(queryset.order_by(*self.ordering))
+
+@api_view(['POST'])
+def payroll_run(request):
+    serializer = PayrollRunSerializer(data=request.data)
+    serializer.is_valid(raise_exception=True)
+    params = serializer.validated_data
+    options = {key: params[key] for key in ('overtime_multiplier', 'tax_rate') if key in params}
+
+    summary = run_payroll(
+        params['pay_period_start'],
+        params['pay_period_end'],
+        department=params.get('department') or None,
+        **options
+    )
+    invalidate_dashboard_stats()
+    return Response(summary)
 
 # Notification Views
 class NotificationListView(generics.ListAPIView):
+    """Notifications newest first, optionally for one ?employee_id=; ?unread=true for unread only."""
     serializer_class = NotificationSerializer
+    pagination_class = KeysetPagination
+    ordering = ['-created_at']
 
     def get_queryset(self):
-        employee_id = self.request.query_params.get('employee_id', None)
+        params = self.request.query_params
+        queryset = Notification.objects.select_related('employee')
+        employee_id = params.get('employee_id', None)
         if employee_id:
-            return Notification.objects.filter(employee__employee_id=employee_id)
-        return Notification.objects.all()
+            queryset = queryset.filter(employee_id=employee_id)
+        if params.get('unread', '').lower() in ('1', 'true', 'yes'):
+            queryset = queryset.filter(is_read=False)
+        return queryset
 
-# Dashboard and Analytics Views
 @api_view(['GET'])
-def dashboard_stats(request):
-    today = date.today()
-    
-    # Basic counts
-    total_employees = Employee.objects.count()
-    active_employees = Employee.objects.filter(status='Active').count()
-    
-    # Today's attendance
-    today_attendance = Attendance.objects.filter(date=today)
-    present_today = today_attendance.filter(status__in=['Present', 'Late', 'Half Day']).count()
-    absent_today = today_attendance.filter(status='Absent').count()
-    
-    # Leave requests
-    pending_leave_requests = LeaveRequest.objects.filter(status='Pending').count()
-    
-    # Departments
-    departments_count = Department.objects.count()
-    
-    # Attendance rate (last 30 days)
-    thirty_days_ago = today - timedelta(days=30)
-    total_attendance_records = Attendance.objects.filter(date__gte=thirty_days_ago).count()
-    present_records = Attendance.objects.filter(
-        date__gte=thirty_days_ago, 
-        status__in=['Present', 'Late', 'Half Day']
-    ).count()
-    average_attendance_rate = (present_records / total_attendance_records * 100) if total_attendance_records > 0 else 0
-    
-    # Payroll this month
-    current_month_start = today.replace(day=1)
-    total_payroll_this_month = Payroll.objects.filter(
-        pay_period_start__gte=current_month_start,
-        status='Processed'
-    ).aggregate(total=Sum('net_salary'))['total'] or Decimal('0.00')
-    
-    stats = {
-        'total_employees': total_employees,
-        'active_employees': active_employees,
-        'present_today': present_today,
-        'absent_today': absent_today,
-        'pending_leave_requests': pending_leave_requests,
-        'departments_count': departments_count,
-        'average_attendance_rate': round(average_attendance_rate, 2),
-        'total_payroll_this_month': total_payroll_this_month
-    }
-    
-    serializer = DashboardStatsSerializer(stats)
-    return Response(serializer.data)
+def notification_unread_count(request):
+    """Unread count and newest notification id for ?employee_id=, read from the counter table."""
+    employee_id = request.query_params.get('employee_id')
+    if not employee_id:
+        return Response(
+            {'detail': 'employee_id is required'},
+            status=status.HTTP_400_BAD_REQUEST
+        )
+    state = counter_state(employee_id)
+    if state is None:
+        return Response(
+            {'detail': 'Employee not found'},
+            status=status.HTTP_404_NOT_FOUND
+        )
+    unread, last_id = state
+    return Response({'employee_id': employee_id, 'unread': unread, 'last_id': last_id})
 
-@api_view(['GET'])
-def attendance_stats(request, employee_id):
-    try:
-        employee = Employee.objects.get(employee_id=employee_id)
-    except Employee.DoesNotExist:
+@api_view(['POST'])
+def mark_notifications_read(request):
+    """
+    Mark an employee's notifications read: {"employee_id": ..., "ids": [...]}
+    for specific ones, {"up_to_id": n} for everything up to a notification
+    already shown, or neither for all of them.
+    """
+    serializer = NotificationMarkReadSerializer(data=request.data)
+    serializer.is_valid(raise_exception=True)
+    params = serializer.validated_data
+
+    marked = mark_read(params['employee_id'], ids=params.get('ids'), up_to_id=params.get('up_to_id'))
+    state = counter_state(params['employee_id'])
+    if state is None:
         return Response(
-            {'detail': 'Employee not found'}, 
+            {'detail': 'Employee not found'},
             status=status.HTTP_404_NOT_FOUND
         )
-    
-    attendance_records = Attendance.objects.filter(employee=employee)
-    total_records = attendance_records.count()
-    present_days = attendance_records.filter(status='Present').count()
-    absent_days = attendance_records.filter(status='Absent').count()
-    late_days = attendance_records.filter(status='Late').count()
-    half_days = attendance_records.filter(status='Half Day').count()
-    
-    attendance_percentage = round((present_days / total_records * 100) if total_records > 0 else 0, 2)
-    
-    stats = {
-        'employee_id': employee_id,
-        'employee_name': employee.full_name,
-        'total_days': total_records,
-        'present_days': present_days,
-        'absent_days': absent_days,
-        'late_days': late_days,
-        'half_days': half_days,
-        'attendance_percentage': attendance_percentage
-    }
-    
-    serializer = AttendanceStatsSerializer(stats)
+    return Response({'marked': marked, 'unread': state[0]})
+
+# Dashboard and Analytics Views
+@api_view(['GET'])
+@dashboard_condition
+def dashboard_stats(request):
+    serializer = DashboardStatsSerializer(get_dashboard_stats())
     return Response(serializer.data)
 
 @api_view(['GET'])
-def department_stats(request):
-    departments = Department.objects.all()
-    today = date.today()
-    stats = []
-    
-    for dept in departments:
-        dept_employees = Employee.objects.filter(department=dept.name, status='Active')
-        total_employees = dept_employees.count()
-        
-        if total_employees > 0:
-            # Today's attendance for this department
-            today_attendance = Attendance.objects.filter(
-                employee__in=dept_employees,
-                date=today
+def attendance_stats(request, employee_id=None):
+    """
+    Attendance counts for one employee, or with ?employee_id=A,B,C on the
+    collection route for several in the same query. ?start_date= and
+    ?end_date= limit the window.
+    """
+    params = request.query_params.copy()
+    if employee_id is not None:
+        params['employee_id'] = employee_id
+    query = AttendanceStatsQuerySerializer(data=params)
+    query.is_valid(raise_exception=True)
+    employee_ids = query.validated_data['employee_id']
+
+    stats = compute_attendance_stats(
+        employee_ids,
+        start_date=query.validated_data.get('start_date'),
+        end_date=query.validated_data.get('end_date'),
+    )
+
+    if employee_id is not None:
+        if employee_id not in stats:
+            return Response(
+                {'detail': 'Employee not found'},
+                status=status.HTTP_404_NOT_FOUND
             )
-            present_today = today_attendance.filter(status__in=['Present', 'Late', 'Half Day']).count()
-            absent_today = today_attendance.filter(status='Absent').count()
-            attendance_rate = (present_today / total_employees * 100) if total_employees > 0 else 0
-            
-            # Average salary
-            avg_salary = dept_employees.filter(salary__isnull=False).aggregate(
-                avg=Avg('salary')
-            )['avg'] or Decimal('0.00')
-            
-            stats.append({
-                'department': dept.name,
-                'total_employees': total_employees,
-                'present_today': present_today,
-                'absent_today': absent_today,
-                'attendance_rate': round(attendance_rate, 2),
-                'average_salary': avg_salary
-            })
-    
+        serializer = AttendanceStatsSerializer(stats[employee_id])
+        return Response(serializer.data)
+
+    serializer = AttendanceStatsSerializer(
+        [stats[key] for key in employee_ids if key in stats], many=True
+    )
+    return Response({
+        'results': serializer.data,
+        'not_found': [key for key in employee_ids if key not in stats]
+    })
+
+@api_view(['GET'])
+def department_stats(request):
+    include_unlisted = request.query_params.get('include_unlisted', '').lower() in ('1', 'true', 'yes')
+    stats = compute_department_stats(include_unlisted=include_unlisted)
     serializer = DepartmentStatsSerializer(stats, many=True)
     return Response(serializer.data)
 
 # Bulk Operations
+IMPORT_BATCH_SIZE = 1000
+# Ids and emails per lookup query. Both lists together stay under 999 bound
+# parameters, the limit in SQLite builds before 3.32
+IMPORT_LOOKUP_CHUNK = 450
+
+def _existing_employee_keys(employee_ids, emails):
+    taken_ids, taken_emails = set(), set()
+    employee_ids, emails = list(employee_ids), list(emails)
+    for start in range(0, max(len(employee_ids), len(emails)), IMPORT_LOOKUP_CHUNK):
+        ids_chunk = employee_ids[start:start + IMPORT_LOOKUP_CHUNK]
+        emails_chunk = emails[start:start + IMPORT_LOOKUP_CHUNK]
+        for employee_id, email in Employee.objects.filter(
+            Q(employee_id__in=ids_chunk) | Q(email__in=emails_chunk)
+        ).values_list('employee_id', 'email'):
+            taken_ids.add(employee_id)
+            taken_emails.add(email)
+    return taken_ids, taken_emails
+
+def _conflicts(employee, taken_ids, taken_emails):
+    conflict = {}
+    if employee.employee_id in taken_ids:
+        conflict['employee_id'] = ['Employee ID already exists']
+    if employee.email in taken_emails:
+        conflict['email'] = ['Email already exists']
+    return conflict
+
 @api_view(['POST'])
 def bulk_import_employees(request):
+    """
+    Import employees in batches.
+
+    `mode` is `partial` (default: valid rows are saved, invalid ones are
+    reported) or `all_or_nothing` (any error means nothing is saved).
+    """
     employees_data = request.data.get('employees', [])
-    created_count = 0
+    mode = request.data.get('mode', 'partial')
+    if not isinstance(employees_data, list):
+        return Response(
+            {'detail': 'employees must be a list'},
+            status=status.HTTP_400_BAD_REQUEST
+        )
+    if mode not in ('partial', 'all_or_nothing'):
+        return Response(
+            {'detail': 'mode must be partial or all_or_nothing'},
+            status=status.HTTP_400_BAD_REQUEST
+        )
+
     errors = []
-    
-    for emp_data in employees_data:
+    valid = []
+    row_serializer = EmployeeImportSerializer()
+    seen_ids, seen_emails = set(), set()
+
+    # Every entry's errors map a field name to a list of messages, as
+    # serializer errors do
+    def report(row, emp_data, row_errors):
+        errors.append({
+            'row': row,
+            'employee_id': emp_data.get('employee_id', 'Unknown') if isinstance(emp_data, dict) else 'Unknown',
+            'errors': row_errors
+        })
+
+    # Field and model-level validation happens in memory
+    for row, emp_data in enumerate(employees_data):
         try:
-            serializer = EmployeeCreateSerializer(data=emp_data)
-            if serializer.is_valid():
-                serializer.save()
-                created_count += 1
-            else:
-                errors.append({
-                    'employee_id': emp_data.get('employee_id', 'Unknown'),
-                    'errors': serializer.errors
-                })
-        except Exception as e:
-            errors.append({
-                'employee_id': emp_data.get('employee_id', 'Unknown'),
-                'errors': str(e)
-            })
-    
+            data = row_serializer.run_validation(emp_data)
+            employee = Employee(**data)
+            employee.clean()
+        except serializers.ValidationError as e:
+            report(row, emp_data, e.detail)
+            continue
+        except DjangoValidationError as e:
+            report(row, emp_data, e.message_dict)
+            continue
+
+        duplicate = {}
+        if employee.employee_id in seen_ids:
+            duplicate['employee_id'] = ['Employee ID appears more than once in this import']
+        if employee.email in seen_emails:
+            duplicate['email'] = ['Email appears more than once in this import']
+        if duplicate:
+            report(row, emp_data, duplicate)
+            continue
+        seen_ids.add(employee.employee_id)
+        seen_emails.add(employee.email)
+        valid.append((row, emp_data, employee))
+
+    taken_ids, taken_emails = _existing_employee_keys(seen_ids, seen_emails)
+    to_create = []
+    for row, emp_data, employee in valid:
+        conflict = _conflicts(employee, taken_ids, taken_emails)
+        if conflict:
+            report(row, emp_data, conflict)
+        else:
+            to_create.append((row, emp_data, employee))
+
+    created_count = 0
+    if mode == 'all_or_nothing':
+        if not errors:
+            try:
+                with transaction.atomic():
+                    Employee.objects.bulk_create(
+                        [employee for _, _, employee in to_create], batch_size=IMPORT_BATCH_SIZE
+                    )
+                created_count = len(to_create)
+            except IntegrityError:
+                return Response(
+                    {'detail': 'Employee ID or email already exists'},
+                    status=status.HTTP_400_BAD_REQUEST
+                )
+    else:
+        # Each batch commits on its own. A batch that loses a race with a
+        # concurrent insert is retried row by row, so only the rows that
+        # now conflict are reported
+        for start in range(0, len(to_create), IMPORT_BATCH_SIZE):
+            batch = to_create[start:start + IMPORT_BATCH_SIZE]
+            try:
+                with transaction.atomic():
+                    Employee.objects.bulk_create([employee for _, _, employee in batch])
+                created_count += len(batch)
+                continue
+            except IntegrityError:
+                pass
+            for row, emp_data, employee in batch:
+                try:
+                    with transaction.atomic():
+                        Employee.objects.bulk_create([employee])
+                    created_count += 1
+                except IntegrityError:
+                    conflict = _conflicts(employee, *_existing_employee_keys([employee.employee_id], [employee.email]))
+                    report(row, emp_data, conflict or {'non_field_errors': ['Employee ID or email already exists']})
+
+    if created_count:
+        invalidate_dashboard_stats()
+        invalidate_suggest_index()
+    errors.sort(key=lambda error: error['row'])
+
     return Response({
         'created_count': created_count,
         'total_count': len(employees_data),
         'errors': errors
     })
 
+# Records per request. The employee and date IN lists together stay under
+# 999 bound parameters, the limit in SQLite builds before 3.32
+MAX_BULK_ATTENDANCE_RECORDS = 450
+
+@api_view(['POST'])
+def bulk_mark_attendance(request):
+    records_data = request.data.get('records', []) if isinstance(request.data, dict) else request.data
+    if not isinstance(records_data, list):
+        return Response(
+            {'detail': 'records must be a list'},
+            status=status.HTTP_400_BAD_REQUEST
+        )
+    if len(records_data) > MAX_BULK_ATTENDANCE_RECORDS:
+        return Response(
+            {'detail': f'At most {MAX_BULK_ATTENDANCE_RECORDS} records can be marked per request'},
+            status=status.HTTP_400_BAD_REQUEST
+        )
+    results = [None] * len(records_data)
+    pending = {}
+
+    # Validate every item in memory first; AttendanceSerializer has no
+    # uniqueness validators, so this runs no queries. One serializer instance
+    # is reused so its fields are only built once.
+    row_serializer = AttendanceSerializer()
+    for index, item in enumerate(records_data):
+        try:
+            data = row_serializer.run_validation(item)
+        except serializers.ValidationError as e:
+            results[index] = {
+                'index': index,
+                'employee_id': item.get('employee_id') if isinstance(item, dict) else None,
+                'result': 'error',
+                'errors': e.detail
+            }
+            continue
+        key = (data['employee_id'], data['date'])
+        if key in pending:
+            # Later items for the same employee and day win
+            earlier = pending[key][0]
+            results[earlier] = {
+                'index': earlier,
+                'employee_id': key[0],
+                'date': key[1],
+                'result': 'skipped',
+                'errors': 'Superseded by a later item for the same employee and date'
+            }
+        pending[key] = (index, data)
+
+    employee_ids = {employee_id for employee_id, _ in pending}
+    known_ids = set(
+        Employee.objects.filter(employee_id__in=employee_ids).values_list('employee_id', flat=True)
+    )
+    existing = {
+        (record.employee_id, record.date): record
+        for record in Attendance.objects.filter(
+            employee_id__in=known_ids,
+            date__in={day for _, day in pending}
+        )
+    }
+
+    records = []
+    for key, (index, data) in pending.items():
+        employee_id, day = key
+        if employee_id not in known_ids:
+            results[index] = {
+                'index': index,
+                'employee_id': employee_id,
+                'date': day,
+                'result': 'error',
+                'errors': {'employee_id': ['Employee not found']}
+            }
+            continue
+        current = existing.get(key)
+        # Like the single-record endpoint, an update only changes the fields
+        # that were sent
+        values = {
+            field: data[field] if field in data else getattr(current, field, None)
+            for field in ATTENDANCE_UPSERT_FIELDS
+        }
+        records.append(Attendance(employee_id=employee_id, date=day, **values))
+        results[index] = {
+            'index': index,
+            'employee_id': employee_id,
+            'date': day,
+            'result': 'updated' if current else 'created'
+        }
+
+    with transaction.atomic():
+        Attendance.objects.bulk_create(
+            records,
+            update_conflicts=True,
+            unique_fields=['employee', 'date'],
+            update_fields=ATTENDANCE_UPSERT_FIELDS + ['updated_at'],
+        )
+        # bulk_create skips the signals that keep the rollup current
+        rebuild_rollup(dates={record.date for record in records})
+    if records:
+        invalidate_dashboard_stats()
+
+    return Response({
+        'created_count': sum(1 for r in results if r['result'] == 'created'),
+        'updated_count': sum(1 for r in results if r['result'] == 'updated'),
+        'total_count': len(records_data),
+        'results': results
+    })
+
+EXPORT_CHUNK_SIZE = 2000
+
+class Echo:
+    """File-like object whose write() hands the encoded line straight back."""
+    def write(self, value):
+        return value
+
+def stream_csv(header, rows, filename):
+    writer = csv.writer(Echo())
+
+    def lines():
+        yield writer.writerow(header)
+        for row in rows:
+            yield writer.writerow(['' if value is None else value for value in row])
+
+    response = StreamingHttpResponse(lines(), content_type='text/csv')
+    response['Content-Disposition'] = f'attachment; filename="{filename}"'
+    return response
+
 @api_view(['GET'])
 def export_employees_csv(request):
-    response = HttpResponse(content_type='text/csv')
-    response['Content-Disposition'] = 'attachment; filename="employees.csv"'
-    
-    writer = csv.writer(response)
-    writer.writerow([
-        'Employee ID', 'Full Name', 'Email', 'Phone', 'Department', 
-        'Position', 'Hire Date', 'Salary', 'Status'
-    ])
-    
-    employees = Employee.objects.all()
-    for emp in employees:
-        writer.writerow([
-            emp.employee_id, emp.full_name, emp.email, emp.phone or '',
-            emp.department, emp.position or '', emp.hire_date or '',
-            emp.salary or '', emp.status
-        ])
-    
-    return response
+    employees = filter_employees(Employee.objects.all(), request.query_params).values_list(
+        'employee_id', 'full_name', 'email', 'phone', 'department',
+        'position', 'hire_date', 'salary', 'status'
+    )
+    return stream_csv(
+        [
+            'Employee ID', 'Full Name', 'Email', 'Phone', 'Department', 
+            'Position', 'Hire Date', 'Salary', 'Status'
+        ],
+        employees.iterator(chunk_size=EXPORT_CHUNK_SIZE),
+        'employees.csv'
+    )
 
 @api_view(['GET'])
 def export_attendance_csv(request):
-    response = HttpResponse(content_type='text/csv')
-    response['Content-Disposition'] = 'attachment; filename="attendance.csv"'
-    
-    writer = csv.writer(response)
-    writer.writerow([
-        'Employee ID', 'Employee Name', 'Date', 'Status', 
-        'Check In', 'Check Out', 'Hours Worked'
-    ])
-    
-    attendance_records = Attendance.objects.select_related('employee').all()
-    for record in attendance_records:
-        writer.writerow([
-            record.employee.employee_id, record.employee.full_name,
-            record.date, record.status, record.check_in_time or '',
-            record.check_out_time or '', record.hours_worked or ''
-        ])
-    
-    return response
+    attendance_records = filter_attendance(Attendance.objects.all(), request.query_params).values_list(
+        'employee_id', 'employee__full_name', 'date', 'status',
+        'check_in_time', 'check_out_time', 'hours_worked'
+    )
+    return stream_csv(
+        [
+            'Employee ID', 'Employee Name', 'Date', 'Status', 
+            'Check In', 'Check Out', 'Hours Worked'
+        ],
+        attendance_records.iterator(chunk_size=EXPORT_CHUNK_SIZE),
+        'attendance.csv'
+    )
+
+# Instrumentation
+@api_view(['GET', 'DELETE'])
+def api_metrics(request):
+    if request.method == 'DELETE':
+        metrics_registry.reset()
+        return Response(status=status.HTTP_204_NO_CONTENT)
+    return Response(metrics_registry.snapshot())
 
 @api_view(['GET'])
 def root_view(request):
@@ -30,6 +30,7 @@ INSTALLED_APPS = [
 
 MIDDLEWARE = [
     'corsheaders.middleware.CorsMiddleware',
+    'hrms.middleware.ApiMetricsMiddleware',
     'django.middleware.security.SecurityMiddleware',
     'django.contrib.sessions.middleware.SessionMiddleware',
     'django.middleware.common.CommonMiddleware',
@@ -102,9 +103,32 @@ CORS_ALLOW_CREDENTIALS = True
 # REST Framework settings
 REST_FRAMEWORK = {
     'DEFAULT_RENDERER_CLASSES': [
-        'rest_framework.renderers.JSONRenderer',
+        'hrms.renderers.FastJSONRenderer',
     ],
     'DEFAULT_PARSER_CLASSES': [
         'rest_framework.parsers.JSONParser',
     ],
-}
\ No newline at end of file
+}
+
+# Seconds the cached dashboard snapshot is served before it is recomputed.
+# Writes to the underlying models invalidate it sooner.
+HRMS_DASHBOARD_CACHE_TTL = 60
+
+# Per-endpoint query/latency metrics for /api/ (Server-Timing header and
+# /api/_metrics/). Cheap enough to leave on in production.
+HRMS_API_METRICS = True
+
+# Serve list pages from .values() with precomputed field converters instead
+# of model instances and serializers (hrms/fastpath.py). Output is identical.
+HRMS_FAST_LIST = True
+
+# Seconds a process serves employee typeahead from its in-memory index
+# (hrms/suggest.py) before reloading it. Writes are picked up sooner when
+# they happen in the same process, or when every process shares one cache
+# backend (e.g. Redis or Memcached in CACHES). The default LocMemCache is
+# per process, so this is how long other processes' writes can take.
+HRMS_SUGGEST_MAX_AGE = 60
+
+# JSON encoder behind hrms.renderers.FastJSONRenderer: 'auto' uses orjson when
+# it is installed, 'orjson' requires it, 'stdlib' always uses json.dumps.
+HRMS_JSON_BACKEND = 'auto'
@@ -26,6 +26,7 @@ STATIC_ROOT = '/home/vinitvarvadkar/hrms-lite/backend/staticfiles/'
 # Whitenoise for serving static files
 MIDDLEWARE = [
     'corsheaders.middleware.CorsMiddleware',
+    'hrms.middleware.ApiMetricsMiddleware',
     'django.middleware.security.SecurityMiddleware',
     'whitenoise.middleware.WhiteNoiseMiddleware',  # Add this
     'django.contrib.sessions.middleware.SessionMiddleware',
@@ -1,8 +1,9 @@
 import axios from 'axios';
 import { 
   Employee, EmployeeCreate, Department, AttendanceRecord, AttendanceCreate, AttendanceStats,
-  LeaveType, LeaveRequest, LeaveRequestCreate, Performance, PerformanceCreate,
-  Payroll, PayrollCreate, Notification, DashboardStats, DepartmentStats
+  LeaveType, LeaveRequest, LeaveRequestCreate, EmployeeLeaveBalances, LeaveCalendar, Performance, PerformanceCreate,
+  Payroll, PayrollCreate, Notification, NotificationCount, NotificationPoll, DashboardStats, DepartmentStats,
+  Paginated, PageParams
 } from '../types';
 
 const API_BASE_URL = process.env.REACT_APP_API_URL || 'http://localhost:8000';
@@ -14,10 +15,53 @@ const api = axios.create({
   },
 });
 
+// Cursor pagination
+// List endpoints return `{ next, previous, results }`; `next` is an absolute URL
+// carrying an opaque cursor, so only the first request needs the query params.
+export const pageIterator = <T>(url: string, params?: object) => {
+  let nextUrl: string | null = url;
+  let first = true;
+
+  return {
+    hasNext: (): boolean => nextUrl !== null,
+
+    next: async (): Promise<T[] | null> => {
+      if (nextUrl === null) {
+        return null;
+      }
+      const response = await api.get<Paginated<T>>(nextUrl, first ? { params } : undefined);
+      first = false;
+      nextUrl = response.data.next;
+      return response.data.results;
+    },
+  };
+};
+
+export const fetchAllPages = async <T>(url: string, params?: object): Promise<T[]> => {
+  const pages = pageIterator<T>(url, params);
+  const items: T[] = [];
+  while (pages.hasNext()) {
+    const page = await pages.next();
+    if (page) {
+      items.push(...page);
+    }
+  }
+  return items;
+};
+
 // Employee API
 export const employeeApi = {
-  getAll: (params?: { search?: string; department?: string; status?: string }): Promise<Employee[]> => 
-    api.get('/api/employees/', { params }).then(response => response.data),
+  getAll: (params?: { search?: string; department?: string; status?: string; ordering?: string }): Promise<Employee[]> => 
+    fetchAllPages<Employee>('/api/employees/', params),
+  
+  iterate: (params?: { search?: string; department?: string; status?: string; ordering?: string } & PageParams) =>
+    pageIterator<Employee>('/api/employees/', params),
+  
+  search: (q: string, limit?: number): Promise<(Employee & { score: number })[]> =>
+    api.get('/api/employees/search/', { params: { q, limit } }).then(response => response.data),
+  
+  suggest: (q: string, limit?: number): Promise<Pick<Employee, 'employee_id' | 'full_name' | 'department'>[]> =>
+    api.get('/api/employees/suggest/', { params: { q, limit } }).then(response => response.data),
   
   getById: (employeeId: string): Promise<Employee> =>
     api.get(`/api/employees/${employeeId}/`).then(response => response.data),
@@ -31,11 +75,11 @@ export const employeeApi = {
   delete: (employeeId: string): Promise<void> =>
     api.delete(`/api/employees/${employeeId}/`).then(response => response.data),
   
-  bulkImport: (employees: EmployeeCreate[]): Promise<any> =>
-    api.post('/api/employees/bulk-import/', { employees }).then(response => response.data),
+  bulkImport: (employees: EmployeeCreate[], mode: 'partial' | 'all_or_nothing' = 'partial'): Promise<any> =>
+    api.post('/api/employees/bulk-import/', { employees, mode }).then(response => response.data),
   
-  exportCSV: (): Promise<Blob> =>
-    api.get('/api/export/employees/', { responseType: 'blob' }).then(response => response.data),
+  exportCSV: (params?: { department?: string; status?: string }): Promise<Blob> =>
+    api.get('/api/export/employees/', { params, responseType: 'blob' }).then(response => response.data),
 };
 
 // Department API
@@ -57,21 +101,47 @@ export const departmentApi = {
 export const attendanceApi = {
   getAll: (params?: { 
     employee_id?: string; 
+    department?: string; 
     start_date?: string; 
     end_date?: string; 
     status?: string; 
   }): Promise<AttendanceRecord[]> => {
-    return api.get('/api/attendance/', { params }).then(response => response.data);
+    return fetchAllPages<AttendanceRecord>('/api/attendance/', params);
   },
   
+  iterate: (params?: { 
+    employee_id?: string; 
+    department?: string; 
+    start_date?: string; 
+    end_date?: string; 
+    status?: string; 
+  } & PageParams) =>
+    pageIterator<AttendanceRecord>('/api/attendance/', params),
+  
   mark: (attendance: AttendanceCreate): Promise<AttendanceRecord> =>
     api.post('/api/attendance/', attendance).then(response => response.data),
   
-  getStats: (employeeId: string): Promise<AttendanceStats> =>
-    api.get(`/api/attendance/stats/${employeeId}/`).then(response => response.data),
+  markBulk: (records: AttendanceCreate[]): Promise<any> =>
+    api.post('/api/attendance/bulk/', { records }).then(response => response.data),
+  
+  getStats: (employeeId: string, params?: { start_date?: string; end_date?: string }): Promise<AttendanceStats> =>
+    api.get(`/api/attendance/stats/${employeeId}/`, { params }).then(response => response.data),
+  
+  getStatsBatch: (employeeIds: string[], params?: { start_date?: string; end_date?: string }): Promise<{
+    results: AttendanceStats[];
+    not_found: string[];
+  }> =>
+    api.get('/api/attendance/stats/', { params: { ...params, employee_id: employeeIds.join(',') } })
+      .then(response => response.data),
   
-  exportCSV: (): Promise<Blob> =>
-    api.get('/api/export/attendance/', { responseType: 'blob' }).then(response => response.data),
+  exportCSV: (params?: { 
+    employee_id?: string; 
+    department?: string; 
+    start_date?: string; 
+    end_date?: string; 
+    status?: string; 
+  }): Promise<Blob> =>
+    api.get('/api/export/attendance/', { params, responseType: 'blob' }).then(response => response.data),
 };
 
 // Leave Management API
@@ -83,7 +153,10 @@ export const leaveApi = {
     api.post('/api/leave-types/', leaveType).then(response => response.data),
   
   getRequests: (params?: { employee_id?: string; status?: string }): Promise<LeaveRequest[]> =>
-    api.get('/api/leave-requests/', { params }).then(response => response.data),
+    fetchAllPages<LeaveRequest>('/api/leave-requests/', params),
+  
+  iterateRequests: (params?: { employee_id?: string; status?: string } & PageParams) =>
+    pageIterator<LeaveRequest>('/api/leave-requests/', params),
   
   createRequest: (request: LeaveRequestCreate): Promise<LeaveRequest> =>
     api.post('/api/leave-requests/', request).then(response => response.data),
@@ -93,12 +166,24 @@ export const leaveApi = {
   
   deleteRequest: (id: number): Promise<void> =>
     api.delete(`/api/leave-requests/${id}/`).then(response => response.data),
+  
+  bulkDecide: (ids: number[], status: 'Approved' | 'Rejected', approvedBy: string, comments?: string): Promise<any> =>
+    api.post('/api/leave-requests/bulk-decision/', { ids, status, approved_by: approvedBy, comments }).then(response => response.data),
+  
+  getCalendar: (params: { start: string; end: string; department?: string; status?: 'Pending' | 'Approved' }): Promise<LeaveCalendar> =>
+    api.get('/api/leave-calendar/', { params }).then(response => response.data),
+  
+  getBalances: (params: { department?: string; employee_id?: string; year?: number }): Promise<{ year: number; results: EmployeeLeaveBalances[] }> =>
+    api.get('/api/leave-balances/', { params }).then(response => response.data),
 };
 
 // Performance API
 export const performanceApi = {
   getAll: (params?: { employee_id?: string }): Promise<Performance[]> =>
-    api.get('/api/performance/', { params }).then(response => response.data),
+    fetchAllPages<Performance>('/api/performance/', params),
+  
+  iterate: (params?: { employee_id?: string } & PageParams) =>
+    pageIterator<Performance>('/api/performance/', params),
   
   create: (performance: PerformanceCreate): Promise<Performance> =>
     api.post('/api/performance/', performance).then(response => response.data),
@@ -107,16 +192,44 @@ export const performanceApi = {
 // Payroll API
 export const payrollApi = {
   getAll: (params?: { employee_id?: string; status?: string }): Promise<Payroll[]> =>
-    api.get('/api/payroll/', { params }).then(response => response.data),
+    fetchAllPages<Payroll>('/api/payroll/', params),
+  
+  iterate: (params?: { employee_id?: string; status?: string } & PageParams) =>
+    pageIterator<Payroll>('/api/payroll/', params),
   
   create: (payroll: PayrollCreate): Promise<Payroll> =>
     api.post('/api/payroll/', payroll).then(response => response.data),
+  
+  run: (params: { 
+    pay_period_start: string; 
+    pay_period_end: string; 
+    department?: string; 
+    overtime_multiplier?: number; 
+    tax_rate?: number; 
+  }): Promise<any> =>
+    api.post('/api/payroll/run/', params).then(response => response.data),
 };
 
 // Notification API
 export const notificationApi = {
-  getAll: (params?: { employee_id?: string }): Promise<Notification[]> =>
-    api.get('/api/notifications/', { params }).then(response => response.data),
+  getAll: (params?: { employee_id?: string; unread?: boolean }): Promise<Notification[]> =>
+    fetchAllPages<Notification>('/api/notifications/', params),
+  
+  iterate: (params?: { employee_id?: string; unread?: boolean } & PageParams) =>
+    pageIterator<Notification>('/api/notifications/', params),
+  
+  getUnreadCount: (employeeId: string): Promise<NotificationCount> =>
+    api.get('/api/notifications/unread-count/', { params: { employee_id: employeeId } }).then(response => response.data),
+  
+  markRead: (employeeId: string, options?: { ids?: number[]; up_to_id?: number }): Promise<{ marked: number; unread: number }> =>
+    api.post('/api/notifications/mark-read/', { employee_id: employeeId, ...options }).then(response => response.data),
+  
+  // Resolves when notifications newer than `after` arrive, or empty after `timeout` seconds
+  poll: (employeeId: string, after: number, timeout?: number): Promise<NotificationPoll> =>
+    api.get('/api/async/notifications/poll/', {
+      params: { employee_id: employeeId, after, timeout },
+      timeout: ((timeout ?? 25) + 10) * 1000,
+    }).then(response => response.data),
 };
 
 // Dashboard API
@@ -124,8 +237,8 @@ export const dashboardApi = {
   getStats: (): Promise<DashboardStats> =>
     api.get('/api/dashboard/stats/').then(response => response.data),
   
-  getDepartmentStats: (): Promise<DepartmentStats[]> =>
-    api.get('/api/analytics/department-stats/').then(response => response.data),
+  getDepartmentStats: (params?: { include_unlisted?: boolean }): Promise<DepartmentStats[]> =>
+    api.get('/api/analytics/department-stats/', { params }).then(response => response.data),
 };
 
 export default api;
\ No newline at end of file
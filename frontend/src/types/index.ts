@@ -101,6 +101,33 @@ export interface LeaveRequest {
   created_at: string;
 }
 
+export interface LeaveBalance {
+  leave_type: number;
+  leave_type_name: string;
+  days_allowed: number;
+  days_used: number;
+  days_pending: number;
+  days_remaining: number;
+}
+
+export interface EmployeeLeaveBalances {
+  employee_id: string;
+  employee_name: string;
+  balances: LeaveBalance[];
+}
+
+export interface LeaveCalendar {
+  start: string;
+  end: string;
+  days: { date: string; out: number; pending: number }[];
+  employees: {
+    employee_id: string;
+    employee_name: string;
+    department: string;
+    leave: { id: number; leave_type_name: string; start_date: string; end_date: string; status: 'Pending' | 'Approved' }[];
+  }[];
+}
+
 export interface LeaveRequestCreate {
   employee_id: string;
   leave_type: number;
@@ -180,6 +207,18 @@ export interface Notification {
   created_at: string;
 }
 
+export interface NotificationCount {
+  employee_id: string;
+  unread: number;
+  last_id: number;
+}
+
+export interface NotificationPoll {
+  notifications: Notification[];
+  last_id: number;
+  unread: number;
+}
+
 export interface DashboardStats {
   total_employees: number;
   active_employees: number;
@@ -198,4 +237,17 @@ export interface DepartmentStats {
   absent_today: number;
   attendance_rate: number;
   average_salary: number;
-}
\ No newline at end of file
+}
+
+export interface Paginated<T> {
+  next: string | null;
+  previous: string | null;
+  results: T[];
+}
+
+export interface PageParams {
+  page_size?: number;
+  // Comma-separated field names, or compact for the short list representation
+  fields?: string;
+  compact?: boolean;
+}